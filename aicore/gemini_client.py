@@ -5,11 +5,12 @@ Gemini AI客户端模块
 """
 
 import google.generativeai as genai
-from typing import Optional
+from typing import Callable, Optional
 
 from core.config import get_config
 from core.logger import get_logger
-from tools.utils import clean_markdown_content, validate_markdown_content
+from core.response_cache import get_response_cache, ResponseCache
+from tools.utils import clean_markdown_content, validate_markdown_content, MarkdownStreamCleaner
 
 
 class GeminiClient:
@@ -17,12 +18,15 @@ class GeminiClient:
     Gemini AI客户端
     """
 
+    MODEL_NAME = 'gemini-2.0-flash'
+
     def __init__(self):
         """
         初始化Gemini客户端
         """
         self.config = get_config()
         self.logger = get_logger()
+        self.response_cache = get_response_cache()
         self.model = None
         self._initialize_client()
 
@@ -40,7 +44,7 @@ class GeminiClient:
             genai.configure(api_key=api_key)
 
             # 创建模型实例
-            self.model = genai.GenerativeModel('gemini-2.0-flash')
+            self.model = genai.GenerativeModel(self.MODEL_NAME)
 
             self.logger.info("Gemini客户端初始化成功")
 
@@ -48,12 +52,38 @@ class GeminiClient:
             self.logger.error(f"Gemini客户端初始化失败: {e}")
             raise
 
-    def generate_catchy_title(self, original_title: str) -> Optional[str]:
+    def _generate_text(self, prompt: str, bypass_cache: bool = False) -> Optional[str]:
+        """
+        调用Gemini API生成文本（带响应缓存）
+        
+        Args:
+            prompt: 提示词
+            bypass_cache: 是否跳过响应缓存
+        
+        Returns:
+            Optional[str]: 生成的文本
+        """
+        cache_key = ResponseCache.make_key(self.MODEL_NAME, prompt)
+        if not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("Gemini API响应缓存命中")
+                return cached
+
+        response = self.model.generate_content(prompt)
+        if not response or not response.text:
+            return None
+
+        self.response_cache.set(cache_key, response.text, self.MODEL_NAME)
+        return response.text
+
+    def generate_catchy_title(self, original_title: str, bypass_cache: bool = False) -> Optional[str]:
         """
         根据原始标题生成更吸引人的爆款标题
         
         Args:
             original_title (str): 原始标题
+            bypass_cache (bool): 是否跳过响应缓存
             
         Returns:
             Optional[str]: 生成的爆款标题
@@ -79,11 +109,11 @@ class GeminiClient:
 """
 
             # 调用Gemini API生成爆款标题
-            response = self.model.generate_content(prompt)
+            text = self._generate_text(prompt, bypass_cache)
 
-            if response and response.text:
+            if text:
                 # 清理标题，移除可能的引号和多余空格
-                catchy_title = response.text.strip().strip('"').strip("'")
+                catchy_title = text.strip().strip('"').strip("'")
                 self.logger.info(f"爆款标题生成成功: {catchy_title}")
                 return catchy_title
             else:
@@ -94,7 +124,9 @@ class GeminiClient:
             self.logger.error(f"生成爆款标题时发生错误: {e}，使用原标题")
             return original_title
 
-    def generate_article_from_title(self, title: str, use_catchy_title: bool = True) -> tuple[
+    def generate_article_from_title(self, title: str, use_catchy_title: bool = True,
+                                    on_chunk: Optional[Callable[[str], None]] = None,
+                                    bypass_cache: bool = False) -> tuple[
         Optional[str], Optional[str]]:
         """
         根据标题生成文章
@@ -102,6 +134,8 @@ class GeminiClient:
         Args:
             title (str): 原始文章标题
             use_catchy_title (bool): 是否生成爆款标题
+            on_chunk (Callable[[str], None]): 流式输出回调，提供时以流式方式生成文章内容
+            bypass_cache (bool): 是否跳过响应缓存，强制重新生成
             
         Returns:
             tuple[Optional[str], Optional[str]]: (文章内容, 最终标题)
@@ -114,7 +148,7 @@ class GeminiClient:
             # 1. 生成爆款标题（如果需要）
             final_title = title
             if use_catchy_title:
-                catchy_title = self.generate_catchy_title(title)
+                catchy_title = self.generate_catchy_title(title, bypass_cache=bypass_cache)
                 if catchy_title and catchy_title != title:
                     final_title = catchy_title
                     self.logger.info(f"使用爆款标题: {final_title}")
@@ -124,16 +158,22 @@ class GeminiClient:
             # 2. 生成文章内容
             prompt = self._create_article_prompt(title)
 
-            # 调用Gemini API生成内容
-            response = self.model.generate_content(prompt)
+            if on_chunk:
+                # 流式生成，清理后的片段实时回调
+                raw_content, markdown_content = self._generate_stream(prompt, on_chunk, bypass_cache)
+                if not raw_content:
+                    self.logger.error("Gemini API返回空内容")
+                    return None, None
+            else:
+                # 调用Gemini API生成内容
+                raw_content = self._generate_text(prompt, bypass_cache)
 
-            if not response or not response.text:
-                self.logger.error("Gemini API返回空内容")
-                return None, None
+                if not raw_content:
+                    self.logger.error("Gemini API返回空内容")
+                    return None, None
 
-            # 清理AI生成的markdown内容中的多余字符
-            raw_content = response.text
-            markdown_content = clean_markdown_content(raw_content)
+                # 清理AI生成的markdown内容中的多余字符
+                markdown_content = clean_markdown_content(raw_content)
             
             # 验证清理后的内容是否有效
             if not validate_markdown_content(markdown_content):
@@ -150,6 +190,59 @@ class GeminiClient:
             self.logger.error(f"调用Gemini API失败: {e}")
             return None, None
 
+    def _generate_stream(self, prompt: str, on_chunk: Callable[[str], None],
+                         bypass_cache: bool = False) -> tuple[str, str]:
+        """
+        以流式方式调用Gemini API，边接收边清理markdown内容
+        
+        Args:
+            prompt: 提示词
+            on_chunk: 清理后内容片段的回调
+            bypass_cache: 是否跳过响应缓存
+        
+        Returns:
+            tuple[str, str]: (原始内容, 清理后的内容)
+        """
+        cleaner = MarkdownStreamCleaner()
+        raw_parts = []
+        cleaned_parts = []
+
+        cache_key = ResponseCache.make_key(self.MODEL_NAME, prompt)
+        cached = None if bypass_cache else self.response_cache.get(cache_key)
+        if cached is not None:
+            # 缓存命中时作为单个片段处理
+            self.logger.info("Gemini API响应缓存命中")
+            response = [cached]
+        else:
+            response = self.model.generate_content(prompt, stream=True)
+
+        for chunk in response:
+            if isinstance(chunk, str):
+                text = chunk
+            else:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # 被安全策略拦截等情况下，该片段不包含文本
+                    continue
+            if not text:
+                continue
+            raw_parts.append(text)
+            cleaned = cleaner.feed(text)
+            if cleaned:
+                cleaned_parts.append(cleaned)
+                on_chunk(cleaned)
+
+        tail = cleaner.finish()
+        if tail:
+            cleaned_parts.append(tail)
+            on_chunk(tail)
+
+        raw_content = ''.join(raw_parts)
+        if cached is None and raw_content:
+            self.response_cache.set(cache_key, raw_content, self.MODEL_NAME)
+        return raw_content, ''.join(cleaned_parts)
+
     def _create_article_prompt(self, title: str) -> str:
         """
         创建文章生成提示词
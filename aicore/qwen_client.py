@@ -5,13 +5,14 @@ Qwen AI客户端
 用于与阿里云通义千问API交互，生成文章内容
 """
 
-import requests
 import json
-from typing import Optional
+from typing import Callable, Optional
 
 from core.config import get_config
 from core.logger import get_logger
-from tools.utils import clean_markdown_content, validate_markdown_content
+from core.http_client import get_http_client
+from core.response_cache import get_response_cache, ResponseCache
+from tools.utils import clean_markdown_content, validate_markdown_content, MarkdownStreamCleaner
 
 
 class QwenClient:
@@ -19,6 +20,8 @@ class QwenClient:
     Qwen AI客户端类
     """
 
+    TEMPERATURE = 0.7
+
     def __init__(self, model_type: str = 'qwen'):
         """
         初始化Qwen客户端
@@ -28,6 +31,8 @@ class QwenClient:
         """
         self.config = get_config()
         self.logger = get_logger()
+        self.http_client = get_http_client()
+        self.response_cache = get_response_cache()
         self.model_type = model_type
         self.qwen_config = self.config.get_qwen_config(model_type)
 
@@ -42,17 +47,38 @@ class QwenClient:
 
         self.logger.info(f"Qwen客户端初始化成功，模型: {self.model}")
 
-    def _make_request(self, messages: list, max_tokens: int = 2000) -> Optional[str]:
+    def _cache_key(self, messages: list, max_tokens: int) -> str:
+        """
+        生成响应缓存键
+        
+        Args:
+            messages (list): 消息列表
+            max_tokens (int): 最大token数
+            
+        Returns:
+            str: 缓存键
+        """
+        return ResponseCache.make_key(self.model, {'messages': messages, 'max_tokens': max_tokens}, self.TEMPERATURE)
+
+    def _make_request(self, messages: list, max_tokens: int = 2000, bypass_cache: bool = False) -> Optional[str]:
         """
         发送请求到Qwen API
         
         Args:
             messages (list): 消息列表
             max_tokens (int): 最大token数
+            bypass_cache (bool): 是否跳过响应缓存
             
         Returns:
             Optional[str]: 生成的内容
         """
+        cache_key = self._cache_key(messages, max_tokens)
+        if not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("Qwen API响应缓存命中")
+                return cached
+
         try:
             headers = {
                 'Authorization': f'Bearer {self.api_key}',
@@ -63,17 +89,16 @@ class QwenClient:
                 'model': self.model,
                 'messages': messages,
                 'max_tokens': max_tokens,
-                'temperature': 0.7,
+                'temperature': self.TEMPERATURE,
                 'top_p': 0.9
             }
 
             self.logger.info(f"发送请求到Qwen API: {self.base_url}/chat/completions")
 
-            response = requests.post(
+            response = self.http_client.post(
                     f"{self.base_url}/chat/completions",
                     headers=headers,
-                    json=data,
-                    timeout=60
+                    json=data
             )
 
             if response.status_code == 200:
@@ -81,6 +106,7 @@ class QwenClient:
                 if 'choices' in result and len(result['choices']) > 0:
                     content = result['choices'][0]['message']['content']
                     self.logger.info("Qwen API请求成功")
+                    self.response_cache.set(cache_key, content, self.model)
                     return content
                 else:
                     self.logger.error(f"Qwen API响应格式错误: {result}")
@@ -93,12 +119,100 @@ class QwenClient:
             self.logger.error(f"Qwen API请求异常: {e}")
             return None
 
-    def generate_catchy_title(self, original_title: str) -> Optional[str]:
+    def _make_stream_request(self, messages: list, on_delta: Callable[[str], None],
+                             max_tokens: int = 2000, bypass_cache: bool = False) -> Optional[str]:
+        """
+        以流式（SSE）方式发送请求到Qwen API，逐段回调生成的内容
+        
+        Args:
+            messages (list): 消息列表
+            on_delta (Callable[[str], None]): 收到增量内容时的回调
+            max_tokens (int): 最大token数
+            bypass_cache (bool): 是否跳过响应缓存
+            
+        Returns:
+            Optional[str]: 完整的生成内容
+        """
+        cache_key = self._cache_key(messages, max_tokens)
+        if not bypass_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                # 缓存命中时一次性回调完整内容
+                self.logger.info("Qwen API响应缓存命中")
+                on_delta(cached)
+                return cached
+
+        try:
+            headers = {
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            }
+
+            data = {
+                'model': self.model,
+                'messages': messages,
+                'max_tokens': max_tokens,
+                'temperature': self.TEMPERATURE,
+                'top_p': 0.9,
+                'stream': True
+            }
+
+            self.logger.info(f"发送流式请求到Qwen API: {self.base_url}/chat/completions")
+
+            response = self.http_client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    json=data,
+                    stream=True
+            )
+
+            with response:
+                if response.status_code != 200:
+                    self.logger.error(f"Qwen API流式请求失败: {response.status_code} - {response.text}")
+                    return None
+
+                parts = []
+                for line in response.iter_lines():
+                    # SSE格式: 每个事件以 "data: " 开头，以 "data: [DONE]" 结束
+                    if not line:
+                        continue
+                    line = line.decode('utf-8').strip()
+                    if not line.startswith('data:'):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == '[DONE]':
+                        break
+
+                    chunk = json.loads(payload)
+                    choices = chunk.get('choices') or []
+                    if not choices:
+                        continue
+                    delta = (choices[0].get('delta') or {}).get('content')
+                    if delta:
+                        parts.append(delta)
+                        on_delta(delta)
+
+            content = ''.join(parts)
+            if not content:
+                self.logger.error("Qwen API流式响应为空")
+                return None
+
+            self.logger.info("Qwen API流式请求成功")
+            self.response_cache.set(cache_key, content, self.model)
+            return content
+
+        except Exception as e:
+            self.logger.error(f"Qwen API流式请求异常: {e}")
+            return None
+
+    def generate_catchy_title(self, original_title: str, bypass_cache: bool = False) -> Optional[str]:
         """
         根据原始标题生成更吸引人的爆款标题
         
         Args:
             original_title (str): 原始标题
+            bypass_cache (bool): 是否跳过响应缓存
             
         Returns:
             Optional[str]: 生成的爆款标题
@@ -135,7 +249,7 @@ class QwenClient:
             ]
 
             # 发送请求
-            catchy_title = self._make_request(messages, max_tokens=100)
+            catchy_title = self._make_request(messages, max_tokens=100, bypass_cache=bypass_cache)
 
             if catchy_title:
                 # 清理标题，移除可能的引号和多余空格
@@ -150,7 +264,9 @@ class QwenClient:
             self.logger.error(f"生成爆款标题时发生错误: {e}，使用原标题")
             return original_title
 
-    def generate_article_from_title(self, title: str, use_catchy_title: bool = True) -> tuple[
+    def generate_article_from_title(self, title: str, use_catchy_title: bool = True,
+                                    on_chunk: Optional[Callable[[str], None]] = None,
+                                    bypass_cache: bool = False) -> tuple[
         Optional[str], Optional[str]]:
         """
         根据标题生成文章
@@ -158,6 +274,8 @@ class QwenClient:
         Args:
             title (str): 原始文章标题
             use_catchy_title (bool): 是否生成爆款标题
+            on_chunk (Callable[[str], None]): 流式输出回调，提供时以流式方式生成文章内容
+            bypass_cache (bool): 是否跳过响应缓存，强制重新生成
             
         Returns:
             tuple[Optional[str], Optional[str]]: (文章内容, 最终标题)
@@ -166,7 +284,7 @@ class QwenClient:
             # 1. 生成爆款标题（如果需要）
             final_title = title
             if use_catchy_title:
-                catchy_title = self.generate_catchy_title(title)
+                catchy_title = self.generate_catchy_title(title, bypass_cache=bypass_cache)
                 if catchy_title and catchy_title != title:
                     final_title = catchy_title
                     self.logger.info(f"使用爆款标题: {final_title}")
@@ -207,7 +325,22 @@ class QwenClient:
             ]
 
             # 3. 发送请求
-            content = self._make_request(messages, max_tokens=3000)
+            if on_chunk:
+                # 流式输出的片段先经过增量清理，再回调给调用方
+                cleaner = MarkdownStreamCleaner()
+
+                def on_delta(delta: str):
+                    cleaned = cleaner.feed(delta)
+                    if cleaned:
+                        on_chunk(cleaned)
+
+                content = self._make_stream_request(messages, on_delta, max_tokens=3000, bypass_cache=bypass_cache)
+                if content:
+                    tail = cleaner.finish()
+                    if tail:
+                        on_chunk(tail)
+            else:
+                content = self._make_request(messages, max_tokens=3000, bypass_cache=bypass_cache)
 
             if content:
                 # 清理AI生成的Markdown内容中的多余字符
@@ -245,7 +378,7 @@ class QwenClient:
                 }
             ]
 
-            result = self._make_request(messages, max_tokens=50)
+            result = self._make_request(messages, max_tokens=50, bypass_cache=True)
 
             if result:
                 self.logger.info("Qwen API连接测试成功")
@@ -7,9 +7,11 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
+import atexit
 import os
 import sys
 import threading
+import time
 import uuid
 from typing import Dict, Any
 
@@ -19,9 +21,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.config import get_config
 from core.logger import get_logger, cleanup_old_logs
 from core.html_converter import get_html_converter
+from core.batch_converter import BatchConverter
+from core.article_index import get_article_index
+from core.article_storage import get_article_storage
 from core.wechat_publisher import get_wechat_publisher
+from core.task_queue import TaskQueue
+from core.task_store import create_task_store
 from aicore.gemini_client import get_gemini_client
 from aicore.qwen_client import get_qwen_client
+from tools.hotnews_scheduler import HotNewsScheduler
 from route import register_main_routes, register_api_routes, register_article_routes, register_wechat_routes
 
 
@@ -40,15 +48,30 @@ class VXToolApp:
         # 初始化SocketIO
         self.socketio = SocketIO(self.app, cors_allowed_origins="*")
 
-        # 任务状态管理
-        self.task_status = {}  # 存储任务状态
-
         # 初始化组件
         self.config = get_config()
         self.logger = get_logger()
+
+        # 任务状态管理（内存LRU/TTL或SQLite存储）
+        self.task_status = create_task_store(self.config.get_task_store_config())
         self.html_converter = get_html_converter()
         self.wechat_publisher = get_wechat_publisher()
 
+        # 文章存储（按日期分片、原子写入）及元数据索引（SQLite）
+        self.article_storage = get_article_storage()
+        self.article_index = get_article_index()
+
+        # 批量HTML转换进程池（首次使用时启动）
+        self.batch_converter = BatchConverter(self.config.get_batch_convert_workers(), self.html_converter.parser)
+
+        # 文章生成任务队列（按AI模型限制并发）
+        queue_config = self.config.get_task_queue_config()
+        self.task_queue = TaskQueue(queue_config['max_workers'], queue_config['max_queue_size'])
+
+        # 进行中的生成任务 (标题, AI模型, 是否爆款标题, 是否跳过缓存) -> 任务ID，用于合并相同请求
+        self._inflight_tasks = {}
+        self._inflight_lock = threading.Lock()
+
         # 根据配置选择AI客户端
         ai_model = self.config.get_ai_model()
         if ai_model == 'qwen':
@@ -61,6 +84,19 @@ class VXToolApp:
             self.ai_client = get_gemini_client()
             self.logger.info("使用Gemini AI客户端")
 
+        # 热点后台预取
+        self.hotnews_scheduler = None
+        prefetch_config = self.config.get_hotnews_prefetch_config()
+        if prefetch_config['enabled']:
+            self.hotnews_scheduler = HotNewsScheduler(
+                    interval=prefetch_config['interval'],
+                    jitter=prefetch_config['jitter'],
+                    source_intervals=prefetch_config['source_intervals']
+            )
+            self.hotnews_scheduler.start()
+            # 进程退出时停止后台预取
+            atexit.register(self.shutdown)
+
         # 注册路由
         self._register_routes()
 
@@ -95,7 +131,59 @@ class VXToolApp:
         def handle_disconnect():
             self.logger.info('客户端已断开连接')
 
-    def generate_article_async(self, title: str, task_id: str, use_catchy_title: bool = True, ai_model: str = 'qwen'):
+    def _update_task_status(self, task_id: str, status: Dict[str, Any]):
+        """
+        更新任务状态，保留排队相关的元数据
+        
+        Args:
+            task_id: 任务ID
+            status: 新的任务状态
+        """
+        previous = self.task_status.get(task_id) or {}
+        for key in ('ai_model', 'queued_at', 'wait_time'):
+            if key in previous and key not in status:
+                status[key] = previous[key]
+        self.task_status[task_id] = status
+
+    def _run_queued_task(self, wait_time: float, title: str, task_id: str, use_catchy_title: bool, ai_model: str,
+                         bypass_cache: bool = False):
+        """
+        工作线程从队列取出任务后执行
+        
+        Args:
+            wait_time: 任务在队列中的等待秒数
+            title: 原始标题
+            task_id: 任务ID
+            use_catchy_title: 是否生成爆款标题
+            ai_model: AI模型选择
+            bypass_cache: 是否跳过AI响应缓存
+        """
+        self._update_task_status(task_id, {
+            'status': 'running',
+            'message': '任务开始执行...',
+            'progress': 15,
+            'wait_time': round(wait_time, 3)
+        })
+        self.logger.info(f"任务 {task_id} 开始执行，排队等待 {wait_time:.2f} 秒")
+        try:
+            self.generate_article_async(title, task_id, use_catchy_title, ai_model, bypass_cache)
+        finally:
+            self._release_inflight_task((title.strip(), ai_model, use_catchy_title, bypass_cache), task_id)
+
+    def _release_inflight_task(self, key: tuple, task_id: str):
+        """
+        任务结束后移除进行中记录，之后的相同请求将启动新任务
+        
+        Args:
+            key: 任务合并键
+            task_id: 任务ID
+        """
+        with self._inflight_lock:
+            if self._inflight_tasks.get(key) == task_id:
+                del self._inflight_tasks[key]
+
+    def generate_article_async(self, title: str, task_id: str, use_catchy_title: bool = True, ai_model: str = 'qwen',
+                               bypass_cache: bool = False):
         """
         异步生成文章
         
@@ -104,6 +192,7 @@ class VXToolApp:
             task_id: 任务ID
             use_catchy_title: 是否生成爆款标题
             ai_model: AI模型选择 ('qwen' 或 'gemini')
+            bypass_cache: 是否跳过AI响应缓存
         """
         try:
             # 根据ai_model参数选择AI客户端
@@ -117,43 +206,62 @@ class VXToolApp:
                 ai_client = get_qwen_client('qwen')
                 self.logger.info(f"使用Qwen AI客户端生成文章: {title}")
             
-            # 更新任务状态
-            self.task_status[task_id] = {
-                'status': 'generating_title',
-                'message': f'正在使用{ai_model.upper()}生成爆款标题...',
-                'progress': 20
-            }
-            self.socketio.emit('task_update', {
-                'task_id': task_id,
-                'status': 'generating_title',
-                'message': f'正在使用{ai_model.upper()}生成爆款标题...',
-                'progress': 20
-            })
+            def enter_phase(status: str, message: str, progress: int):
+                """
+                更新任务阶段并推送给客户端，不生成爆款标题时原标题即最终标题
+                """
+                self._update_task_status(task_id, {
+                    'status': status,
+                    'message': message,
+                    'progress': progress
+                })
+                update = {
+                    'task_id': task_id,
+                    'status': status,
+                    'message': message,
+                    'progress': progress
+                }
+                if not use_catchy_title:
+                    update['title'] = title
+                self.socketio.emit('task_update', update)
+
+            # 流式输出时，将生成的文章片段实时推送给客户端；收到第一个片段时进入生成文章阶段
+            on_chunk = None
+            if self.config.get_stream_output():
+                if use_catchy_title:
+                    enter_phase('generating_title', f'正在使用{ai_model.upper()}生成爆款标题...', 20)
+                else:
+                    enter_phase('generating_article', '正在生成文章内容...', 50)
+                article_started = [not use_catchy_title]
+
+                def on_chunk(delta: str):
+                    if not article_started[0]:
+                        article_started[0] = True
+                        enter_phase('generating_article', '正在生成文章内容...', 50)
+                    self.socketio.emit('task_update', {
+                        'task_id': task_id,
+                        'status': 'article_chunk',
+                        'delta': delta,
+                        'progress': 50
+                    })
+            else:
+                # 非流式时标题和文章在同一次调用中生成，无法区分阶段
+                enter_phase('generating_article',
+                            f'正在使用{ai_model.upper()}生成标题和文章内容...' if use_catchy_title else '正在生成文章内容...',
+                            50)
 
             # 生成文章和标题
-            content, final_title = ai_client.generate_article_from_title(title, use_catchy_title)
-
-            # 更新任务状态：开始生成文章
-            self.task_status[task_id] = {
-                'status': 'generating_article',
-                'message': '正在生成文章内容...',
-                'progress': 50
-            }
-            self.socketio.emit('task_update', {
-                'task_id': task_id,
-                'status': 'generating_article',
-                'title': final_title if final_title else title,
-                'message': '正在生成文章内容...',
-                'progress': 50
-            })
+            content, final_title = ai_client.generate_article_from_title(
+                    title, use_catchy_title, on_chunk=on_chunk, bypass_cache=bypass_cache
+            )
 
             if content and final_title:
                 # 更新任务状态
-                self.task_status[task_id] = {
+                self._update_task_status(task_id, {
                     'status': 'saving',
                     'message': '正在保存文章...',
                     'progress': 80
-                }
+                })
                 self.socketio.emit('task_update', {
                     'task_id': task_id,
                     'status': 'saving',
@@ -162,10 +270,6 @@ class VXToolApp:
                 })
 
                 # 保存文章
-                articles_dir = os.path.join(os.path.dirname(__file__), 'articles')
-                if not os.path.exists(articles_dir):
-                    os.makedirs(articles_dir)
-
                 from datetime import datetime
                 import re
 
@@ -177,14 +281,17 @@ class VXToolApp:
 
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"{timestamp}_{safe_title}.md"
-                file_path = os.path.join(articles_dir, filename)
+                # 原子写入日期分片目录
+                file_path = self.article_storage.write_markdown(filename, content)
+                self.article_index.upsert(filename, final_title, title, ai_model)
 
-                # 写入文件
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                # 检查是否与已有文章近似重复（仅提示，文章照常保存）
+                duplicates = self.article_index.find_duplicates(filename=filename)
+                if duplicates:
+                    self.logger.warning(f"生成的文章与已有文章近似重复: {filename} -> {duplicates[0]['name']}")
 
                 # 任务完成
-                self.task_status[task_id] = {
+                self._update_task_status(task_id, {
                     'status': 'completed',
                     'message': '文章生成完成！',
                     'progress': 100,
@@ -192,9 +299,10 @@ class VXToolApp:
                         'title': final_title,
                         'original_title': title,
                         'filename': filename,
-                        'file_path': file_path
+                        'file_path': file_path,
+                        'duplicates': duplicates
                     }
-                }
+                })
                 self.socketio.emit('task_update', {
                     'task_id': task_id,
                     'status': 'completed',
@@ -203,17 +311,18 @@ class VXToolApp:
                     'original_title': title,
                     'final_title': final_title,
                     'filename': filename,
-                    'file_path': file_path
+                    'file_path': file_path,
+                    'duplicates': duplicates
                 })
 
                 self.logger.info(f"文章生成完成: {final_title}")
             else:
                 # 任务失败
-                self.task_status[task_id] = {
+                self._update_task_status(task_id, {
                     'status': 'failed',
                     'message': 'AI文章生成失败',
                     'progress': 0
-                }
+                })
                 self.socketio.emit('task_update', {
                     'task_id': task_id,
                     'status': 'error',
@@ -223,11 +332,11 @@ class VXToolApp:
 
         except Exception as e:
             # 任务异常
-            self.task_status[task_id] = {
+            self._update_task_status(task_id, {
                 'status': 'failed',
                 'message': f'生成文章失败: {str(e)}',
                 'progress': 0
-            }
+            })
             self.socketio.emit('task_update', {
                 'task_id': task_id,
                 'status': 'error',
@@ -236,7 +345,8 @@ class VXToolApp:
             })
             self.logger.error(f"异步生成文章失败: {e}")
 
-    def start_article_generation(self, title: str, use_catchy_title: bool = True, ai_model: str = 'qwen') -> str:
+    def start_article_generation(self, title: str, use_catchy_title: bool = True, ai_model: str = 'qwen',
+                                 bypass_cache: bool = False) -> str:
         """
         启动文章生成任务
         
@@ -244,26 +354,51 @@ class VXToolApp:
             title: 原始标题
             use_catchy_title: 是否生成爆款标题
             ai_model: AI模型选择 ('qwen' 或 'gemini')
+            bypass_cache: 是否跳过AI响应缓存
             
         Returns:
-            str: 任务ID
+            str: 任务ID，相同请求正在进行时返回已有任务的ID
+            
+        Raises:
+            TaskQueueFullError: 对应AI模型的任务队列已满
         """
-        task_id = str(uuid.uuid4())
-
-        # 初始化任务状态
-        self.task_status[task_id] = {
-            'status': 'started',
-            'message': '任务已启动...',
-            'progress': 10
-        }
-
-        # 启动异步任务
-        thread = threading.Thread(
-                target=self.generate_article_async,
-                args=(title, task_id, use_catchy_title, ai_model)
-        )
-        thread.daemon = True
-        thread.start()
+        # 跳过缓存的请求不与普通请求合并，避免拿到由缓存返回的结果
+        key = (title.strip(), ai_model, use_catchy_title, bypass_cache)
+        with self._inflight_lock:
+            # 相同标题和模型的任务正在进行时，直接复用其任务ID和进度推送
+            existing_task_id = self._inflight_tasks.get(key)
+            if existing_task_id and existing_task_id in self.task_status:
+                self.logger.info(f"合并相同的文章生成请求到任务 {existing_task_id}: {title}")
+                return existing_task_id
+
+            task_id = str(uuid.uuid4())
+
+            # 初始化任务状态，记录提交时的排队情况
+            queue_stats = self.task_queue.get_stats(ai_model)
+            queued_ahead = queue_stats['queued']
+            self.task_status[task_id] = {
+                'status': 'queued',
+                'message': f'任务排队中，前方还有{queued_ahead}个任务...' if queued_ahead else '任务已启动...',
+                'progress': 10,
+                'ai_model': ai_model,
+                'queued_at': time.time(),
+                'queue_position': queue_stats['queued'] + 1,
+                'queue_depth': queue_stats['queued'] + 1
+            }
+
+            # 提交到对应模型的任务队列，队列已满时抛出TaskQueueFullError
+            try:
+                self.task_queue.submit(
+                        ai_model,
+                        lambda wait_time: self._run_queued_task(
+                                wait_time, title, task_id, use_catchy_title, ai_model, bypass_cache
+                        )
+                )
+            except Exception:
+                self.task_status.pop(task_id, None)
+                raise
+
+            self._inflight_tasks[key] = task_id
 
         return task_id
 
@@ -277,7 +412,17 @@ class VXToolApp:
             debug: 调试模式
         """
         self.logger.info(f"启动VX Tool服务: http://{host}:{port}")
-        self.socketio.run(self.app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
+        try:
+            self.socketio.run(self.app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """
+        停止后台线程，可重复调用
+        """
+        if self.hotnews_scheduler:
+            self.hotnews_scheduler.stop()
 
 
 def create_app() -> Flask:
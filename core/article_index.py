@@ -0,0 +1,634 @@
+# -*- coding: utf-8 -*-
+"""
+文章索引模块
+将文章元数据保存在SQLite中，文章列表按索引分页、排序和过滤，无需每次请求都扫描目录；
+写入、删除和转换时同步更新索引，并按文件修改时间定期与目录对账，纳入手工增删改的文件。
+文章正文同时写入FTS5全文索引（中文按二字组切分），用于按相关度检索文章内容；
+并记录正文的SimHash指纹及分带索引，用于发现近似重复的文章
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.article_search import tokenize, build_match_query, make_snippet
+from core.article_storage import ArticleStorage, get_article_storage
+from core.simhash import SIMHASH_BITS, simhash_terms, hamming_distance, band_keys, to_signed, to_unsigned
+from core.logger import get_logger
+
+
+# 允许排序的字段
+SORT_FIELDS = {
+    'modified': 'mtime',
+    'created': 'created',
+    'size': 'size',
+    'title': 'title',
+    'name': 'filename'
+}
+
+_TIMESTAMP_PREFIX_RE = re.compile(r'^(\d{8}_\d{6})_')
+
+_COLUMNS = ('filename', 'title', 'original_title', 'model', 'template', 'size', 'html_size', 'created', 'mtime')
+
+
+def title_from_filename(filename: str) -> str:
+    """
+    从文章文件名提取标题（去掉时间戳前缀和扩展名，下划线替换为空格）
+    """
+    name = filename[:-3] if filename.endswith('.md') else filename
+    name = _TIMESTAMP_PREFIX_RE.sub('', name)
+    return name.replace('_', ' ')
+
+
+def _fts_rowid(filename: str) -> int:
+    """
+    由文件名计算全文索引条目的rowid，按rowid删除和替换条目无需扫描全文索引表
+    """
+    return int.from_bytes(hashlib.blake2b(filename.encode('utf-8'), digest_size=8).digest(), 'big') >> 1
+
+
+def created_from_filename(filename: str) -> Optional[float]:
+    """
+    从文件名的时间戳前缀（%Y%m%d_%H%M%S）解析创建时间，没有前缀时返回None
+    """
+    match = _TIMESTAMP_PREFIX_RE.match(filename)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').timestamp()
+    except ValueError:
+        return None
+
+
+class ArticleIndex:
+    """
+    文章元数据索引
+    以文件名为主键，按修改时间、创建时间和模型建立索引
+    """
+
+    def __init__(self, db_path: str, storage: Optional[ArticleStorage] = None, reconcile_interval: float = 30,
+                 max_distance: int = 3, title_threshold: float = 0.5):
+        """
+        初始化文章索引
+
+        Args:
+            db_path: 数据库文件路径
+            storage: 文章存储，默认使用全局文章存储
+            reconcile_interval: 与目录对账的最小间隔秒数，文章目录或当天分片目录的修改时间变化时立即对账
+            max_distance: 正文SimHash汉明距离不超过该值时视为近似重复（分带索引保证不超过3时不漏查）
+            title_threshold: 标题二字组Jaccard相似度达到该值时视为相近标题
+        """
+        self.db_path = db_path
+        self.storage = storage or get_article_storage()
+        self.reconcile_interval = reconcile_interval
+        self.max_distance = max_distance
+        self.title_threshold = title_threshold
+        self.logger = get_logger()
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._last_reconcile = 0.0
+        self._last_marker = None
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            'filename TEXT PRIMARY KEY, '
+            'title TEXT NOT NULL, '
+            'original_title TEXT, '
+            'model TEXT, '
+            'template TEXT, '
+            'size INTEGER NOT NULL DEFAULT 0, '
+            'html_size INTEGER, '
+            'created REAL NOT NULL, '
+            'mtime REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_mtime ON articles (mtime)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_created ON articles (created)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_model ON articles (model, mtime)')
+        self._conn.commit()
+
+        # 全文索引或指纹表新建时，需要为已索引的文章回填
+        self._backfill = not self._table_exists('article_simhash')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS article_simhash ('
+            'filename TEXT PRIMARY KEY, '
+            'simhash INTEGER NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS article_simhash_bands ('
+            'band INTEGER NOT NULL, '
+            'filename TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_simhash_bands_band ON article_simhash_bands (band)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_simhash_bands_filename ON article_simhash_bands (filename)')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS article_published ('
+            'filename TEXT PRIMARY KEY, '
+            'media_id TEXT, '
+            'published_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+        self.fts_enabled = self._create_fts_table()
+
+    def _table_exists(self, name: str) -> bool:
+        return self._conn.execute('SELECT 1 FROM sqlite_master WHERE name = ?', (name,)).fetchone() is not None
+
+    def _create_fts_table(self) -> bool:
+        """
+        创建全文索引表；当前SQLite不支持FTS5时禁用全文检索
+        """
+        exists = self._table_exists('articles_fts')
+        try:
+            self._conn.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(filename UNINDEXED, title, body)')
+            self._conn.commit()
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"SQLite不支持FTS5，文章全文检索不可用: {e}")
+            return False
+        self._backfill = self._backfill or not exists
+        return True
+
+    def _read_text(self, filename: str, path: Optional[str] = None) -> str:
+        path = path or self.storage.resolve_markdown(filename)
+        if not path:
+            return ''
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except OSError:
+            return ''
+
+    def _index_text(self, filename: str, title: str, text: str):
+        """
+        替换文章的全文索引条目和SimHash指纹，调用方需持有锁
+
+        Args:
+            filename: 文章文件名
+            title: 标题及原始标题
+            text: 文章正文
+        """
+        body = tokenize(text)
+        if self.fts_enabled:
+            rowid = _fts_rowid(filename)
+            self._conn.execute('DELETE FROM articles_fts WHERE rowid = ?', (rowid,))
+            self._conn.execute('INSERT INTO articles_fts (rowid, filename, title, body) VALUES (?, ?, ?, ?)',
+                               (rowid, filename, tokenize(title), body))
+
+        fingerprint = simhash_terms(body.split())
+        self._conn.execute('DELETE FROM article_simhash_bands WHERE filename = ?', (filename,))
+        if not fingerprint:
+            self._conn.execute('DELETE FROM article_simhash WHERE filename = ?', (filename,))
+            return
+        self._conn.execute('INSERT OR REPLACE INTO article_simhash (filename, simhash) VALUES (?, ?)',
+                           (filename, to_signed(fingerprint)))
+        self._conn.executemany('INSERT INTO article_simhash_bands (band, filename) VALUES (?, ?)',
+                               [(band, filename) for band in band_keys(fingerprint)])
+
+    def _delete_text(self, filenames: List[str]):
+        """
+        删除文章的全文索引条目、指纹和发布记录，调用方需持有锁
+        """
+        rows = [(filename,) for filename in filenames]
+        if self.fts_enabled:
+            self._conn.executemany('DELETE FROM articles_fts WHERE rowid = ?',
+                                   [(_fts_rowid(filename),) for filename in filenames])
+        self._conn.executemany('DELETE FROM article_simhash WHERE filename = ?', rows)
+        self._conn.executemany('DELETE FROM article_simhash_bands WHERE filename = ?', rows)
+        self._conn.executemany('DELETE FROM article_published WHERE filename = ?', rows)
+
+    def _stat(self, path: Optional[str]) -> Optional[os.stat_result]:
+        if not path:
+            return None
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def upsert(self, filename: str, title: Optional[str] = None, original_title: Optional[str] = None,
+               model: Optional[str] = None):
+        """
+        文章写入后更新索引，大小和修改时间从文件读取；未传入的元数据保留原值
+
+        Args:
+            filename: 文章文件名
+            title: 文章标题
+            original_title: 原始标题（热点话题）
+            model: 生成文章使用的AI模型
+        """
+        path = self.storage.resolve_markdown(filename)
+        stat = self._stat(path)
+        if stat is None:
+            self.remove([filename])
+            return
+
+        html_stat = self._stat(self.storage.resolve_html(filename))
+        created = created_from_filename(filename) or stat.st_mtime
+        text = self._read_text(filename, path)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT INTO articles (filename, title, original_title, model, size, html_size, created, mtime) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(filename) DO UPDATE SET '
+                    'title = COALESCE(?, title), '
+                    'original_title = COALESCE(excluded.original_title, original_title), '
+                    'model = COALESCE(excluded.model, model), '
+                    'size = excluded.size, html_size = excluded.html_size, mtime = excluded.mtime',
+                    (filename, title or title_from_filename(filename), original_title, model, stat.st_size,
+                     html_stat.st_size if html_stat else None, created, stat.st_mtime, title)
+                )
+                titles = self._conn.execute(
+                    'SELECT title, original_title FROM articles WHERE filename = ?', (filename,)).fetchone()
+                self._index_text(filename, ' '.join(filter(None, titles)), text)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"更新文章索引失败 {filename}: {e}")
+
+    def set_html(self, filename: str, template: Optional[str], html_size: Optional[int] = None):
+        """
+        HTML转换完成后记录使用的模板和HTML大小
+
+        Args:
+            filename: 文章文件名
+            template: 模板名称，随机选择时为None
+            html_size: HTML文件大小，为None时从文件读取
+        """
+        if html_size is None:
+            html_stat = self._stat(self.storage.resolve_html(filename))
+            html_size = html_stat.st_size if html_stat else None
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'UPDATE articles SET template = ?, html_size = ? WHERE filename = ?',
+                    (template, html_size, filename)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"更新文章索引失败 {filename}: {e}")
+
+    def remove(self, filenames: Iterable[str]):
+        """
+        文章删除后移除索引条目
+
+        Args:
+            filenames: 文章文件名列表
+        """
+        try:
+            with self._lock:
+                filenames = list(filenames)
+                self._conn.executemany('DELETE FROM articles WHERE filename = ?', [(f,) for f in filenames])
+                self._delete_text(filenames)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"删除文章索引失败: {e}")
+
+    def reconcile(self, force: bool = False) -> Optional[Dict]:
+        """
+        与文章目录对账：新增未索引的文件，更新大小或修改时间变化的文件，移除已不存在的文件
+        未到对账间隔且文章目录、当天分片目录的修改时间未变时直接返回
+
+        Args:
+            force: 忽略对账间隔，立即对账
+
+        Returns:
+            dict: 新增、更新、移除的条目数，未执行对账时返回None
+        """
+        marker = self.storage.change_marker()
+        now = time.time()
+        if (not force and marker == self._last_marker
+                and now - self._last_reconcile < self.reconcile_interval):
+            return None
+
+        with self._reconcile_lock:
+            return self._reconcile(marker, now)
+
+    def _reconcile(self, marker: tuple, now: float) -> Dict:
+        on_disk = {}
+        paths = {}
+        for entry in self.storage.iter_markdown():
+            stat = entry.stat()
+            on_disk[entry.name] = (stat.st_size, stat.st_mtime)
+            paths[entry.name] = entry.path
+
+        html_sizes = {entry.name[:-5] + '.md': entry.stat().st_size for entry in self.storage.iter_html()}
+
+        with self._lock:
+            indexed = {
+                filename: (size, mtime, html_size, ' '.join(filter(None, (title, original_title))))
+                for filename, size, mtime, html_size, title, original_title in self._conn.execute(
+                    'SELECT filename, size, mtime, html_size, title, original_title FROM articles')
+            }
+
+        added = []
+        updated = []
+        # 需要重建全文索引和指纹的 (文件名, 标题)：内容有变化的文件，首次建立索引时为全部文件
+        changed_text = []
+        backfill = self._backfill
+        for filename, (size, mtime) in on_disk.items():
+            html_size = html_sizes.get(filename)
+            current = indexed.get(filename)
+            if current is None:
+                title = title_from_filename(filename)
+                created = created_from_filename(filename) or mtime
+                added.append((filename, title, size, html_size, created, mtime))
+                changed_text.append((filename, title))
+            elif current[:3] != (size, mtime, html_size):
+                updated.append((size, mtime, html_size, filename))
+                if current[:2] != (size, mtime) or backfill:
+                    changed_text.append((filename, current[3]))
+            elif backfill:
+                changed_text.append((filename, current[3]))
+        removed = [(filename,) for filename in indexed if filename not in on_disk]
+
+        if added or updated or removed or changed_text:
+            texts = [(filename, title, self._read_text(filename, paths[filename])) for filename, title in changed_text]
+            try:
+                with self._lock:
+                    self._conn.executemany(
+                        'INSERT OR IGNORE INTO articles (filename, title, size, html_size, created, mtime) '
+                        'VALUES (?, ?, ?, ?, ?, ?)', added)
+                    self._conn.executemany(
+                        'UPDATE articles SET size = ?, mtime = ?, html_size = ? WHERE filename = ?', updated)
+                    self._conn.executemany('DELETE FROM articles WHERE filename = ?', removed)
+                    self._delete_text([filename for filename, in removed])
+                    for filename, title, text in texts:
+                        self._index_text(filename, title, text)
+                    self._conn.commit()
+                self._backfill = False
+            except sqlite3.Error as e:
+                self.logger.error(f"文章索引对账失败: {e}")
+            else:
+                self.logger.info(f"文章索引对账完成: 新增 {len(added)}，更新 {len(updated)}，移除 {len(removed)}")
+
+        self._last_marker = marker
+        self._last_reconcile = now
+        return {'added': len(added), 'updated': len(updated), 'removed': len(removed)}
+
+    def query(self, offset: int = 0, limit: Optional[int] = None, q: Optional[str] = None,
+              model: Optional[str] = None, sort: str = 'modified', order: str = 'desc') -> Tuple[List[Dict], int]:
+        """
+        分页查询文章列表，查询前按需与目录对账
+
+        Args:
+            offset: 跳过的条目数
+            limit: 返回的最大条目数，为None时返回全部
+            q: 按文件名、标题或原始标题过滤的关键词
+            model: 按AI模型过滤
+            sort: 排序字段（modified、created、size、title、name）
+            order: 排序方向（asc 或 desc）
+
+        Returns:
+            tuple: (文章列表, 过滤后的总数)
+        """
+        self.reconcile()
+
+        where = []
+        params = []
+        if q:
+            pattern = '%' + q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            where.append("(filename LIKE ? ESCAPE '\\' OR title LIKE ? ESCAPE '\\' "
+                         "OR original_title LIKE ? ESCAPE '\\')")
+            params.extend([pattern] * 3)
+        if model:
+            where.append('model = ?')
+            params.append(model)
+        where_sql = ' WHERE ' + ' AND '.join(where) if where else ''
+
+        column = SORT_FIELDS.get(sort, 'mtime')
+        direction = 'ASC' if order == 'asc' else 'DESC'
+        sql = (f"SELECT {', '.join(_COLUMNS)} FROM articles{where_sql} "
+               f"ORDER BY {column} {direction}, filename {direction} LIMIT ? OFFSET ?")
+
+        with self._lock:
+            total = self._conn.execute(f'SELECT COUNT(*) FROM articles{where_sql}', params).fetchone()[0]
+            rows = self._conn.execute(sql, params + [-1 if limit is None else limit, offset]).fetchall()
+
+        return [self._row_to_dict(row) for row in rows], total
+
+    def search(self, q: str, offset: int = 0, limit: int = 20) -> Tuple[List[Dict], int]:
+        """
+        全文检索文章标题和正文，按BM25相关度排序（标题命中权重更高），查询前按需与目录对账
+
+        Args:
+            q: 关键词，多个关键词之间为AND关系
+            offset: 跳过的条目数
+            limit: 返回的最大条目数
+
+        Returns:
+            tuple: (文章列表（含摘要片段 snippet 和相关度 score）, 命中总数)
+        """
+        if not self.fts_enabled:
+            raise RuntimeError('当前SQLite不支持FTS5，无法全文检索')
+
+        match = build_match_query(q)
+        if not match:
+            return [], 0
+
+        self.reconcile()
+        columns = ', '.join(f'a.{column}' for column in _COLUMNS)
+        with self._lock:
+            total = self._conn.execute(
+                'SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH ?', (match,)).fetchone()[0]
+            rows = self._conn.execute(
+                f'SELECT {columns}, bm25(articles_fts, 0.0, 10.0, 1.0) AS score '
+                f'FROM articles_fts JOIN articles a ON a.filename = articles_fts.filename '
+                f'WHERE articles_fts MATCH ? ORDER BY score LIMIT ? OFFSET ?',
+                (match, limit, offset)
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            item = self._row_to_dict(row[:-1])
+            item['score'] = round(-row[-1], 4)
+            item['snippet'] = make_snippet(self._read_text(item['name']), q)
+            results.append(item)
+        return results, total
+
+    def find_duplicates(self, filename: Optional[str] = None, text: Optional[str] = None,
+                        published_only: bool = False, limit: int = 5) -> List[Dict]:
+        """
+        按正文SimHash查找近似重复的文章，只比较与指纹至少有一个分带相同的候选
+
+        Args:
+            filename: 已索引的文章文件名，使用其指纹并在结果中排除自身
+            text: 文章正文，未传入filename时使用
+            published_only: 只在已发布到微信的文章中查找
+            limit: 返回的最大条目数
+
+        Returns:
+            list: 近似重复的文章，按汉明距离升序，含 distance、similarity、published_at
+        """
+        fingerprint = 0
+        if filename:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT simhash FROM article_simhash WHERE filename = ?', (filename,)).fetchone()
+            if row:
+                fingerprint = to_unsigned(row[0])
+            elif text is None:
+                text = self._read_text(filename)
+        if not fingerprint and text:
+            fingerprint = simhash_terms(tokenize(text).split())
+        if not fingerprint:
+            return []
+
+        bands = band_keys(fingerprint)
+        sql = ('SELECT DISTINCT s.filename, s.simhash FROM article_simhash_bands b '
+               'JOIN article_simhash s ON s.filename = b.filename ')
+        if published_only:
+            sql += 'JOIN article_published p ON p.filename = b.filename '
+        sql += f"WHERE b.band IN ({', '.join('?' * len(bands))})"
+
+        with self._lock:
+            candidates = self._conn.execute(sql, bands).fetchall()
+
+        matches = []
+        for candidate, value in candidates:
+            if candidate == filename:
+                continue
+            distance = hamming_distance(fingerprint, to_unsigned(value))
+            if distance <= self.max_distance:
+                matches.append((distance, candidate))
+        matches.sort()
+        return self._describe_matches(matches[:limit], lambda distance: {
+            'distance': distance,
+            'similarity': round(1 - distance / SIMHASH_BITS, 4)
+        })
+
+    def find_similar_titles(self, title: str, limit: int = 5) -> List[Dict]:
+        """
+        查找标题或原始标题与给定标题相近的文章
+        通过全文索引的标题列取出共享二字组的候选，再按二字组集合的Jaccard相似度过滤
+
+        Args:
+            title: 标题（如热点话题）
+            limit: 返回的最大条目数
+
+        Returns:
+            list: 标题相近的文章，按相似度降序，含 similarity、published_at
+        """
+        terms = set(tokenize(title).split())
+        if not terms or not self.fts_enabled:
+            return []
+
+        match = 'title : (' + ' OR '.join(f'"{term}"' for term in terms) + ')'
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT a.filename, a.title, a.original_title FROM articles_fts '
+                'JOIN articles a ON a.filename = articles_fts.filename '
+                'WHERE articles_fts MATCH ? ORDER BY rank LIMIT 50',
+                (match,)
+            ).fetchall()
+
+        matches = []
+        for filename, article_title, original_title in rows:
+            best = 0.0
+            for candidate in (article_title, original_title):
+                candidate_terms = set(tokenize(candidate or '').split())
+                if candidate_terms:
+                    best = max(best, len(terms & candidate_terms) / len(terms | candidate_terms))
+            if best >= self.title_threshold:
+                matches.append((-best, filename))
+        matches.sort()
+        return self._describe_matches(matches[:limit], lambda score: {'similarity': round(-score, 4)})
+
+    def _describe_matches(self, matches: List[Tuple], extra) -> List[Dict]:
+        """
+        为 (得分, 文件名) 列表补充文章元数据和发布时间
+        """
+        results = []
+        for score, filename in matches:
+            item = self.get(filename)
+            if item is None:
+                continue
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT published_at FROM article_published WHERE filename = ?', (filename,)).fetchone()
+            item['published_at'] = datetime.fromtimestamp(row[0]).strftime('%Y-%m-%d %H:%M:%S') if row else None
+            item.update(extra(score))
+            results.append(item)
+        return results
+
+    def mark_published(self, filename: str, media_id: Optional[str] = None):
+        """
+        记录文章已发布到微信，发布前的重复检查只与已发布的文章比较
+
+        Args:
+            filename: 文章文件名
+            media_id: 微信草稿Media ID
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO article_published (filename, media_id, published_at) VALUES (?, ?, ?)',
+                    (filename, media_id, time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"记录文章发布状态失败 {filename}: {e}")
+
+    def get(self, filename: str) -> Optional[Dict]:
+        """
+        获取单篇文章的索引条目
+
+        Args:
+            filename: 文章文件名
+
+        Returns:
+            dict: 文章元数据，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM articles WHERE filename = ?", (filename,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        item = dict(zip(_COLUMNS, row))
+        item['name'] = item.pop('filename')
+        item['created'] = datetime.fromtimestamp(item['created']).strftime('%Y-%m-%d %H:%M:%S')
+        item['modified'] = datetime.fromtimestamp(item.pop('mtime')).strftime('%Y-%m-%d %H:%M:%S')
+        return item
+
+
+# 全局文章索引实例
+_global_article_index = None
+_global_article_index_lock = threading.Lock()
+
+
+def get_article_index() -> ArticleIndex:
+    """
+    获取全局文章索引实例，配置文件不存在时使用默认配置
+
+    Returns:
+        ArticleIndex: 文章索引实例
+    """
+    global _global_article_index
+    if _global_article_index is None:
+        with _global_article_index_lock:
+            if _global_article_index is None:
+                try:
+                    from core.config import get_config
+                    index_config = get_config().get_article_index_config()
+                except FileNotFoundError:
+                    index_config = {'db_path': 'data/articles.db', 'reconcile_interval': 30,
+                                    'duplicate_max_distance': 3, 'duplicate_title_threshold': 0.5}
+                db_path = index_config['db_path']
+                if not os.path.isabs(db_path):
+                    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), db_path)
+                _global_article_index = ArticleIndex(db_path,
+                                                     reconcile_interval=index_config['reconcile_interval'],
+                                                     max_distance=index_config['duplicate_max_distance'],
+                                                     title_threshold=index_config['duplicate_title_threshold'])
+    return _global_article_index
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+文章全文检索分词模块
+SQLite自带的FTS5分词器不切分中文，这里在写入索引前把中文切成相邻二字组（bigram），
+英文和数字按单词切分并转小写，查询时按同样规则切分，使中文短语检索无需额外分词依赖
+"""
+
+import html
+import re
+from operator import add
+from typing import List, Optional, Tuple
+
+
+# 中日韩统一表意文字及扩展A、兼容表意文字
+_CJK = '㐀-䶿一-鿿豈-﫿'
+_TERM_RE = re.compile(f'([{_CJK}]+)|([a-z0-9]+)')
+
+SNIPPET_RADIUS = 40
+
+
+def _split_terms(text: str) -> List[Tuple[str, bool]]:
+    """
+    将文本切分为 (片段, 是否中文) 序列，中文为连续汉字串，其余为小写单词
+    """
+    return [(cjk or word, bool(cjk)) for cjk, word in _TERM_RE.findall(text.lower())]
+
+
+def tokenize(text: str) -> str:
+    """
+    将文本转换为写入FTS5的词项串：中文切成相邻二字组，单个汉字保持原样，单词原样保留
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        str: 以空格分隔的词项
+    """
+    tokens = []
+    for term, is_cjk in _split_terms(text):
+        if is_cjk and len(term) > 1:
+            tokens.extend(map(add, term, term[1:]))
+        else:
+            tokens.append(term)
+    return ' '.join(tokens)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    将用户输入转换为FTS5的MATCH表达式，各词项之间为AND关系
+    中文短语转为二字组短语；单个汉字和英文单词按前缀匹配
+
+    Args:
+        query: 用户输入的关键词
+
+    Returns:
+        str: MATCH表达式，没有可检索的词项时返回None
+    """
+    parts = []
+    for term, is_cjk in _split_terms(query):
+        if is_cjk and len(term) > 1:
+            bigrams = ' '.join(map(add, term, term[1:]))
+            parts.append(f'"{bigrams}"')
+        else:
+            parts.append(f'"{term}"*')
+    return ' '.join(parts) or None
+
+
+def make_snippet(text: str, query: str, radius: int = SNIPPET_RADIUS) -> str:
+    """
+    从原文截取第一个命中词项附近的片段，命中部分用 <mark> 标记，其余内容做HTML转义
+
+    Args:
+        text: 文章原文
+        query: 用户输入的关键词
+        radius: 命中位置前后保留的字符数
+
+    Returns:
+        str: 摘要片段
+    """
+    terms = sorted({term for term, _ in _split_terms(query)}, key=len, reverse=True)
+    if not terms:
+        return html.escape(text[:radius * 2])
+
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    if not match:
+        return html.escape(text[:radius * 2])
+
+    start = max(match.start() - radius, 0)
+    end = min(match.end() + radius, len(text))
+    window = ' '.join(text[start:end].split())
+
+    out = []
+    last = 0
+    for hit in pattern.finditer(window):
+        out.append(html.escape(window[last:hit.start()]))
+        out.append(f'<mark>{html.escape(hit.group())}</mark>')
+        last = hit.end()
+    out.append(html.escape(window[last:]))
+    return ('…' if start > 0 else '') + ''.join(out) + ('…' if end < len(text) else '')
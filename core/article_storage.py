@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+文章存储模块
+文章按文件名中的时间戳前缀存放在日期分片目录 articles/YYYY/MM/DD/ 下，HTML在 articles/html/YYYY/MM/DD/ 下，
+单个目录的文件数保持在较小规模；所有写入先写临时文件再 os.replace 原子替换，并可按配置执行fsync。
+对外仍以文件名作为文章标识，路由通过本模块解析实际路径，尚未迁移的平铺文件同样可以访问
+"""
+
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+from core.logger import get_logger
+from tools.utils import atomic_write_text, fsync_directory
+
+
+# 项目根目录下的文章目录
+ARTICLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'articles')
+
+# 存储布局：sharded（按日期分片）或 flat（全部平铺在文章目录下）
+STORAGE_LAYOUTS = ('sharded', 'flat')
+
+# fsync策略：none（依赖操作系统刷盘）、file（替换前同步文件内容）、full（同时同步目录）
+FSYNC_POLICIES = ('none', 'file', 'full')
+
+_TIMESTAMP_PREFIX_RE = re.compile(r'^(\d{4})(\d{2})(\d{2})_\d{6}_')
+_SHARD_PARTS_RE = (re.compile(r'^\d{4}$'), re.compile(r'^\d{2}$'), re.compile(r'^\d{2}$'))
+
+
+def validate_filename(filename: str) -> str:
+    """
+    校验文章文件名，只允许不含路径的普通文件名
+
+    Args:
+        filename: 文件名
+
+    Returns:
+        str: 文件名本身
+
+    Raises:
+        ValueError: 文件名包含路径分隔符或以点开头
+    """
+    if (not isinstance(filename, str) or not filename or filename.startswith('.')
+            or os.path.basename(filename) != filename or '\\' in filename):
+        raise ValueError(f"无效的文件名: {filename}")
+    return filename
+
+
+def _stem(filename: str) -> str:
+    for ext in ('.md', '.html'):
+        if filename.endswith(ext):
+            return filename[:-len(ext)]
+    return filename
+
+
+class ArticleStorage:
+    """
+    文章存储
+    Markdown文件名与HTML文件名一一对应（扩展名不同），两者使用相同的日期分片
+    """
+
+    def __init__(self, root: str = ARTICLES_DIR, layout: str = 'sharded', fsync: str = 'file'):
+        """
+        初始化文章存储
+
+        Args:
+            root: 文章根目录
+            layout: 存储布局，sharded 或 flat
+            fsync: fsync策略，none、file 或 full
+        """
+        self.logger = get_logger()
+        if layout not in STORAGE_LAYOUTS:
+            self.logger.warning(f"不支持的文章存储布局: {layout}，使用sharded")
+            layout = 'sharded'
+        if fsync not in FSYNC_POLICIES:
+            self.logger.warning(f"不支持的fsync策略: {fsync}，使用file")
+            fsync = 'file'
+
+        self.root = root
+        self.html_root = os.path.join(root, 'html')
+        self.layout = layout
+        self.fsync = fsync
+
+    def shard_for(self, filename: str) -> str:
+        """
+        获取文件所属的分片相对路径，文件名没有时间戳前缀或使用平铺布局时为空字符串
+
+        Args:
+            filename: Markdown或HTML文件名
+
+        Returns:
+            str: 如 2024/05/01
+        """
+        if self.layout != 'sharded':
+            return ''
+        match = _TIMESTAMP_PREFIX_RE.match(filename)
+        return os.path.join(*match.groups()) if match else ''
+
+    def _paths(self, base: str, name: str) -> Tuple[str, str]:
+        """
+        返回 (分片路径, 平铺路径)
+        """
+        return os.path.join(base, self.shard_for(name), name), os.path.join(base, name)
+
+    def _resolve(self, base: str, name: str) -> Optional[str]:
+        for path in self._paths(base, name):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def markdown_path(self, filename: str) -> str:
+        """
+        获取Markdown文件路径：已存在时返回实际位置（兼容未迁移的平铺文件），否则返回应写入的分片位置
+        """
+        validate_filename(filename)
+        return self._resolve(self.root, filename) or self._paths(self.root, filename)[0]
+
+    def html_path(self, filename: str) -> str:
+        """
+        获取文章对应的HTML文件路径，参数可以是Markdown或HTML文件名
+        """
+        name = _stem(validate_filename(filename)) + '.html'
+        return self._resolve(self.html_root, name) or self._paths(self.html_root, name)[0]
+
+    def resolve_markdown(self, filename: str) -> Optional[str]:
+        """
+        获取已存在的Markdown文件路径，不存在时返回None
+        """
+        return self._resolve(self.root, validate_filename(filename))
+
+    def resolve_html(self, filename: str) -> Optional[str]:
+        """
+        获取已存在的HTML文件路径，参数可以是Markdown或HTML文件名，不存在时返回None
+        """
+        return self._resolve(self.html_root, _stem(validate_filename(filename)) + '.html')
+
+    def atomic_write(self, path: str, content: str):
+        """
+        按fsync策略原子写入文件
+        """
+        atomic_write_text(path, content, fsync=self.fsync != 'none', fsync_dir=self.fsync == 'full')
+
+    def write_markdown(self, filename: str, content: str) -> str:
+        """
+        原子写入Markdown文件
+
+        Returns:
+            str: 文件路径
+        """
+        path = self.markdown_path(filename)
+        self.atomic_write(path, content)
+        return path
+
+    def write_html(self, filename: str, content: str) -> str:
+        """
+        原子写入文章对应的HTML文件，参数可以是Markdown或HTML文件名
+
+        Returns:
+            str: 文件路径
+        """
+        path = self.html_path(filename)
+        self.atomic_write(path, content)
+        return path
+
+    def delete(self, filename: str) -> Tuple[bool, bool]:
+        """
+        删除文章的Markdown文件及对应的HTML文件
+
+        Returns:
+            tuple: (是否删除了Markdown文件, 是否删除了HTML文件)
+        """
+        deleted = []
+        for path in (self.resolve_markdown(filename), self.resolve_html(filename)):
+            if path is None:
+                deleted.append(False)
+                continue
+            os.remove(path)
+            if self.fsync == 'full':
+                fsync_directory(os.path.dirname(path))
+            deleted.append(True)
+        return deleted[0], deleted[1]
+
+    def _iter_dirs(self, base: str) -> Iterator[str]:
+        """
+        遍历符合 YYYY/MM/DD 格式的分片目录，最后是根目录本身（与路径解析一致，分片中的文件优先）
+        """
+        stack = [(base, 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    children = sorted(entry.path for entry in entries
+                                      if _SHARD_PARTS_RE[depth].match(entry.name) and entry.is_dir())
+            except FileNotFoundError:
+                continue
+            for child in children:
+                if depth == 2:
+                    yield child
+                else:
+                    stack.append((child, depth + 1))
+        yield base
+
+    def _iter_files(self, base: str, ext: str) -> Iterator[os.DirEntry]:
+        seen = set()
+        for directory in self._iter_dirs(base):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(ext) and entry.name not in seen and entry.is_file():
+                            seen.add(entry.name)
+                            yield entry
+            except FileNotFoundError:
+                continue
+
+    def iter_markdown(self) -> Iterator[os.DirEntry]:
+        """
+        遍历全部Markdown文件（分片目录和平铺文件）
+        """
+        return self._iter_files(self.root, '.md')
+
+    def iter_html(self) -> Iterator[os.DirEntry]:
+        """
+        遍历全部HTML文件（分片目录和平铺文件）
+        """
+        return self._iter_files(self.html_root, '.html')
+
+    def change_marker(self) -> tuple:
+        """
+        返回文章根目录和当天分片目录的修改时间，新文章写入或删除时至少其一会变化
+        """
+        today = os.path.join(self.root, self.shard_for(datetime.now().strftime('%Y%m%d_%H%M%S_')))
+        marker = []
+        for directory in (self.root, today):
+            try:
+                marker.append(os.stat(directory).st_mtime)
+            except OSError:
+                marker.append(None)
+        return tuple(marker)
+
+    def migrate(self, dry_run: bool = False) -> Dict[str, int]:
+        """
+        将平铺在根目录（及html目录）下、带时间戳前缀的文件移动到日期分片目录
+        同一文件系统内的 os.replace 为原子操作，迁移中断后可重复执行
+
+        Args:
+            dry_run: 只统计需要迁移的文件，不实际移动
+
+        Returns:
+            dict: 迁移的Markdown、HTML文件数，以及分片中已存在同名文件而跳过的文件数
+        """
+        stats = {'markdown': 0, 'html': 0, 'skipped': 0}
+        if self.layout != 'sharded':
+            return stats
+
+        for base, ext, key in ((self.root, '.md', 'markdown'), (self.html_root, '.html', 'html')):
+            try:
+                with os.scandir(base) as entries:
+                    names = [entry.name for entry in entries if entry.name.endswith(ext) and entry.is_file()]
+            except FileNotFoundError:
+                continue
+
+            for name in names:
+                target, source = self._paths(base, name)
+                if target == source:
+                    continue
+                if os.path.exists(target):
+                    self.logger.warning(f"分片目录中已存在同名文件，跳过迁移: {source}")
+                    stats['skipped'] += 1
+                    continue
+                if not dry_run:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    os.replace(source, target)
+                    if self.fsync == 'full':
+                        fsync_directory(os.path.dirname(target))
+                stats[key] += 1
+
+            if not dry_run and self.fsync == 'full':
+                fsync_directory(base)
+
+        self.logger.info(f"文章存储迁移完成: Markdown {stats['markdown']} 个，HTML {stats['html']} 个，"
+                         f"跳过 {stats['skipped']} 个")
+        return stats
+
+
+# 全局文章存储实例
+_global_article_storage = None
+_global_article_storage_lock = threading.Lock()
+
+
+def get_article_storage() -> ArticleStorage:
+    """
+    获取全局文章存储实例，配置文件不存在时使用默认配置
+
+    Returns:
+        ArticleStorage: 文章存储实例
+    """
+    global _global_article_storage
+    if _global_article_storage is None:
+        with _global_article_storage_lock:
+            if _global_article_storage is None:
+                try:
+                    from core.config import get_config
+                    storage_config = get_config().get_article_storage_config()
+                except FileNotFoundError:
+                    storage_config = {'layout': 'sharded', 'fsync': 'file'}
+                _global_article_storage = ArticleStorage(layout=storage_config['layout'],
+                                                         fsync=storage_config['fsync'])
+    return _global_article_storage
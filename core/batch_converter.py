@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+批量HTML转换模块
+使用进程池并行执行Markdown转HTML，避免大批量转换占用Web进程的GIL
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
+
+from core.article_storage import get_article_storage
+from core.logger import get_logger
+
+
+# 工作进程内的HTML转换器，按解析后端分别缓存
+_worker_converters = {}
+
+
+def convert_markdown_file(md_path: str, html_path: str, title: str, template_name: Optional[str], parser: str) -> dict:
+    """
+    在工作进程中转换单个Markdown文件并原子写入HTML文件
+
+    Args:
+        md_path: Markdown文件路径
+        html_path: 输出HTML文件路径
+        title: 文章标题
+        template_name: 样式模板名称，为None时随机选择
+        parser: HTML解析后端
+
+    Returns:
+        dict: 转换耗时及输出大小
+    """
+    start = time.time()
+    converter = _worker_converters.get(parser)
+    if converter is None:
+        from core.html_converter import HTMLConverter
+        converter = _worker_converters[parser] = HTMLConverter(parser=parser)
+
+    with open(md_path, 'r', encoding='utf-8') as f:
+        md_content = f.read()
+
+    html_content = converter.markdown_to_styled_html(md_content, title, template_name)
+    if html_content is None:
+        raise RuntimeError("Markdown转HTML失败")
+
+    get_article_storage().atomic_write(html_path, html_content)
+    return {'elapsed': round(time.time() - start, 3), 'size': len(html_content)}
+
+
+class BatchConverter:
+    """
+    批量HTML转换器
+    进程池在首次使用时以spawn方式创建，工作进程数默认等于CPU核数
+    """
+
+    def __init__(self, max_workers: int = 0, parser: str = 'html.parser'):
+        """
+        初始化批量转换器
+
+        Args:
+            max_workers: 工作进程数，0表示使用CPU核数
+            parser: 工作进程使用的HTML解析后端
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parser = parser
+        self.logger = get_logger()
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._stats = {'batches': 0, 'running': 0, 'completed': 0, 'failed': 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Web进程中已有调度线程、队列工作线程和SQLite连接，fork时其他线程持有的锁会被复制到子进程，
+                # 使用spawn启动全新的解释器，避免子进程死锁
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+                self.logger.info(f"HTML批量转换进程池已启动，进程数: {self.max_workers}")
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor):
+        """
+        工作进程异常退出后丢弃进程池，下次使用时重建
+        """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def convert(self, jobs: List[Dict], template_name: Optional[str], on_result: Callable[[dict], None]):
+        """
+        并行转换一批文件，阻塞直到全部完成，每个文件完成时回调
+
+        Args:
+            jobs: 转换任务列表，元素包含 filename, md_path, html_path, html_filename, title
+            template_name: 样式模板名称，为None时每个文件随机选择
+            on_result: 单个文件完成回调，参数包含 filename, html_filename, success, error, elapsed
+        """
+        pool = self._get_pool()
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['running'] += len(jobs)
+
+        futures = {}
+        for job in jobs:
+            try:
+                future = pool.submit(convert_markdown_file, job['md_path'], job['html_path'],
+                                     job['title'], template_name, self.parser)
+            except Exception as e:
+                self._finish(job, on_result, error=e)
+                continue
+            futures[future] = job
+
+        broken = False
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                self._finish(job, on_result, result=future.result())
+            except Exception as e:
+                broken = broken or isinstance(e, BrokenProcessPool)
+                self._finish(job, on_result, error=e)
+
+        if broken:
+            self.logger.error("HTML批量转换工作进程异常退出，进程池将重建")
+            self._reset_pool(pool)
+
+    def _finish(self, job: dict, on_result: Callable[[dict], None], result: dict = None, error: Exception = None):
+        with self._lock:
+            self._stats['running'] -= 1
+            self._stats['failed' if error else 'completed'] += 1
+
+        if error:
+            self.logger.error(f"批量转换HTML失败 {job['filename']}: {error}")
+
+        try:
+            on_result({
+                'filename': job['filename'],
+                'html_filename': job['html_filename'],
+                'success': error is None,
+                'error': str(error) if error else None,
+                'elapsed': result['elapsed'] if result else None
+            })
+        except Exception as e:
+            self.logger.error(f"批量转换结果回调失败: {e}")
+
+    def get_stats(self) -> dict:
+        """
+        获取批量转换统计
+
+        Returns:
+            dict: 进程数、批次数及文件完成情况
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pool_started'] = self._pool is not None
+        stats['max_workers'] = self.max_workers
+        return stats
@@ -5,9 +5,102 @@
 """
 
 from bs4 import BeautifulSoup
+from core.css_style import merge_styles
 from core.logger import get_logger
 
 
+# 可直接从class中识别的代码语言
+CODE_LANGUAGES = ['python', 'javascript', 'java', 'cpp', 'c', 'bash', 'shell', 'sh', 'html', 'css', 'sql', 'json', 'xml', 'yaml']
+
+# 代码块各部分的内联样式
+CODE_CONTAINER_STYLE = (
+    "background: #000000; "
+    "border: 2px solid #333333; "
+    "border-radius: 12px; "
+    "padding: 20px; "
+    "margin: 20px 0; "
+    "box-shadow: 0 8px 25px rgba(0, 0, 0, 0.5); "
+    "position: relative; "
+    "overflow-x: auto; "
+    "max-width: 100%; "
+    "-webkit-overflow-scrolling: touch; "
+    "scrollbar-width: thin; "
+    "scrollbar-color: #666 #333;"
+)
+
+CODE_STYLE = (
+    "color: #ffffff; "
+    "font-family: 'Consolas', 'Monaco', monospace; "
+    "font-size: 14px; "
+    "background: transparent; "
+    "padding: 0; "
+    "border: none; "
+    "white-space: pre; "
+    "word-wrap: break-word; "
+    "overflow-wrap: break-word;"
+)
+
+CODE_LINE_STYLE = (
+    "display: flex; "
+    "align-items: flex-start; "
+    "margin: 2px 0; "
+    "padding: 3px 0; "
+    "border-radius: 4px; "
+    "transition: background-color 0.2s ease; "
+    "flex-wrap: wrap;"
+)
+
+LINE_NUMBER_STYLE = (
+    "color: #ffffff; "
+    "font-family: 'Consolas', 'Monaco', monospace; "
+    "font-size: 12px; "
+    "margin-right: 15px; "
+    "min-width: 25px; "
+    "text-align: right; "
+    "user-select: none; "
+    "opacity: 0.7; "
+    "flex-shrink: 0;"
+)
+
+CODE_HEADER_STYLE = (
+    "background: #000000; "
+    "color: #ffffff; "
+    "padding: 10px 15px; "
+    "border-radius: 8px 8px 0 0; "
+    "font-family: 'SF Pro Display', 'Helvetica Neue', sans-serif; "
+    "font-size: 13px; "
+    "font-weight: 600; "
+    "display: flex; "
+    "align-items: center; "
+    "justify-content: space-between; "
+    "border-bottom: 1px solid #333333; "
+    "margin: -20px -20px 15px -20px;"
+)
+
+COMMENT_CONTENT_STYLE = (
+    "color: #cccccc; "
+    "font-family: 'Consolas', 'Monaco', monospace; "
+    "font-size: 14px; "
+    "font-style: italic; "
+    "opacity: 0.8; "
+    "word-wrap: break-word; "
+    "overflow-wrap: break-word; "
+    "white-space: pre-wrap; "
+    "flex: 1;"
+)
+
+LINE_CONTENT_STYLE = (
+    "color: #ffffff; "
+    "font-family: 'Consolas', 'Monaco', monospace; "
+    "font-size: 14px; "
+    "font-weight: 500; "
+    "word-wrap: break-word; "
+    "overflow-wrap: break-word; "
+    "white-space: pre-wrap; "
+    "flex: 1;"
+)
+
+
 class CodeProcessor:
     """
     代码块处理器
@@ -35,17 +128,7 @@ class CodeProcessor:
                 code_tag = pre_tag.find('code')
                 if code_tag:
                     # 获取代码语言类型
-                    code_classes = code_tag.get('class', [])
-                    language = 'code'  # 默认语言类型
-                    
-                    # 尝试从class中提取语言类型
-                    for cls in code_classes:
-                        if cls.startswith('language-'):
-                            language = cls.replace('language-', '')
-                            break
-                        elif cls in ['python', 'javascript', 'java', 'cpp', 'c', 'bash', 'shell', 'sh', 'html', 'css', 'sql', 'json', 'xml', 'yaml']:
-                            language = cls
-                            break
+                    language = self.detect_language(code_tag.get('class', []))
                     
                     # 为所有代码块添加统一标识
                     pre_tag['data-language'] = language
@@ -63,6 +146,35 @@ class CodeProcessor:
         except Exception as e:
             self.logger.error(f"处理代码块时出错: {e}")
     
+    def detect_language(self, code_classes) -> str:
+        """
+        从code标签的class中提取语言类型
+        
+        Args:
+            code_classes: class列表
+        
+        Returns:
+            str: 语言类型，无法识别时返回'code'
+        """
+        for cls in code_classes:
+            if cls.startswith('language-'):
+                return cls.replace('language-', '')
+            elif cls in CODE_LANGUAGES:
+                return cls
+        return 'code'
+    
+    def is_unified_code_block(self, tag) -> bool:
+        """
+        判断标签是否为统一代码块（带 unified-code-block 类的pre标签）
+        
+        Args:
+            tag: BeautifulSoup标签对象
+        
+        Returns:
+            bool: 是统一代码块返回True
+        """
+        return tag.name == 'pre' and 'unified-code-block' in tag.get('class', [])
+    
     def is_code_related_tag(self, tag):
         """
         判断标签是否与代码块相关
@@ -75,13 +187,13 @@ class CodeProcessor:
         """
         try:
             # 检查标签本身是否是统一代码块
-            if tag.name == 'pre' and 'unified-code-block' in tag.get('class', []):
+            if self.is_unified_code_block(tag):
                 return True
             
             # 检查标签是否在统一代码块内部
             parent = tag.parent
             while parent:
-                if parent.name == 'pre' and 'unified-code-block' in parent.get('class', []):
+                if self.is_unified_code_block(parent):
                     return True
                 parent = parent.parent
             
@@ -108,26 +220,7 @@ class CodeProcessor:
             
             for pre_tag in code_blocks:
                 # 为代码块容器添加特殊样式 - 黑色背景
-                code_container_style = (
-                    "background: #000000; "
-                    "border: 2px solid #333333; "
-                    "border-radius: 12px; "
-                    "padding: 20px; "
-                    "margin: 20px 0; "
-                    "box-shadow: 0 8px 25px rgba(0, 0, 0, 0.5); "
-                    "position: relative; "
-                    "overflow-x: auto; "
-                    "max-width: 100%; "
-                    "-webkit-overflow-scrolling: touch; "
-                    "scrollbar-width: thin; "
-                    "scrollbar-color: #666 #333;"
-                )
-                
-                existing_style = pre_tag.get('style', '')
-                if existing_style:
-                    pre_tag['style'] = f"{existing_style}; {code_container_style}"
-                else:
-                    pre_tag['style'] = code_container_style
+                pre_tag['style'] = merge_styles(pre_tag.get('style', ''), CODE_CONTAINER_STYLE)
                 
                 # 添加代码标题栏
                 self._add_code_header(pre_tag)
@@ -135,82 +228,28 @@ class CodeProcessor:
                 # 为代码块中的code标签设置白色字体
                 code_tag = pre_tag.find('code')
                 if code_tag:
-                    code_style = (
-                        "color: #ffffff; "
-                        "font-family: 'Consolas', 'Monaco', monospace; "
-                        "font-size: 14px; "
-                        "background: transparent; "
-                        "padding: 0; "
-                        "border: none; "
-                        "white-space: pre; "
-                        "word-wrap: break-word; "
-                        "overflow-wrap: break-word;"
-                    )
-                    existing_code_style = code_tag.get('style', '')
-                    if existing_code_style:
-                        code_tag['style'] = f"{existing_code_style}; {code_style}"
-                    else:
-                        code_tag['style'] = code_style
+                    code_tag['style'] = merge_styles(code_tag.get('style', ''), CODE_STYLE)
                 
                 # 为代码行添加样式
                 code_lines = pre_tag.find_all('div', class_='code-line')
                 for line_div in code_lines:
-                    line_style = (
-                        "display: flex; "
-                        "align-items: flex-start; "
-                        "margin: 2px 0; "
-                        "padding: 3px 0; "
-                        "border-radius: 4px; "
-                        "transition: background-color 0.2s ease; "
-                        "flex-wrap: wrap;"
-                    )
-                    line_div['style'] = line_style
+                    line_div['style'] = merge_styles(CODE_LINE_STYLE)
                     
                     # 为行号添加样式 - 白色
                     line_number = line_div.find('span', class_='line-number')
                     if line_number:
-                        number_style = (
-                            "color: #ffffff; "
-                            "font-family: 'Consolas', 'Monaco', monospace; "
-                            "font-size: 12px; "
-                            "margin-right: 15px; "
-                            "min-width: 25px; "
-                            "text-align: right; "
-                            "user-select: none; "
-                            "opacity: 0.7; "
-                            "flex-shrink: 0;"
-                        )
-                        line_number['style'] = number_style
+                        line_number['style'] = merge_styles(LINE_NUMBER_STYLE)
                     
                     # 为代码内容添加样式 - 白色
                     line_content = line_div.find('span', class_='line-content')
                     if line_content:
                         if 'comment' in line_content.get('class', []):
                             # 注释样式 - 灰色
-                            content_style = (
-                                "color: #cccccc; "
-                                "font-family: 'Consolas', 'Monaco', monospace; "
-                                "font-size: 14px; "
-                                "font-style: italic; "
-                                "opacity: 0.8; "
-                                "word-wrap: break-word; "
-                                "overflow-wrap: break-word; "
-                                "white-space: pre-wrap; "
-                                "flex: 1;"
-                            )
+                            content_style = COMMENT_CONTENT_STYLE
                         else:
                             # 普通代码样式 - 白色
-                            content_style = (
-                                "color: #ffffff; "
-                                "font-family: 'Consolas', 'Monaco', monospace; "
-                                "font-size: 14px; "
-                                "font-weight: 500; "
-                                "word-wrap: break-word; "
-                                "overflow-wrap: break-word; "
-                                "white-space: pre-wrap; "
-                                "flex: 1;"
-                            )
-                        line_content['style'] = content_style
+                            content_style = LINE_CONTENT_STYLE
+                        line_content['style'] = merge_styles(content_style)
                         
         except Exception as e:
             self.logger.error(f"应用代码样式时出错: {e}")
@@ -226,21 +265,7 @@ class CodeProcessor:
             # 创建标题栏
             header_div = pre_tag.parent.new_tag('div')
             header_div['class'] = 'code-header'
-            header_style = (
-                "background: #000000; "
-                "color: #ffffff; "
-                "padding: 10px 15px; "
-                "border-radius: 8px 8px 0 0; "
-                "font-family: 'SF Pro Display', 'Helvetica Neue', sans-serif; "
-                "font-size: 13px; "
-                "font-weight: 600; "
-                "display: flex; "
-                "align-items: center; "
-                "justify-content: space-between; "
-                "border-bottom: 1px solid #333333; "
-                "margin: -20px -20px 15px -20px;"
-            )
-            header_div['style'] = header_style
+            header_div['style'] = merge_styles(CODE_HEADER_STYLE)
             
             # 添加代码图标和标题
             title_span = pre_tag.parent.new_tag('span')
@@ -75,6 +75,25 @@ class ConfigManager:
                 return fallback
             raise
 
+    def get_bool(self, section: str, key: str, fallback: Optional[bool] = None) -> bool:
+        """
+        获取布尔配置值
+        
+        Args:
+            section: 配置节
+            key: 配置键
+            fallback: 默认值
+        
+        Returns:
+            bool: 配置值
+        """
+        try:
+            return self.config.getboolean(section, key, fallback=fallback)
+        except (configparser.NoSectionError, configparser.NoOptionError):
+            if fallback is not None:
+                return fallback
+            raise
+
     def get_gemini_api_key(self) -> str:
         """
         获取Gemini API Key
@@ -93,6 +112,15 @@ class ConfigManager:
         """
         return self.get('API', 'ai_model', 'qwen')
     
+    def get_stream_output(self) -> bool:
+        """
+        获取是否以流式方式输出文章内容
+        
+        Returns:
+            bool: 是否启用流式输出
+        """
+        return self.get_bool('API', 'stream_output', True)
+    
     def get_qwen_config(self, model_type: str = 'qwen') -> dict:
         """
         获取Qwen配置
@@ -129,6 +157,197 @@ class ConfigManager:
             'author': self.get('WECHAT', 'author')
         }
     
+    def get_task_queue_config(self) -> dict:
+        """
+        获取文章生成任务队列配置
+        
+        Returns:
+            dict: 各AI模型的并发上限及等待队列长度
+        """
+        return {
+            'max_workers': {
+                'qwen': self.get_int('TASK', 'max_workers_qwen', 3),
+                'kimi': self.get_int('TASK', 'max_workers_kimi', 2),
+                'gemini': self.get_int('TASK', 'max_workers_gemini', 2)
+            },
+            'max_queue_size': self.get_int('TASK', 'max_queue_size', 20)
+        }
+    
+    def get_task_store_config(self) -> dict:
+        """
+        获取任务状态存储配置
+        
+        Returns:
+            dict: 存储后端（memory 或 sqlite）、数据库路径、过期时间及最大条目数
+        """
+        return {
+            'backend': self.get('TASK', 'task_store', 'memory'),
+            'db_path': self.get('TASK', 'task_store_path', 'data/tasks.db'),
+            'ttl': self.get_int('TASK', 'task_ttl', 3600),
+            'max_entries': self.get_int('TASK', 'task_max_entries', 1000)
+        }
+    
+    def get_http_config(self) -> dict:
+        """
+        获取HTTP连接池配置
+        
+        Returns:
+            dict: 连接池大小、重试次数、退避系数、默认超时及按主机的超时设置
+        """
+        host_timeouts = {}
+        raw = self.get('HTTP', 'host_timeouts',
+                       'dashscope.aliyuncs.com:60, api.weixin.qq.com:30, trends.zhiweidata.com:10, tophub.today:10')
+        for item in raw.split(','):
+            host, _, timeout = item.strip().rpartition(':')
+            if host and timeout:
+                host_timeouts[host] = float(timeout)
+        
+        return {
+            'pool_size': self.get_int('HTTP', 'pool_size', 10),
+            'max_retries': self.get_int('HTTP', 'max_retries', 2),
+            'backoff_factor': float(self.get('HTTP', 'backoff_factor', '0.5')),
+            'default_timeout': float(self.get('HTTP', 'default_timeout', '60')),
+            'host_timeouts': host_timeouts
+        }
+    
+    def get_response_cache_config(self) -> dict:
+        """
+        获取AI响应缓存配置
+        
+        Returns:
+            dict: 是否启用、缓存目录、内存最大条目数、有效秒数及磁盘最大文件数
+        """
+        return {
+            'enabled': self.get_bool('CACHE', 'enabled', True),
+            'cache_dir': self.get('CACHE', 'cache_dir', 'articles/.cache'),
+            'max_entries': self.get_int('CACHE', 'max_entries', 256),
+            'ttl': self.get_int('CACHE', 'ttl', 86400),
+            'max_disk_entries': self.get_int('CACHE', 'disk_max_entries', 2000)
+        }
+    
+    def get_html_cache_config(self) -> dict:
+        """
+        获取HTML渲染缓存配置
+        
+        Returns:
+            dict: 是否启用、内存最大条目数、是否持久化到磁盘、磁盘目录及磁盘最大文件数
+        """
+        return {
+            'enabled': self.get_bool('CACHE', 'html_cache_enabled', True),
+            'max_entries': self.get_int('CACHE', 'html_cache_max_entries', 64),
+            'persist': self.get_bool('CACHE', 'html_cache_persist', True),
+            'cache_dir': self.get('CACHE', 'html_cache_dir', 'articles/html/.render_cache'),
+            'max_disk_entries': self.get_int('CACHE', 'html_cache_disk_max_entries', 1000)
+        }
+    
+    def get_html_parser(self) -> str:
+        """
+        获取HTML转换使用的解析后端
+        
+        Returns:
+            str: html.parser、lxml（BeautifulSoup+lxml）或 lxml.html（直接操作lxml树）
+        """
+        return self.get('HTML', 'parser', 'html.parser')
+    
+    def get_theme_config(self) -> dict:
+        """
+        获取外部样式模板配置
+        
+        Returns:
+            dict: 模板目录及检查文件变化的最小间隔秒数
+        """
+        return {
+            'themes_dir': self.get('HTML', 'themes_dir', 'themes'),
+            'reload_interval': float(self.get('HTML', 'theme_reload_interval', '2'))
+        }
+    
+    def get_batch_convert_workers(self) -> int:
+        """
+        获取批量HTML转换的工作进程数
+        
+        Returns:
+            int: 工作进程数，0表示使用CPU核数
+        """
+        return max(self.get_int('HTML', 'batch_workers', 0), 0)
+    
+    def get_article_index_config(self) -> dict:
+        """
+        获取文章索引配置
+        
+        Returns:
+            dict: 索引数据库路径、与文章目录对账的最小间隔秒数及近似重复判定阈值
+        """
+        return {
+            'db_path': self.get('ARTICLE', 'index_path', 'data/articles.db'),
+            'reconcile_interval': float(self.get('ARTICLE', 'index_reconcile_interval', '30')),
+            'duplicate_max_distance': self.get_int('ARTICLE', 'duplicate_max_distance', 3),
+            'duplicate_title_threshold': float(self.get('ARTICLE', 'duplicate_title_threshold', '0.5'))
+        }
+    
+    def get_article_storage_config(self) -> dict:
+        """
+        获取文章存储配置
+        
+        Returns:
+            dict: 存储布局（sharded 按日期分片 或 flat 平铺）及fsync策略（none、file、full）
+        """
+        return {
+            'layout': self.get('ARTICLE', 'storage_layout', 'sharded'),
+            'fsync': self.get('ARTICLE', 'fsync', 'file')
+        }
+    
+    def get_duplicate_policy(self) -> str:
+        """
+        获取近似重复文章的处理方式
+        
+        Returns:
+            str: warn（仅提示）或 block（拒绝生成和发布，请求中传入 force 时仍继续）
+        """
+        policy = self.get('ARTICLE', 'duplicate_policy', 'warn')
+        return policy if policy in ('warn', 'block') else 'warn'
+    
+    def get_hotnews_config(self) -> dict:
+        """
+        获取热点数据配置
+        
+        Returns:
+            dict: tophub页面快照有效秒数、热点结果新鲜期及最长可用期
+        """
+        return {
+            'tophub_ttl': self.get_int('HOTNEWS', 'tophub_ttl', 60),
+            'fresh_window': self.get_int('HOTNEWS', 'fresh_window', 300),
+            'max_stale': self.get_int('HOTNEWS', 'max_stale', 3600)
+        }
+    
+    def get_hotnews_history_config(self) -> dict:
+        """
+        获取热点历史存储配置
+        
+        Returns:
+            dict: 是否启用及数据库路径
+        """
+        return {
+            'enabled': self.get_bool('HOTNEWS', 'history_enabled', True),
+            'db_path': self.get('HOTNEWS', 'history_path', 'data/hotnews_history.db')
+        }
+    
+    def get_hotnews_prefetch_config(self) -> dict:
+        """
+        获取热点后台预取配置
+        
+        Returns:
+            dict: 是否启用、刷新间隔、随机抖动及各数据源的最小请求间隔
+        """
+        return {
+            'enabled': self.get_bool('HOTNEWS', 'prefetch_enabled', True),
+            'interval': self.get_int('HOTNEWS', 'prefetch_interval', 300),
+            'jitter': self.get_int('HOTNEWS', 'prefetch_jitter', 30),
+            'source_intervals': {
+                'zhiwei': float(self.get('HOTNEWS', 'zhiwei_min_interval', '1.0')),
+                'tophub': float(self.get('HOTNEWS', 'tophub_min_interval', '1.0'))
+            }
+        }
+    
     def get_max_log_files(self) -> int:
         """
         获取最大日志文件数
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+内联样式模块
+将内联style解析为CSS声明，按属性合并（后写入者覆盖先写入者）并以最紧凑的形式序列化，
+避免多次注入样式后style属性中堆积重复和被覆盖的声明
+"""
+
+import re
+from functools import lru_cache
+
+
+_IMPORTANT_RE = re.compile(r'\s*!\s*important\s*$', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 简写属性会整体重置的普通属性，简写出现在后面时，前面的这些属性可直接移除
+_SHORTHAND_LONGHANDS = {
+    'margin': ('margin-top', 'margin-right', 'margin-bottom', 'margin-left'),
+    'padding': ('padding-top', 'padding-right', 'padding-bottom', 'padding-left'),
+    'overflow': ('overflow-x', 'overflow-y'),
+    'background': ('background-color', 'background-image', 'background-repeat', 'background-position',
+                   'background-size', 'background-attachment', 'background-origin', 'background-clip'),
+    'border-top': ('border-top-width', 'border-top-style', 'border-top-color'),
+    'border-right': ('border-right-width', 'border-right-style', 'border-right-color'),
+    'border-bottom': ('border-bottom-width', 'border-bottom-style', 'border-bottom-color'),
+    'border-left': ('border-left-width', 'border-left-style', 'border-left-color'),
+    'border-width': ('border-top-width', 'border-right-width', 'border-bottom-width', 'border-left-width'),
+    'border-style': ('border-top-style', 'border-right-style', 'border-bottom-style', 'border-left-style'),
+    'border-color': ('border-top-color', 'border-right-color', 'border-bottom-color', 'border-left-color'),
+}
+_SHORTHAND_LONGHANDS['border'] = tuple(
+    prop for side in ('border-top', 'border-right', 'border-bottom', 'border-left')
+    for prop in (side,) + _SHORTHAND_LONGHANDS[side]
+) + ('border-width', 'border-style', 'border-color')
+
+
+def parse_style_declarations(style: str) -> tuple:
+    """
+    将内联样式解析为 (属性, 值) 元组序列
+    分号位于括号或引号内时不作为分隔符（如 url(...)、font-family 中的引号）
+
+    Args:
+        style: 内联样式字符串
+
+    Returns:
+        tuple: ((属性, 值), ...)，属性名统一为小写
+    """
+    declarations = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(style + ';'):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth = max(depth - 1, 0)
+        elif ch == ';' and depth == 0:
+            declaration = style[start:i].strip()
+            start = i + 1
+            if ':' in declaration:
+                prop, value = declaration.split(':', 1)
+                prop, value = prop.strip().lower(), value.strip()
+                if prop and value:
+                    declarations.append((prop, value))
+    return tuple(declarations)
+
+
+def _minify_value(value: str) -> str:
+    """
+    压缩属性值：引号外的连续空白合并为一个空格，逗号后的空格移除
+    """
+    parts = []
+    quote = None
+    start = 0
+    for i, ch in enumerate(value):
+        if quote:
+            if ch == quote:
+                parts.append(value[start:i + 1])
+                start = i + 1
+                quote = None
+        elif ch in '"\'':
+            parts.append(_WHITESPACE_RE.sub(' ', value[start:i]).replace(', ', ',').replace(' ,', ','))
+            start = i
+            quote = ch
+    tail = value[start:]
+    parts.append(tail if quote else _WHITESPACE_RE.sub(' ', tail).replace(', ', ',').replace(' ,', ','))
+    return ''.join(parts)
+
+
+def merge_declarations(*declaration_lists) -> list:
+    """
+    按顺序合并多组CSS声明
+    同一属性以后出现的为准（!important 声明不会被普通声明覆盖）并移到最后，
+    被后面的简写属性整体覆盖的普通属性会被移除
+
+    Args:
+        declaration_lists: 多组 (属性, 值) 序列
+
+    Returns:
+        list: 合并后的 (属性, 值, 是否important) 列表
+    """
+    merged = {}
+    for declarations in declaration_lists:
+        for prop, value in declarations:
+            important = bool(_IMPORTANT_RE.search(value))
+            if important:
+                value = _IMPORTANT_RE.sub('', value)
+
+            previous = merged.get(prop)
+            if previous is not None:
+                if previous[1] and not important:
+                    continue
+                del merged[prop]
+
+            if not important:
+                for longhand in _SHORTHAND_LONGHANDS.get(prop, ()):
+                    overridden = merged.get(longhand)
+                    if overridden is not None and not overridden[1]:
+                        del merged[longhand]
+
+            merged[prop] = (value, important)
+
+    return [(prop, value, important) for prop, (value, important) in merged.items()]
+
+
+@lru_cache(maxsize=2048)
+def merge_styles(*styles: str) -> str:
+    """
+    按顺序合并多个内联样式，并序列化为最紧凑的形式
+
+    Args:
+        styles: 内联样式字符串，靠后的优先
+
+    Returns:
+        str: 合并后的内联样式，如 "color:#333;margin:0 auto"
+    """
+    merged = merge_declarations(*(parse_style_declarations(style) for style in styles if style))
+    return ';'.join(
+        f"{prop}:{_minify_value(value)}{'!important' if important else ''}"
+        for prop, value, important in merged
+    )
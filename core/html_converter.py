@@ -5,29 +5,169 @@ HTML转换模块
 """
 
 import markdown
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+import hashlib
 import os
 import random
 from typing import Optional
 from core.logger import get_logger
-from core.template_manager import TemplateManager
+from core.tiered_cache import TieredCache
+from core.template_manager import TemplateManager, CompiledTemplate
 from core.code_processor import get_code_processor
+from core.css_style import merge_styles
+from core import lxml_renderer
 from tools.utils import decompress_html
 
 
+# 转换器版本号，渲染逻辑变化导致输出不同时需递增，使旧的渲染缓存失效
+CONVERTER_VERSION = 3
+
+
+# 解析后端：html.parser 与 lxml 通过BeautifulSoup操作，lxml.html 直接操作lxml树
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml.html')
+
+# 模板专属的DOM变换，(树类型, 模板名称) -> 按注册顺序执行的变换函数列表
+_TEMPLATE_TRANSFORMS = {}
+
+
+def register_template_transform(template_name: str, tree: str = 'soup'):
+    """
+    注册模板专属的DOM变换，变换函数在样式注入之后、序列化之前作用于同一棵树
+
+    Args:
+        template_name: 模板名称
+        tree: 变换作用的树类型，soup（BeautifulSoup后端）或 lxml（lxml.html后端）
+
+    Returns:
+        装饰器，被装饰函数接收BeautifulSoup对象或lxml根节点并原地修改
+    """
+    def decorator(func):
+        _TEMPLATE_TRANSFORMS.setdefault((tree, template_name), []).append(func)
+        return func
+    return decorator
+
+
+# 数字序列主题h2标签及其数字标记的样式
+H2_NUMBER_STYLE = "position: relative; padding-left: 45px;"
+H2_NUMBER_BADGE_STYLE = "position: absolute; left: 10px; top: 50%; transform: translateY(-50%); width: 30px; height: 30px; background: linear-gradient(45deg, #667eea, #764ba2); color: white; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: bold; font-size: 18px; box-shadow: 0 3px 10px rgba(0, 0, 0, 0.2);"
+
+
+@register_template_transform('numbered_sequence')
+def _add_h2_numbers(soup: BeautifulSoup):
+    """
+    为数字序列主题的h2标签添加数字标记
+    """
+    for i, h2 in enumerate(soup.find_all('h2'), 1):
+        h2['style'] = merge_styles(h2.get('style', ''), H2_NUMBER_STYLE)
+        
+        # 添加数字元素
+        number_span = soup.new_tag('span')
+        number_span.string = str(i)
+        number_span['style'] = merge_styles(H2_NUMBER_BADGE_STYLE)
+        h2.insert(0, number_span)
+
+
+@register_template_transform('numbered_sequence', tree='lxml')
+def _add_h2_numbers_lxml(root):
+    """
+    为数字序列主题的h2标签添加数字标记（lxml.html后端）
+    """
+    for i, h2 in enumerate(list(root.iter('h2')), 1):
+        lxml_renderer.append_style(h2, H2_NUMBER_STYLE)
+        lxml_renderer.prepend_child(h2, lxml_renderer.new_element('span', str(i), style=merge_styles(H2_NUMBER_BADGE_STYLE)))
+
+
+class RenderCache(TieredCache):
+    """
+    HTML渲染缓存
+    以 (内容哈希, 模板名称, 模板指纹, 转换器版本) 为键，内存层使用LRU淘汰，可选持久化到磁盘
+    """
+
+    name = 'HTML渲染缓存'
+    file_suffix = '.html'
+
+    def __init__(self, cache_dir: str = None, max_entries: int = 64, max_disk_entries: int = 0, enabled: bool = True):
+        """
+        初始化渲染缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录，为None时只使用内存
+            max_entries: 内存层最大条目数
+            max_disk_entries: 磁盘层最大文件数，0表示不限制
+            enabled: 是否启用缓存
+        """
+        super().__init__(cache_dir, max_entries=max_entries, max_disk_entries=max_disk_entries, enabled=enabled)
+
+    @staticmethod
+    def make_key(md_content: str, template_name: str, template_fingerprint: str) -> str:
+        """
+        生成缓存键，模板内容变化时指纹随之变化
+
+        Args:
+            md_content: Markdown内容
+            template_name: 模板名称
+            template_fingerprint: 模板定义的指纹
+
+        Returns:
+            str: 缓存键（SHA-256十六进制）
+        """
+        content_hash = hashlib.sha256(md_content.encode('utf-8')).hexdigest()
+        material = f"{content_hash}\n{template_name}\n{template_fingerprint}\n{CONVERTER_VERSION}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _create_render_cache() -> RenderCache:
+    """
+    根据配置创建渲染缓存，配置文件不存在时使用默认值
+    """
+    try:
+        from core.config import get_config
+        cache_config = get_config().get_html_cache_config()
+    except FileNotFoundError:
+        cache_config = {'enabled': True, 'max_entries': 64, 'persist': False, 'cache_dir': '', 'max_disk_entries': 0}
+
+    cache_dir = None
+    if cache_config['persist'] and cache_config['cache_dir']:
+        cache_dir = cache_config['cache_dir']
+        if not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), cache_dir)
+
+    return RenderCache(cache_dir, max_entries=cache_config['max_entries'],
+                       max_disk_entries=cache_config['max_disk_entries'], enabled=cache_config['enabled'])
+
+
+def _get_configured_parser() -> str:
+    """
+    读取配置的解析后端，配置文件不存在时使用html.parser
+    """
+    try:
+        from core.config import get_config
+        return get_config().get_html_parser()
+    except FileNotFoundError:
+        return 'html.parser'
+
+
 class HTMLConverter:
     """
     HTML转换器
     """
     
-    def __init__(self):
+    def __init__(self, parser: str = None):
         """
         初始化HTML转换器
+        
+        Args:
+            parser: 解析后端，为None时读取配置
         """
         self.logger = get_logger()
         self.template_manager = TemplateManager()
         self.code_processor = get_code_processor()
-        self.style_templates = self.template_manager.get_style_templates()
+        self.render_cache = _create_render_cache()
+        
+        self.parser = parser or _get_configured_parser()
+        if self.parser not in PARSER_BACKENDS:
+            self.logger.warning(f"不支持的HTML解析后端: {self.parser}，使用html.parser")
+            self.parser = 'html.parser'
     
 
     
@@ -45,14 +185,21 @@ class HTMLConverter:
         """
         try:
             # 选择样式模板
-            if template_name and template_name in self.style_templates:
-                selected_template = self.style_templates[template_name]
+            templates = self.template_manager.get_templates()
+            if template_name and template_name in templates:
+                selected_template = templates[template_name]
             else:
                 # 随机选择一个模板
-                template_name = random.choice(list(self.style_templates.keys()))
-                selected_template = self.style_templates[template_name]
+                template_name = random.choice(list(templates.keys()))
+                selected_template = templates[template_name]
             
-            self.logger.info(f"开始转换Markdown到HTML，使用样式模板: {selected_template['name']}")
+            cache_key = self.render_cache.make_key(md_content, template_name, selected_template.fingerprint)
+            cached_html = self.render_cache.get(cache_key)
+            if cached_html is not None:
+                self.logger.info(f"命中HTML渲染缓存，使用模板: {selected_template.name}")
+                return cached_html
+            
+            self.logger.info(f"开始转换Markdown到HTML，使用样式模板: {selected_template.name}")
             
             # 1. Markdown转为基础HTML
             html = markdown.markdown(
@@ -66,53 +213,104 @@ class HTMLConverter:
                 }
             )
             
-            # 2. 使用BeautifulSoup解析HTML并注入样式
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # 3. 特殊处理bash代码块
-            self.code_processor.process_code_blocks(soup)
-            
-            # 4. 应用选定模板的样式
-            self._apply_template_styles(soup, selected_template['styles'])
+            # 2-4. 解析HTML，处理代码块并注入模板样式
+            if self.parser == 'lxml.html':
+                body_html = self._render_with_lxml(html, selected_template, template_name)
+            else:
+                body_html = self._render_with_soup(html, selected_template, template_name)
             
             # 5. 构建完整的HTML文档
-            complete_html = self._build_complete_html_document(str(soup), selected_template, title, template_name)
+            complete_html = self._build_complete_html_document(body_html, selected_template, title)
             
             content = decompress_html(complete_html)
+            self.render_cache.set(cache_key, content)
 
-            self.logger.info(f"Markdown转HTML完成，使用模板: {selected_template['name']}")
+            self.logger.info(f"Markdown转HTML完成，使用模板: {selected_template.name}")
             return content
             
         except Exception as e:
             self.logger.error(f"Markdown转HTML失败: {e}")
             return None
     
-    def _apply_template_styles(self, soup: BeautifulSoup, style_map: dict):
+    def _render_with_soup(self, html: str, selected_template: CompiledTemplate, template_name: str) -> str:
+        """
+        使用BeautifulSoup（html.parser或lxml解析器）处理HTML片段
+        
+        Args:
+            html: Markdown转换得到的HTML片段
+            selected_template: 选定的样式模板
+            template_name: 模板名称
+        
+        Returns:
+            str: 处理后的HTML片段
+        """
+        soup = BeautifulSoup(html, self.parser)
+        
+        # 特殊处理bash代码块
+        self.code_processor.process_code_blocks(soup)
+        
+        # 应用选定模板的样式
+        self._apply_template_styles(soup, selected_template)
+        
+        # 执行模板专属的DOM变换
+        for transform in _TEMPLATE_TRANSFORMS.get(('soup', template_name), []):
+            transform(soup)
+        
+        # lxml解析器会补全html/body，只输出body内的内容
+        if self.parser == 'lxml' and soup.body is not None:
+            return soup.body.decode_contents()
+        return str(soup)
+    
+    def _render_with_lxml(self, html: str, selected_template: CompiledTemplate, template_name: str) -> str:
+        """
+        直接在lxml.html树上处理HTML片段，序列化格式与BeautifulSoup一致
+        
+        Args:
+            html: Markdown转换得到的HTML片段
+            selected_template: 选定的样式模板
+            template_name: 模板名称
+        
+        Returns:
+            str: 处理后的HTML片段
+        """
+        root = lxml_renderer.parse_fragment(html)
+        lxml_renderer.process_code_blocks(root, self.code_processor)
+        lxml_renderer.apply_template_styles(root, selected_template)
+        lxml_renderer.apply_code_styles(root)
+        
+        for transform in _TEMPLATE_TRANSFORMS.get(('lxml', template_name), []):
+            transform(root)
+        
+        return lxml_renderer.serialize_children(root)
+    
+    def _apply_template_styles(self, soup: BeautifulSoup, template: CompiledTemplate):
         """
         应用模板样式到HTML元素
+        单次遍历文档树，按标签名查表注入样式，并用上下文标记跳过统一代码块内部的标签
         
         Args:
             soup: BeautifulSoup对象
-            style_map: 样式映射表
+            template: 预编译的样式模板
         """
-        for tag_name, style in style_map.items():
-            for tag in soup.find_all(tag_name):
-                # 跳过代码块相关的标签，避免模板样式覆盖自定义样式
-                if self.code_processor.is_code_related_tag(tag):
-                    continue
-                    
+        style_map = template.styles
+        is_code_block = self.code_processor.is_unified_code_block
+        stack = [(child, False) for child in reversed(soup.contents) if isinstance(child, Tag)]
+        while stack:
+            tag, in_code = stack.pop()
+            in_code = in_code or is_code_block(tag)
+            
+            # 跳过代码块相关的标签，避免模板样式覆盖自定义样式
+            if tag.name in style_map and not in_code and 'code-header' not in tag.get('class', []):
                 # 保留原有的style属性，如果有的话
-                existing_style = tag.get('style', '')
-                if existing_style:
-                    tag['style'] = f"{existing_style}; {style}"
-                else:
-                    tag['style'] = style
+                tag['style'] = template.merge_style(tag.name, tag.get('style', ''))
+            
+            stack.extend((child, in_code) for child in reversed(tag.contents) if isinstance(child, Tag))
                     
         # 为所有代码块应用特殊样式
         self.code_processor.apply_code_styles(soup)
     
 
-    def _build_complete_html_document(self, html_content: str, selected_template: dict, title: str = "", template_name: str = None) -> str:
+    def _build_complete_html_document(self, html_content: str, selected_template: CompiledTemplate, title: str = "") -> str:
         """
         构建完整的HTML文档，参考t1.html的结构
         
@@ -120,34 +318,12 @@ class HTMLConverter:
             html_content: 转换后的HTML内容
             selected_template: 选定的样式模板
             title: 文档标题
-            template_name: 模板名称，用于决定是否添加特殊样式
         
         Returns:
             str: 完整的HTML文档
         """
         # 获取容器样式
-        container_style = selected_template['container']
-        
-        # 为数字序列主题添加特殊的数字标记样式
-        if template_name == 'numbered_sequence':
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 为h2标签添加数字序列的特殊样式
-            for i, h2 in enumerate(soup.find_all('h2'), 1):
-                existing_style = h2.get('style', '')
-                number_style = "position: relative; padding-left: 45px;"
-                if existing_style:
-                    h2['style'] = f"{existing_style}; {number_style}"
-                else:
-                    h2['style'] = number_style
-                    
-                # 添加数字元素
-                number_span = soup.new_tag('span')
-                number_span.string = str(i)
-                number_span['style'] = "position: absolute; left: 10px; top: 50%; transform: translateY(-50%); width: 30px; height: 30px; background: linear-gradient(45deg, #667eea, #764ba2); color: white; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: bold; font-size: 18px; box-shadow: 0 3px 10px rgba(0, 0, 0, 0.2);"
-                h2.insert(0, number_span)
-            
-            html_content = str(soup)
+        container_style = selected_template.inline_container
         
         # 构建完整的HTML文档结构，参考t1.html的格式
         complete_html = f"""<!DOCTYPE html>
@@ -196,11 +372,11 @@ class HTMLConverter:
             str: 摘要文本
         """
         try:
-            # 解析HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 提取纯文本
-            text = soup.get_text()
+            # 解析HTML并提取纯文本
+            if self.parser == 'lxml.html':
+                text = lxml_renderer.extract_text(html_content)
+            else:
+                text = BeautifulSoup(html_content, self.parser).get_text()
             
             # 清理文本
             text = ' '.join(text.split())
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP传输模块
+为所有对外请求提供按主机复用的连接池（keep-alive）、重试策略和超时设置
+"""
+
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.logger import get_logger
+
+
+class HttpClient:
+    """
+    共享HTTP客户端
+    每个主机使用独立的requests.Session，连接在请求之间保持复用
+    """
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 2, backoff_factor: float = 0.5,
+                 default_timeout: float = 60, host_timeouts: Optional[Dict[str, float]] = None):
+        """
+        初始化HTTP客户端
+
+        Args:
+            pool_size: 每个主机的连接池大小
+            max_retries: 连接失败及5xx响应的重试次数（仅对幂等请求重试）
+            backoff_factor: 重试退避系数
+            default_timeout: 默认超时秒数
+            host_timeouts: 按主机名配置的超时秒数
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.default_timeout = default_timeout
+        self.host_timeouts = dict(host_timeouts or {})
+        self.logger = get_logger()
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """
+        创建带连接池和重试策略的Session
+        """
+        retry = Retry(
+                total=self.max_retries,
+                connect=self.max_retries,
+                read=0,
+                backoff_factor=self.backoff_factor,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        获取URL所属主机的Session
+
+        Args:
+            url: 请求地址
+
+        Returns:
+            requests.Session: 该主机的Session
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[key] = session
+                    self.logger.debug(f"创建HTTP连接池: {parts.scheme}://{parts.netloc}")
+        return session
+
+    def get_timeout(self, url: str) -> float:
+        """
+        获取URL所属主机的超时设置
+
+        Args:
+            url: 请求地址
+
+        Returns:
+            float: 超时秒数
+        """
+        host = urlsplit(url).hostname or ''
+        return self.host_timeouts.get(host, self.default_timeout)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        发送HTTP请求，未指定timeout时使用主机对应的超时设置
+
+        Args:
+            method: 请求方法
+            url: 请求地址
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        kwargs.setdefault('timeout', self.get_timeout(url))
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """发送GET请求"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """发送POST请求"""
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """
+        关闭所有Session
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# 全局HTTP客户端实例
+_global_http_client = None
+_global_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    获取全局HTTP客户端实例
+
+    Returns:
+        HttpClient: HTTP客户端实例
+    """
+    global _global_http_client
+    if _global_http_client is None:
+        with _global_http_client_lock:
+            if _global_http_client is None:
+                try:
+                    from core.config import get_config
+                    http_config = get_config().get_http_config()
+                except FileNotFoundError:
+                    http_config = {}
+                _global_http_client = HttpClient(**http_config)
+    return _global_http_client
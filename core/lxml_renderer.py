@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+lxml渲染后端
+直接在lxml.html树上完成代码块处理和样式注入，并按BeautifulSoup的minimal格式序列化，
+使输出与BeautifulSoup后端保持一致
+"""
+
+from typing import Optional
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from core.css_style import merge_styles
+from core.code_processor import (
+    CODE_CONTAINER_STYLE, CODE_STYLE, CODE_LINE_STYLE, LINE_NUMBER_STYLE,
+    CODE_HEADER_STYLE, COMMENT_CONTENT_STYLE, LINE_CONTENT_STYLE
+)
+
+
+# BeautifulSoup视为空元素的标签，没有子节点时序列化为 <tag/>
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img',
+    'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr'
+])
+
+# 内容原样输出、不做实体转义的标签
+RAW_TEXT_TAGS = frozenset(['script', 'style'])
+
+# 保留空白的标签，其余位置的纯空白文本与BeautifulSoup一样折叠为单个换行或空格
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+_ASCII_SPACES = frozenset('\x20\x0a\x09\x0c\x0d')
+
+# BeautifulSoup按空白拆分、以单个空格重新拼接的多值属性
+_MULTI_VALUED_ATTRIBUTES = {
+    '*': frozenset(['accesskey', 'class', 'dropzone']),
+    'a': frozenset(['rel', 'rev']),
+    'link': frozenset(['rel', 'rev']),
+    'td': frozenset(['headers']),
+    'th': frozenset(['headers']),
+    'form': frozenset(['accept-charset']),
+    'object': frozenset(['archive']),
+    'area': frozenset(['rel']),
+    'icon': frozenset(['sizes']),
+    'iframe': frozenset(['sandbox']),
+    'output': frozenset(['for'])
+}
+
+
+def _collapse_blank(text: Optional[str]) -> Optional[str]:
+    if text and all(ch in _ASCII_SPACES for ch in text):
+        return '\n' if '\n' in text else ' '
+    return text
+
+
+def parse_fragment(html: str) -> etree._Element:
+    """
+    解析HTML片段，返回包裹全部内容的div根节点
+    纯空白文本按BeautifulSoup的规则折叠，保证序列化结果一致
+    """
+    root = lxml_html.fragment_fromstring(html, create_parent='div')
+    root.text = _collapse_blank(root.text)
+
+    # 栈中元素为 (节点, 父节点是否保留空白)
+    stack = [(child, False) for child in root]
+    while stack:
+        element, parent_preserve = stack.pop()
+        if not parent_preserve:
+            element.tail = _collapse_blank(element.tail)
+        if not isinstance(element.tag, str):
+            continue
+        preserve = parent_preserve or element.tag in PRESERVE_WHITESPACE_TAGS
+        if not preserve:
+            element.text = _collapse_blank(element.text)
+        stack.extend((child, preserve) for child in element)
+    return root
+
+
+def get_classes(element: etree._Element) -> list:
+    """
+    获取元素的class列表
+    """
+    return element.get('class', '').split()
+
+
+def append_style(element: etree._Element, style: str):
+    """
+    将样式按属性合并到元素原有style之后
+    """
+    element.set('style', merge_styles(element.get('style', ''), style))
+
+
+def prepend_child(parent: etree._Element, child: etree._Element):
+    """
+    将子元素插入为第一个子节点（位于父元素原有文本之前）
+    """
+    child.tail = parent.text
+    parent.text = None
+    parent.insert(0, child)
+
+
+def new_element(tag: str, text: Optional[str] = None, **attrs) -> etree._Element:
+    """
+    创建新元素
+    """
+    element = etree.Element(tag)
+    for name, value in attrs.items():
+        element.set(name, value)
+    element.text = text
+    return element
+
+
+def _find_with_class(element: etree._Element, tag: str, class_name: str) -> Optional[etree._Element]:
+    """
+    查找第一个带指定class的后代元素
+    """
+    for descendant in element.iterdescendants(tag):
+        if class_name in get_classes(descendant):
+            return descendant
+    return None
+
+
+def _is_unified_code_block(element: etree._Element) -> bool:
+    return element.tag == 'pre' and 'unified-code-block' in get_classes(element)
+
+
+def process_code_blocks(root: etree._Element, code_processor):
+    """
+    为所有代码块添加语言标识和统一的CSS类，对应 CodeProcessor.process_code_blocks
+    """
+    for pre in list(root.iter('pre')):
+        code = next(pre.iterdescendants('code'), None)
+        if code is None:
+            continue
+        language = code_processor.detect_language(get_classes(code))
+        pre.set('data-language', language)
+        code.set('data-language', language)
+        pre.set('class', ' '.join(get_classes(pre) + ['unified-code-block']))
+
+
+def apply_template_styles(root: etree._Element, template):
+    """
+    单次遍历注入模板样式，跳过统一代码块内部和代码标题栏，对应 HTMLConverter._apply_template_styles
+    """
+    style_map = template.styles
+    stack = [(child, False) for child in reversed(root) if isinstance(child.tag, str)]
+    while stack:
+        element, in_code = stack.pop()
+        in_code = in_code or _is_unified_code_block(element)
+
+        if element.tag in style_map and not in_code and 'code-header' not in get_classes(element):
+            element.set('style', template.merge_style(element.tag, element.get('style', '')))
+
+        stack.extend((child, in_code) for child in reversed(element) if isinstance(child.tag, str))
+
+
+def apply_code_styles(root: etree._Element):
+    """
+    为所有统一代码块应用特殊样式并添加标题栏，对应 CodeProcessor.apply_code_styles
+    """
+    for pre in [pre for pre in root.iter('pre') if 'unified-code-block' in get_classes(pre)]:
+        append_style(pre, CODE_CONTAINER_STYLE)
+
+        header = new_element('div', **{'class': 'code-header', 'style': merge_styles(CODE_HEADER_STYLE)})
+        header.append(new_element('span', "🔴 code"))
+        prepend_child(pre, header)
+
+        code = next(pre.iterdescendants('code'), None)
+        if code is not None:
+            append_style(code, CODE_STYLE)
+
+        for line_div in pre.iterdescendants('div'):
+            if 'code-line' not in get_classes(line_div):
+                continue
+            line_div.set('style', merge_styles(CODE_LINE_STYLE))
+
+            line_number = _find_with_class(line_div, 'span', 'line-number')
+            if line_number is not None:
+                line_number.set('style', merge_styles(LINE_NUMBER_STYLE))
+
+            line_content = _find_with_class(line_div, 'span', 'line-content')
+            if line_content is not None:
+                if 'comment' in get_classes(line_content):
+                    line_content.set('style', merge_styles(COMMENT_CONTENT_STYLE))
+                else:
+                    line_content.set('style', merge_styles(LINE_CONTENT_STYLE))
+
+
+def _escape_text(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _quote_attribute(value: str) -> str:
+    """
+    与BeautifulSoup一致的属性值引用规则：优先双引号，值中含双引号时改用单引号
+    """
+    value = _escape_text(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', '&quot;') + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+def _start_tag(element: etree._Element) -> str:
+    """
+    生成开始标签（不含结尾的 > 或 />），属性与BeautifulSoup一样按名称排序
+    """
+    tag = element.tag
+    multi_valued = _MULTI_VALUED_ATTRIBUTES.get(tag)
+    parts = [tag]
+    for name, value in sorted(element.items()):
+        if name in _MULTI_VALUED_ATTRIBUTES['*'] or (multi_valued and name in multi_valued):
+            value = ' '.join(value.split())
+        parts.append(f"{name}={_quote_attribute(value)}")
+    return '<' + ' '.join(parts)
+
+
+def serialize_children(root: etree._Element) -> str:
+    """
+    按BeautifulSoup的minimal格式序列化根节点的全部内容（不含根节点自身）
+    """
+    out = []
+    if root.text:
+        out.append(_escape_text(root.text))
+
+    # 栈中元素为 (节点, 是否为结束标记)
+    stack = [(child, False) for child in reversed(root)]
+    while stack:
+        element, closing = stack.pop()
+        tag = element.tag
+
+        if closing:
+            out.append(f"</{tag}>")
+        elif tag is etree.Comment:
+            out.append(f"<!--{element.text or ''}-->")
+        elif tag is etree.ProcessingInstruction:
+            out.append(f"<?{element.target} {element.text or ''}>")
+        elif tag in VOID_ELEMENTS and not element.text and len(element) == 0:
+            out.append(_start_tag(element) + '/>')
+        else:
+            out.append(_start_tag(element) + '>')
+            if element.text:
+                out.append(element.text if tag in RAW_TEXT_TAGS else _escape_text(element.text))
+            stack.append((element, True))
+            stack.extend((child, False) for child in reversed(element))
+            continue
+
+        if element.tail:
+            out.append(_escape_text(element.tail))
+
+    return ''.join(out)
+
+
+def extract_text(html: str) -> str:
+    """
+    提取HTML中的可见文本（不含script和style内容）
+    """
+    if not html or not html.strip():
+        return ''
+    root = lxml_html.fromstring(html)
+    etree.strip_elements(root, 'script', 'style', with_tail=False)
+    return root.text_content()
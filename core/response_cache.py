@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+AI响应缓存模块
+以 (模型, 提示词哈希, temperature) 为键缓存AI生成结果，包含内存LRU层和磁盘层
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Optional, Tuple
+
+from core.tiered_cache import TieredCache
+
+
+class ResponseCache(TieredCache):
+    """
+    AI响应缓存
+    内存层使用LRU淘汰，磁盘层按键哈希存储为JSON文件，两层均按TTL过期
+    """
+
+    name = 'AI响应缓存'
+    file_suffix = '.json'
+
+    def __init__(self, cache_dir: str, max_entries: int = 256, ttl: int = 86400, max_disk_entries: int = 0,
+                 enabled: bool = True):
+        """
+        初始化响应缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录
+            max_entries: 内存层最大条目数
+            ttl: 缓存有效秒数
+            max_disk_entries: 磁盘层最大文件数，0表示不限制
+            enabled: 是否启用缓存
+        """
+        super().__init__(cache_dir, max_entries=max_entries, ttl=ttl, max_disk_entries=max_disk_entries,
+                         enabled=enabled)
+
+    @staticmethod
+    def make_key(model: str, prompt: Any, temperature: Optional[float] = None) -> str:
+        """
+        生成缓存键
+
+        Args:
+            model: 模型名称
+            prompt: 提示词（字符串或消息列表等可JSON序列化的对象）
+            temperature: 采样温度，None表示模型默认值
+
+        Returns:
+            str: 缓存键（SHA-256十六进制）
+        """
+        prompt_text = prompt if isinstance(prompt, str) else json.dumps(prompt, ensure_ascii=False, sort_keys=True)
+        prompt_hash = hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()
+        material = f"{model}\n{prompt_hash}\n{'default' if temperature is None else temperature}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _encode(self, value: str, expires_at: Optional[float], model: str = '') -> str:
+        return json.dumps({'model': model, 'content': value, 'expires_at': expires_at}, ensure_ascii=False)
+
+    def _decode(self, text: str) -> Tuple[Optional[str], Optional[float]]:
+        data = json.loads(text)
+        return data.get('content'), data.get('expires_at', 0)
+
+    def set(self, key: str, content: str, model: str = ''):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            content: 缓存内容
+            model: 模型名称（仅用于记录）
+        """
+        super().set(key, content, model=model)
+
+
+# 全局响应缓存实例
+_global_response_cache = None
+_global_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    获取全局AI响应缓存实例
+
+    Returns:
+        ResponseCache: 响应缓存实例
+    """
+    global _global_response_cache
+    if _global_response_cache is None:
+        with _global_response_cache_lock:
+            if _global_response_cache is None:
+                from core.config import get_config
+                cache_config = get_config().get_response_cache_config()
+                cache_dir = cache_config['cache_dir']
+                if not os.path.isabs(cache_dir):
+                    cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), cache_dir)
+                _global_response_cache = ResponseCache(
+                        cache_dir,
+                        max_entries=cache_config['max_entries'],
+                        ttl=cache_config['ttl'],
+                        max_disk_entries=cache_config['max_disk_entries'],
+                        enabled=cache_config['enabled']
+                )
+    return _global_response_cache
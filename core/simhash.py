@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+SimHash指纹模块
+以文章词项（中文二字组、英文单词）按出现次数加权计算64位SimHash，
+近似重复的文章指纹之间的汉明距离很小；指纹拆分为4段16位分带，
+汉明距离不超过3的两个指纹至少有一段完全相同，按分带建索引即可查找候选而无需两两比较
+"""
+
+import hashlib
+from collections import Counter
+from typing import Iterable, List
+
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+# 字节取值 -> 第 bit 位是否为1 的转换表
+_BIT_TABLES = [bytes(value >> bit & 1 for value in range(256)) for bit in range(8)]
+
+
+def simhash_terms(terms: Iterable[str]) -> int:
+    """
+    由词项序列计算64位SimHash，词项按出现次数加权
+
+    每个词项取8字节哈希并按出现次数重复拼接，之后按字节位置切片，
+    用 bytes.translate 统计每一位为1的次数，避免对每个词项逐位循环
+
+    Args:
+        terms: 词项序列
+
+    Returns:
+        int: 无符号64位指纹，没有词项时返回0
+    """
+    features = Counter(terms)
+    if not features:
+        return 0
+
+    blake2b = hashlib.blake2b
+    digests = b''.join([blake2b(feature.encode('utf-8'), digest_size=8).digest() * weight
+                        for feature, weight in features.items()])
+    half = len(digests) / 16
+
+    fingerprint = 0
+    for position in range(8):
+        column = digests[position::8]
+        for bit, table in enumerate(_BIT_TABLES):
+            if column.translate(table).count(1) > half:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    计算两个指纹的汉明距离
+    """
+    return bin(a ^ b).count('1')
+
+
+def band_keys(fingerprint: int) -> List[int]:
+    """
+    将指纹拆分为分带键，键中包含分带序号，不同分带的相同取值不会冲突
+    """
+    return [(band << _BAND_BITS) | (fingerprint >> (band * _BAND_BITS) & _BAND_MASK)
+            for band in range(SIMHASH_BANDS)]
+
+
+def to_signed(fingerprint: int) -> int:
+    """
+    无符号64位指纹转换为SQLite可存储的有符号整数
+    """
+    return fingerprint - (1 << SIMHASH_BITS) if fingerprint >> (SIMHASH_BITS - 1) else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    """
+    SQLite中读取的有符号整数转换回无符号64位指纹
+    """
+    return value & ((1 << SIMHASH_BITS) - 1)
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+任务队列模块
+为文章生成任务提供按AI模型划分的有界工作线程池和FIFO等待队列
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.logger import get_logger
+
+
+class TaskQueueFullError(Exception):
+    """
+    任务队列已满异常
+    """
+
+    def __init__(self, model: str, max_size: int):
+        self.model = model
+        self.max_size = max_size
+        super().__init__(f"{model}任务队列已满（上限{max_size}），请稍后再试")
+
+
+class ModelWorkerPool:
+    """
+    单个AI模型的工作线程池
+    固定数量的工作线程从FIFO队列中依次取出任务执行
+    """
+
+    def __init__(self, model: str, max_workers: int, max_queue_size: int):
+        """
+        初始化工作线程池
+
+        Args:
+            model: AI模型名称
+            max_workers: 最大并发数
+            max_queue_size: 等待队列最大长度
+        """
+        self.model = model
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.logger = get_logger()
+
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._workers = []
+        self._started = False
+
+    def _ensure_workers(self):
+        """
+        首次提交任务时启动工作线程
+        """
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(
+                        target=self._worker_loop,
+                        name=f"{self.model}-worker-{i}"
+                )
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+            self._started = True
+
+    def _worker_loop(self):
+        """
+        工作线程主循环
+        """
+        while True:
+            func, enqueued_at = self._queue.get()
+            with self._lock:
+                self._running += 1
+            try:
+                func(time.time() - enqueued_at)
+            except Exception as e:
+                self.logger.error(f"{self.model}队列任务执行异常: {e}")
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    def submit(self, func: Callable[[float], None]) -> int:
+        """
+        提交任务到等待队列
+
+        Args:
+            func: 任务函数，参数为任务在队列中的等待秒数
+
+        Returns:
+            int: 提交后任务在队列中的位置（从1开始）
+
+        Raises:
+            TaskQueueFullError: 队列已满
+        """
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait((func, time.time()))
+        except queue.Full:
+            raise TaskQueueFullError(self.model, self.max_queue_size)
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取线程池运行状态
+
+        Returns:
+            dict: 包含并发上限、运行中任务数和排队任务数
+        """
+        with self._lock:
+            running = self._running
+        return {
+            'max_workers': self.max_workers,
+            'running': running,
+            'queued': self._queue.qsize(),
+            'max_queue_size': self.max_queue_size
+        }
+
+
+class TaskQueue:
+    """
+    文章生成任务队列
+    每个AI模型拥有独立的并发上限和等待队列
+    """
+
+    def __init__(self, max_workers: Dict[str, int], max_queue_size: int = 20):
+        """
+        初始化任务队列，只为配置中的AI模型创建工作线程池
+
+        Args:
+            max_workers: 各AI模型的最大并发数，如 {'qwen': 3, 'gemini': 2}
+            max_queue_size: 每个模型等待队列的最大长度
+        """
+        self.max_workers = dict(max_workers)
+        self.max_queue_size = max_queue_size
+        self._pools = {
+            model: ModelWorkerPool(model, workers, max_queue_size)
+            for model, workers in self.max_workers.items()
+        }
+
+    @property
+    def models(self) -> List[str]:
+        """
+        已配置的AI模型列表
+        """
+        return list(self._pools)
+
+    def _get_pool(self, model: str) -> ModelWorkerPool:
+        """
+        获取模型对应的工作线程池，不会为未配置的模型新建线程池
+
+        Raises:
+            ValueError: 未配置的AI模型
+        """
+        pool = self._pools.get(model)
+        if pool is None:
+            raise ValueError(f"不支持的AI模型: {model}")
+        return pool
+
+    def submit(self, model: str, func: Callable[[float], None]) -> int:
+        """
+        提交任务
+
+        Args:
+            model: AI模型名称
+            func: 任务函数，参数为排队等待秒数
+
+        Returns:
+            int: 任务在队列中的位置
+
+        Raises:
+            TaskQueueFullError: 对应模型的队列已满
+            ValueError: 未配置的AI模型
+        """
+        return self._get_pool(model).submit(func)
+
+    def get_stats(self, model: Optional[str] = None) -> dict:
+        """
+        获取队列状态
+
+        Args:
+            model: AI模型名称，为None时返回全部模型
+
+        Returns:
+            dict: 队列状态
+        """
+        if model is not None:
+            return self._get_pool(model).get_stats()
+        return {name: pool.get_stats() for name, pool in self._pools.items()}
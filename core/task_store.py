@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+任务状态存储模块
+提供内存（LRU + TTL）和SQLite（WAL模式）两种任务状态存储后端
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Optional
+
+from core.logger import get_logger
+
+
+# 已结束的任务状态，超过TTL后会被清理
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+class BaseTaskStore(ABC):
+    """
+    任务状态存储基类
+    提供与dict一致的读写接口，便于替换原有的task_status字典
+    """
+
+    def __init__(self, ttl: int = 3600, cleanup_interval: int = 60):
+        """
+        初始化任务状态存储
+
+        Args:
+            ttl: 已完成/失败任务的保留秒数
+            cleanup_interval: 过期清理的最小间隔秒数
+        """
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self.logger = get_logger()
+        self._last_cleanup = 0.0
+
+    @abstractmethod
+    def get(self, task_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        获取任务状态
+
+        Args:
+            task_id: 任务ID
+            default: 任务不存在或已过期时的返回值
+
+        Returns:
+            dict: 任务状态
+        """
+
+    @abstractmethod
+    def set(self, task_id: str, status: Dict[str, Any]):
+        """
+        写入任务状态，并按间隔触发过期清理
+
+        Args:
+            task_id: 任务ID
+            status: 任务状态，其中 status 字段用于判断任务是否已结束
+        """
+
+    @abstractmethod
+    def pop(self, task_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        删除并返回任务状态
+
+        Args:
+            task_id: 任务ID
+            default: 任务不存在时的返回值
+
+        Returns:
+            dict: 被删除的任务状态
+        """
+
+    @abstractmethod
+    def cleanup(self) -> int:
+        """
+        清理过期的已结束任务
+
+        Returns:
+            int: 清理的任务数
+        """
+
+    def _maybe_cleanup(self):
+        """
+        距上次清理超过间隔时执行一次清理
+        """
+        now = time.time()
+        if now - self._last_cleanup >= self.cleanup_interval:
+            self._last_cleanup = now
+            removed = self.cleanup()
+            if removed:
+                self.logger.info(f"已清理 {removed} 个过期任务状态")
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        status = self.get(task_id)
+        if status is None:
+            raise KeyError(task_id)
+        return status
+
+    def __setitem__(self, task_id: str, status: Dict[str, Any]):
+        self.set(task_id, status)
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+
+class MemoryTaskStore(BaseTaskStore):
+    """
+    内存任务状态存储
+    使用OrderedDict实现LRU淘汰，已结束任务超过TTL后过期；
+    超出条目上限时只淘汰已结束的任务，排队中和运行中的任务始终保留
+    """
+
+    def __init__(self, ttl: int = 3600, max_entries: int = 1000, cleanup_interval: int = 60):
+        """
+        初始化内存存储
+
+        Args:
+            ttl: 已完成/失败任务的保留秒数
+            max_entries: 最大保存任务数，超出时淘汰最久未更新的已结束任务
+            cleanup_interval: 过期清理的最小间隔秒数
+        """
+        super().__init__(ttl, cleanup_interval)
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # task_id -> (status, updated_at)
+        self._lock = threading.Lock()
+
+    def get(self, task_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.get(task_id)
+        if entry is None:
+            return default
+        status, updated_at = entry
+        if status.get('status') in TERMINAL_STATUSES and time.time() - updated_at > self.ttl:
+            return default
+        return status
+
+    def set(self, task_id: str, status: Dict[str, Any]):
+        with self._lock:
+            self._data[task_id] = (status, time.time())
+            self._data.move_to_end(task_id)
+            excess = len(self._data) - self.max_entries
+            if excess > 0:
+                finished = (
+                    key for key, (entry_status, _) in self._data.items()
+                    if entry_status.get('status') in TERMINAL_STATUSES and key != task_id
+                )
+                for key in list(islice(finished, excess)):
+                    del self._data[key]
+        self._maybe_cleanup()
+
+    def pop(self, task_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.pop(task_id, None)
+        return entry[0] if entry else default
+
+    def cleanup(self) -> int:
+        expire_before = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                task_id for task_id, (status, updated_at) in self._data.items()
+                if status.get('status') in TERMINAL_STATUSES and updated_at < expire_before
+            ]
+            for task_id in expired:
+                del self._data[task_id]
+        return len(expired)
+
+
+class SQLiteTaskStore(BaseTaskStore):
+    """
+    SQLite任务状态存储
+    使用WAL模式，服务重启后任务状态仍然可查询
+    """
+
+    def __init__(self, db_path: str, ttl: int = 3600, cleanup_interval: int = 60):
+        """
+        初始化SQLite存储
+
+        Args:
+            db_path: 数据库文件路径
+            ttl: 已完成/失败任务的保留秒数
+            cleanup_interval: 过期清理的最小间隔秒数
+        """
+        super().__init__(ttl, cleanup_interval)
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS task_status ('
+            'task_id TEXT PRIMARY KEY, '
+            'status TEXT NOT NULL, '
+            'data TEXT NOT NULL, '
+            'updated_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_task_status_updated ON task_status (status, updated_at)'
+        )
+        self._conn.commit()
+        self._interrupt_unfinished_tasks()
+
+    def _interrupt_unfinished_tasks(self):
+        """
+        将上次运行中未结束的任务标记为失败，因为其工作线程已随进程退出
+        """
+        placeholders = ','.join('?' * len(TERMINAL_STATUSES))
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT task_id, data FROM task_status WHERE status NOT IN ({placeholders})',
+                TERMINAL_STATUSES
+            ).fetchall()
+            for task_id, data in rows:
+                status = json.loads(data)
+                status.update({
+                    'status': 'failed',
+                    'message': '服务重启，任务已中断',
+                    'progress': 0
+                })
+                self._conn.execute(
+                    'UPDATE task_status SET status = ?, data = ?, updated_at = ? WHERE task_id = ?',
+                    ('failed', json.dumps(status, ensure_ascii=False), time.time(), task_id)
+                )
+            self._conn.commit()
+        if rows:
+            self.logger.warning(f"{len(rows)} 个未完成任务因服务重启被标记为失败")
+
+    def get(self, task_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, data, updated_at FROM task_status WHERE task_id = ?',
+                (task_id,)
+            ).fetchone()
+        if row is None:
+            return default
+        status, data, updated_at = row
+        if status in TERMINAL_STATUSES and time.time() - updated_at > self.ttl:
+            return default
+        return json.loads(data)
+
+    def set(self, task_id: str, status: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO task_status (task_id, status, data, updated_at) VALUES (?, ?, ?, ?)',
+                (task_id, status.get('status', ''), json.dumps(status, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+        self._maybe_cleanup()
+
+    def pop(self, task_id: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        status = self.get(task_id)
+        with self._lock:
+            self._conn.execute('DELETE FROM task_status WHERE task_id = ?', (task_id,))
+            self._conn.commit()
+        return status if status is not None else default
+
+    def cleanup(self) -> int:
+        placeholders = ','.join('?' * len(TERMINAL_STATUSES))
+        with self._lock:
+            cursor = self._conn.execute(
+                f'DELETE FROM task_status WHERE status IN ({placeholders}) AND updated_at < ?',
+                (*TERMINAL_STATUSES, time.time() - self.ttl)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+def create_task_store(config: dict) -> BaseTaskStore:
+    """
+    根据配置创建任务状态存储
+
+    Args:
+        config: 任务存储配置，包含backend、db_path、ttl、max_entries
+
+    Returns:
+        BaseTaskStore: 任务状态存储实例
+    """
+    if config.get('backend') == 'sqlite':
+        db_path = config['db_path']
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), db_path)
+        return SQLiteTaskStore(db_path, ttl=config['ttl'])
+    return MemoryTaskStore(ttl=config['ttl'], max_entries=config['max_entries'])
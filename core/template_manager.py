@@ -2,24 +2,244 @@
 """
 模板管理器
 负责管理所有HTML样式模板
+内置模板在启动时预编译为不可变结构；themes/ 目录下的JSON/YAML模板文件按mtime检测变化并热加载
 """
 
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from core.css_style import merge_styles
+from core.logger import get_logger
+
+
+# 表格对齐时Markdown为th/td生成的style，预先合并模板样式
+_TABLE_ALIGN_STYLES = ('text-align: left;', 'text-align: center;', 'text-align: right;')
+
+# 每个模板缓存的"已有样式 + 模板样式"合并结果上限
+_MAX_MERGED_STYLES = 256
+
+
+class CompiledTemplate:
+    """
+    预编译的样式模板
+    包含标签到样式的只读映射、合并去重后的内联样式，以及常见"已有样式 + 模板样式"的合并结果
+    """
+
+    def __init__(self, key: str, template: dict):
+        """
+        编译模板定义
+
+        Args:
+            key: 模板名称
+            template: 模板定义，包含 name、container、styles
+        """
+        styles = template.get('styles')
+        if not isinstance(styles, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in styles.items()):
+            raise ValueError(f"模板 {key} 的styles必须是 标签名 -> 样式字符串 的映射")
+
+        self.key = key
+        self.name = str(template.get('name') or key)
+        self.container = str(template.get('container') or '')
+        self.styles = MappingProxyType(dict(styles))
+        # 实际写入style属性的紧凑形式
+        self.inline_styles = MappingProxyType({tag: merge_styles(style) for tag, style in styles.items()})
+        self.inline_container = merge_styles(self.container)
+        self.fingerprint = hashlib.sha256(json.dumps(
+            {'name': self.name, 'container': self.container, 'styles': styles},
+            ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+        self._merged = {}
+        for tag in ('th', 'td'):
+            if tag in styles:
+                for align_style in _TABLE_ALIGN_STYLES:
+                    self._merged[(tag, align_style)] = merge_styles(align_style, styles[tag])
+
+    def merge_style(self, tag_name: str, existing_style: str) -> Optional[str]:
+        """
+        计算标签应用模板样式后的style属性
+
+        Args:
+            tag_name: 标签名
+            existing_style: 标签原有的style，没有时为空字符串
+
+        Returns:
+            Optional[str]: 按属性合并后的样式，模板未定义该标签时返回None
+        """
+        style = self.styles.get(tag_name)
+        if style is None or not existing_style:
+            return self.inline_styles.get(tag_name)
+        merged = self._merged.get((tag_name, existing_style))
+        if merged is None:
+            merged = merge_styles(existing_style, style)
+            if len(self._merged) < _MAX_MERGED_STYLES:
+                self._merged[(tag_name, existing_style)] = merged
+        return merged
+
+    def to_dict(self) -> dict:
+        """
+        转换为模板定义字典
+        """
+        return {'name': self.name, 'container': self.container, 'styles': dict(self.styles)}
+
+
 class TemplateManager:
     """
     模板管理器类
     负责提供和管理各种HTML样式模板
     """
     
-    def __init__(self):
+    def __init__(self, themes_dir: str = None, reload_interval: float = None):
         """
         初始化模板管理器
+        
+        Args:
+            themes_dir: 外部模板目录，为None时读取配置
+            reload_interval: 检查模板文件变化的最小间隔秒数，为None时读取配置
+        """
+        self.logger = get_logger()
+        
+        if themes_dir is None or reload_interval is None:
+            try:
+                from core.config import get_config
+                theme_config = get_config().get_theme_config()
+            except FileNotFoundError:
+                theme_config = {'themes_dir': 'themes', 'reload_interval': 2.0}
+            themes_dir = theme_config['themes_dir'] if themes_dir is None else themes_dir
+            reload_interval = theme_config['reload_interval'] if reload_interval is None else reload_interval
+        if themes_dir and not os.path.isabs(themes_dir):
+            themes_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), themes_dir)
+        self.themes_dir = themes_dir
+        self.reload_interval = reload_interval
+        
+        self._lock = threading.Lock()
+        self._builtin = {key: CompiledTemplate(key, template) for key, template in self._builtin_templates().items()}
+        self._themes_signature = None
+        self._last_check = 0.0
+        self._publish({})
+        self._check_themes(force=True)
+    
+    def _publish(self, external: Dict[str, CompiledTemplate]):
+        """
+        发布新的模板快照（内置模板 + 外部模板，外部模板可覆盖同名内置模板）
         """
-        pass
+        templates = dict(self._builtin)
+        templates.update(external)
+        # 模板映射和模板列表作为一个整体替换，读取方无需加锁
+        self._snapshot = (MappingProxyType(templates), tuple((key, template.name) for key, template in templates.items()))
+    
+    def _scan_themes(self) -> tuple:
+        """
+        扫描模板目录，返回 (文件路径, mtime, 大小) 元组作为变化签名
+        """
+        if not self.themes_dir or not os.path.isdir(self.themes_dir):
+            return ()
+        paths = []
+        for pattern in ('*.json', '*.yaml', '*.yml'):
+            paths.extend(glob.glob(os.path.join(self.themes_dir, pattern)))
+        signature = []
+        for path in sorted(paths):
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+        return tuple(signature)
+    
+    def _load_theme_file(self, path: str) -> dict:
+        """
+        读取模板文件
+        文件可以是单个模板（包含styles，模板名称取文件名），也可以是 模板名称 -> 模板定义 的映射
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                data = json.load(f)
+            else:
+                try:
+                    import yaml
+                except ImportError:
+                    raise ValueError("读取YAML模板需要安装PyYAML")
+                data = yaml.safe_load(f)
+        
+        if not isinstance(data, dict):
+            raise ValueError("模板文件内容必须是对象")
+        if 'styles' in data:
+            return {os.path.splitext(os.path.basename(path))[0]: data}
+        return data
+    
+    def _check_themes(self, force: bool = False):
+        """
+        检查外部模板文件是否变化，变化时重新编译并发布
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.reload_interval:
+            return
+        
+        with self._lock:
+            if not force and now - self._last_check < self.reload_interval:
+                return
+            self._last_check = now
+            
+            signature = self._scan_themes()
+            if signature == self._themes_signature:
+                return
+            self._themes_signature = signature
+            
+            external = {}
+            for path, _, _ in signature:
+                try:
+                    for key, template in self._load_theme_file(path).items():
+                        if not isinstance(template, dict):
+                            raise ValueError(f"模板 {key} 的定义必须是对象")
+                        external[key] = CompiledTemplate(key, template)
+                except Exception as e:
+                    self.logger.error(f"加载模板文件失败 {path}: {e}")
+            
+            self._publish(external)
+            if signature or not force:
+                self.logger.info(f"已加载外部模板 {len(external)} 个: {', '.join(external) or '无'}")
+    
+    def get_templates(self) -> Mapping[str, CompiledTemplate]:
+        """
+        获取当前全部预编译模板
+        
+        Returns:
+            Mapping[str, CompiledTemplate]: 模板名称 -> 预编译模板的只读映射
+        """
+        self._check_themes()
+        return self._snapshot[0]
+    
+    def get_template(self, template_name: str) -> Optional[CompiledTemplate]:
+        """
+        获取指定的预编译模板
+        
+        Args:
+            template_name: 模板名称
+        
+        Returns:
+            Optional[CompiledTemplate]: 预编译模板，不存在时返回None
+        """
+        return self.get_templates().get(template_name)
     
     def get_style_templates(self) -> dict:
         """
         获取多种样式模板
         
+        Returns:
+            dict: 包含多种样式模板的字典
+        """
+        return {key: template.to_dict() for key, template in self.get_templates().items()}
+    
+    @staticmethod
+    def _builtin_templates() -> dict:
+        """
+        内置样式模板定义
+        
         Returns:
             dict: 包含多种样式模板的字典
         """
@@ -220,13 +440,13 @@ class TemplateManager:
         Returns:
             list: 包含模板信息的列表，每个元素包含name和description字段
         """
-        templates = self.get_style_templates()
+        self._check_themes()
         return [
             {
                 'name': key,
-                'description': template['name']
+                'description': name
             }
-            for key, template in templates.items()
+            for key, name in self._snapshot[1]
         ]
     
     def get_template_preview(self, template_name: str) -> dict:
@@ -239,16 +459,15 @@ class TemplateManager:
         Returns:
             dict: 模板预览信息
         """
-        templates = self.get_style_templates()
-        if template_name in templates:
-            template = templates[template_name]
+        template = self.get_template(template_name)
+        if template is not None:
             return {
-                'name': template['name'],
-                'container_style': template['container'],
+                'name': template.name,
+                'container_style': template.container,
                 'sample_styles': {
-                    'h1': template['styles'].get('h1', ''),
-                    'h2': template['styles'].get('h2', ''),
-                    'p': template['styles'].get('p', '')
+                    'h1': template.styles.get('h1', ''),
+                    'h2': template.styles.get('h2', ''),
+                    'p': template.styles.get('p', '')
                 }
             }
-        return {}
\ No newline at end of file
+        return {}
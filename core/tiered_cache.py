@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+两级缓存模块
+内存层使用LRU淘汰，可选的磁盘层按键哈希分目录存储，写入通过临时文件原子替换；
+磁盘层按间隔清理过期文件，并在文件数超过上限时按最近访问时间淘汰
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from core.logger import get_logger
+from tools.utils import atomic_write_text
+
+
+# 写入中断遗留的临时文件超过该秒数后清理
+_STALE_TMP_SECONDS = 3600
+
+
+class TieredCache:
+    """
+    两级缓存基类
+    子类通过 file_suffix、_encode、_decode 定义磁盘文件格式，通过 name 定义日志中的缓存名称
+    """
+
+    name = '缓存'
+    file_suffix = '.cache'
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 256, ttl: int = 0,
+                 max_disk_entries: int = 0, enabled: bool = True, cleanup_interval: int = 300):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录，为None时只使用内存
+            max_entries: 内存层最大条目数
+            ttl: 缓存有效秒数，0表示不过期
+            max_disk_entries: 磁盘层最大文件数，0表示不限制
+            enabled: 是否启用缓存
+            cleanup_interval: 磁盘层清理的最小间隔秒数
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.enabled = enabled
+        self.cleanup_interval = cleanup_interval
+        self.logger = get_logger()
+
+        self._memory = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+        self._stats = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'disk_evictions': 0}
+
+    def _encode(self, value: str, expires_at: Optional[float], **meta) -> str:
+        """
+        将缓存值编码为磁盘文件内容
+        """
+        return value
+
+    def _decode(self, text: str) -> Tuple[Optional[str], Optional[float]]:
+        """
+        从磁盘文件内容解码出 (缓存值, 过期时间)
+        """
+        return text, None
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.file_suffix}")
+
+    def _remember(self, key: str, value: str, expires_at: Optional[float]):
+        """
+        写入内存层（调用方需持有锁）
+        """
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[str]: 缓存内容，未命中或已过期返回None
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._stats['hits'] += 1
+                    self._stats['memory_hits'] += 1
+                    return entry[0]
+                del self._memory[key]
+
+        value = expires_at = None
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    value, expires_at = self._decode(f.read())
+                if expires_at is not None and expires_at <= now:
+                    value = None
+                    os.remove(path)
+                elif value is not None:
+                    # 更新访问时间，磁盘层按此淘汰最久未使用的文件
+                    os.utime(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.warning(f"读取{self.name}失败: {e}")
+
+        with self._lock:
+            if value is None:
+                self._stats['misses'] += 1
+                return None
+            self._remember(key, value, expires_at)
+            self._stats['hits'] += 1
+            self._stats['disk_hits'] += 1
+        return value
+
+    def set(self, key: str, value: str, **meta):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存内容
+            meta: 写入磁盘文件的附加信息
+        """
+        if not self.enabled or not value:
+            return
+
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._stats['writes'] += 1
+
+        if self.cache_dir:
+            try:
+                atomic_write_text(self._disk_path(key), self._encode(value, expires_at, **meta))
+            except Exception as e:
+                self.logger.warning(f"写入{self.name}失败: {e}")
+            self._maybe_cleanup()
+
+    def _maybe_cleanup(self):
+        """
+        距上次清理超过间隔时清理一次磁盘层
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._last_cleanup < self.cleanup_interval:
+                return
+            self._last_cleanup = now
+        try:
+            removed = self.cleanup()
+        except Exception as e:
+            self.logger.warning(f"清理{self.name}失败: {e}")
+            return
+        if removed:
+            self.logger.info(f"已清理 {removed} 个{self.name}文件")
+
+    def cleanup(self) -> int:
+        """
+        清理磁盘层：删除过期文件和遗留的临时文件，文件数超过上限时删除最久未访问的文件
+        多个进程共享缓存目录时，文件可能已被其他进程删除
+
+        Returns:
+            int: 删除的缓存文件数
+        """
+        if not self.cache_dir:
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        try:
+            shards = [entry.path for entry in os.scandir(self.cache_dir) if entry.is_dir()]
+        except FileNotFoundError:
+            return 0
+
+        for shard in shards:
+            try:
+                with os.scandir(shard) as files:
+                    for entry in files:
+                        try:
+                            mtime = entry.stat().st_mtime
+                        except FileNotFoundError:
+                            continue
+                        if entry.name.endswith('.tmp'):
+                            if now - mtime > _STALE_TMP_SECONDS:
+                                self._remove_file(entry.path)
+                        elif entry.name.endswith(self.file_suffix):
+                            if self.ttl and now - mtime > self.ttl:
+                                removed += self._remove_file(entry.path)
+                            else:
+                                entries.append((mtime, entry.path))
+            except FileNotFoundError:
+                continue
+
+        if self.max_disk_entries and len(entries) > self.max_disk_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_disk_entries]:
+                removed += self._remove_file(path)
+
+        with self._lock:
+            self._stats['disk_evictions'] += removed
+        return removed
+
+    @staticmethod
+    def _remove_file(path: str) -> int:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        return 1
+
+    def get_stats(self) -> dict:
+        """
+        获取缓存命中统计
+
+        Returns:
+            dict: 命中/未命中次数、内存条目数及磁盘淘汰数
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['persist'] = bool(self.cache_dir)
+        return stats
@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from core.config import get_config
 from core.logger import get_logger
+from core.http_client import get_http_client
 
 
 class WeChatPublisher:
@@ -30,6 +31,7 @@ class WeChatPublisher:
         """
         self.config = get_config()
         self.logger = get_logger()
+        self.http_client = get_http_client()
         self.access_token_data = None
         
         # 获取微信配置
@@ -89,7 +91,7 @@ class WeChatPublisher:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http_client.get(url, params=params)
             response.raise_for_status()
             
             result = response.json()
@@ -220,7 +222,7 @@ class WeChatPublisher:
                 self.logger.error(f"未认证,上传零时封面素材: {url}")
                 
             files = {"media": (file_name, image_buffer, mime_type)}
-            response = requests.post(url, files=files, timeout=30)
+            response = self.http_client.post(url, files=files)
             response.raise_for_status()
             data = response.json()
 
@@ -309,11 +311,10 @@ class WeChatPublisher:
             # print(json_data)
             
             # 发送请求
-            response = requests.post(
+            response = self.http_client.post(
                 url, 
                 data=json_data,
-                headers={'Content-Type': 'application/json; charset=utf-8'},
-                timeout=30
+                headers={'Content-Type': 'application/json; charset=utf-8'}
             )
             response.raise_for_status()
             
@@ -365,7 +366,7 @@ class WeChatPublisher:
                 "no_content": 1  # 不返回content字段
             }
             
-            response = requests.post(url, json=data, timeout=30)
+            response = self.http_client.post(url, json=data)
             response.raise_for_status()
             
             result = response.json()
@@ -397,7 +398,7 @@ class WeChatPublisher:
             url = f"{self.BASE_URL}/draft/batchget?access_token={access_token}"
             data = {"offset": 0, "count": 1, "no_content": 1}
             
-            response = requests.post(url, json=data, timeout=30)
+            response = self.http_client.post(url, json=data)
             result = response.json()
             
             # 如果返回错误码61004，表示未认证
@@ -4,9 +4,18 @@ API路由模块
 包含热点话题、平台列表、系统状态等基础API路由
 """
 
+import time
+
 from flask import request
 from typing import Dict, Any
-from tools.hotnews import get_platform_news, PLATFORMS
+from tools.hotnews import get_platform_news_cached, get_platform_news_snapshot, get_all_platform_news, PLATFORMS
+from tools.hotnews_history import get_hotnews_history
+from tools.topic_cluster import cluster_platform_topics
+from core.response_cache import get_response_cache
+
+
+# 支持的平台名称
+PLATFORM_NAMES = {platform['name'] for platform in PLATFORMS}
 
 
 def register_api_routes(app, vx_app):
@@ -24,6 +33,26 @@ def register_api_routes(app, vx_app):
         return _get_hot_topics(vx_app)
 
     
+    @app.route('/api/hot-topics/all', methods=['GET'])
+    def get_all_hot_topics():
+        """并发获取所有平台的热点话题"""
+        return _get_all_hot_topics(vx_app)
+
+    @app.route('/api/hot-topics/clusters', methods=['GET'])
+    def get_hot_topic_clusters():
+        """跨平台合并相同话题"""
+        return _get_hot_topic_clusters(vx_app)
+
+    @app.route('/api/hot-topics/trend', methods=['GET'])
+    def get_hot_topic_trend():
+        """查询话题的排名走势"""
+        return _get_hot_topic_trend(vx_app)
+
+    @app.route('/api/tasks/<task_id>', methods=['GET'])
+    def task_detail(task_id):
+        """查询任务状态（用于WebSocket断开后的轮询）"""
+        return _get_task_status(vx_app, task_id)
+
     @app.route('/api/status', methods=['GET'])
     def system_status():
         """系统状态检查"""
@@ -46,8 +75,32 @@ def _get_hot_topics(vx_app) -> Dict[str, Any]:
         
         vx_app.logger.info(f"获取热点话题: 平台={platform}, 数量={count}")
         
-        # 获取热点新闻数据
-        news_data = get_platform_news(platform, count)
+        if vx_app.hotnews_scheduler:
+            # 后台预取已启用，直接读取内存快照
+            scheduler = vx_app.hotnews_scheduler
+            result = get_platform_news_snapshot(platform, count, scheduler.fresh_window)
+            if result is None:
+                if platform not in PLATFORM_NAMES:
+                    return {
+                        'success': False,
+                        'error': f'不支持的平台: {platform}',
+                        'data': []
+                    }, 400
+                if scheduler.last_refresh_failed(platform):
+                    return {
+                        'success': False,
+                        'error': f'无法获取{platform}的热点话题',
+                        'data': []
+                    }
+                return {
+                    'success': False,
+                    'error': f'{platform}的热点话题正在加载，请稍后重试',
+                    'data': []
+                }
+        else:
+            # 获取热点新闻数据（带缓存，过期数据会在后台刷新）
+            result = get_platform_news_cached(platform, count)
+        news_data = result['topics']
         
         if not news_data:
             return {
@@ -61,7 +114,10 @@ def _get_hot_topics(vx_app) -> Dict[str, Any]:
             'data': {
                 'platform': platform,
                 'topics': news_data,  # 返回完整的新闻数据，包含name, rank, lastCount, url
-                'count': len(news_data)
+                'count': len(news_data),
+                'source': result['source'],
+                'fetched_at': result['fetched_at'],
+                'stale': result['stale']
             }
         }
         
@@ -73,6 +129,191 @@ def _get_hot_topics(vx_app) -> Dict[str, Any]:
             'data': []
         }
 
+def _get_all_hot_topics(vx_app) -> Dict[str, Any]:
+    """
+    并发获取所有平台的热点话题
+    
+    Args:
+        vx_app: VXToolApp实例
+        
+    Returns:
+        dict: API响应，包含每个平台的耗时和数据来源
+    """
+    try:
+        count = int(request.args.get('count', 30))
+        deadline = float(request.args.get('deadline', 15))
+        
+        vx_app.logger.info(f"并发获取全部平台热点话题: 数量={count}, 时限={deadline}s")
+        
+        if vx_app.hotnews_scheduler:
+            # 后台预取已启用，直接读取内存快照
+            result = _get_all_platform_snapshots(vx_app.hotnews_scheduler, count)
+        else:
+            result = get_all_platform_news(count, deadline)
+        
+        return {
+            'success': True,
+            'data': {
+                'platforms': result['platforms'],
+                'pending': result['pending'],
+                'elapsed': result['elapsed'],
+                'count': len(result['platforms'])
+            }
+        }
+        
+    except Exception as e:
+        vx_app.logger.error(f"获取全部平台热点话题失败: {e}")
+        return {
+            'success': False,
+            'error': f'获取全部平台热点话题失败: {str(e)}',
+            'data': []
+        }
+
+
+def _get_hot_topic_clusters(vx_app) -> Dict[str, Any]:
+    """
+    跨平台合并相同话题，按综合热度排序
+    
+    Args:
+        vx_app: VXToolApp实例
+        
+    Returns:
+        dict: API响应
+    """
+    try:
+        count = int(request.args.get('count', 30))
+        threshold = float(request.args.get('threshold', 0.5))
+        
+        if vx_app.hotnews_scheduler:
+            result = _get_all_platform_snapshots(vx_app.hotnews_scheduler, count)
+        else:
+            result = get_all_platform_news(count, float(request.args.get('deadline', 15)))
+        
+        platform_topics = {item['platform']: item['topics'] for item in result['platforms']}
+        clusters = cluster_platform_topics(platform_topics, threshold)
+        
+        return {
+            'success': True,
+            'data': {
+                'clusters': clusters,
+                'pending': result['pending'],
+                'count': len(clusters)
+            }
+        }
+        
+    except Exception as e:
+        vx_app.logger.error(f"热点话题聚类失败: {e}")
+        return {
+            'success': False,
+            'error': f'热点话题聚类失败: {str(e)}',
+            'data': []
+        }
+
+
+def _get_hot_topic_trend(vx_app) -> Dict[str, Any]:
+    """
+    查询话题的排名走势和变化速度
+    
+    Args:
+        vx_app: VXToolApp实例
+        
+    Returns:
+        dict: API响应
+    """
+    try:
+        name = request.args.get('name', '').strip()
+        if not name:
+            return {
+                'success': False,
+                'error': '缺少必要参数: name'
+            }
+        hours = float(request.args.get('hours', 24))
+        platform = request.args.get('platform') or None
+        
+        history = get_hotnews_history()
+        if history is None:
+            return {
+                'success': False,
+                'error': '热点历史记录未启用'
+            }
+        
+        return {
+            'success': True,
+            'data': history.get_trajectory(name, hours, platform)
+        }
+        
+    except Exception as e:
+        vx_app.logger.error(f"查询话题走势失败: {e}")
+        return {
+            'success': False,
+            'error': f'查询话题走势失败: {str(e)}'
+        }
+
+
+def _get_all_platform_snapshots(scheduler, count: int) -> Dict[str, Any]:
+    """
+    从内存快照读取所有平台的热点话题
+    
+    Args:
+        scheduler: 热点预取调度器，提供快照的新鲜期
+        count: 每个平台返回的话题数量
+        
+    Returns:
+        dict: 与 get_all_platform_news 相同格式的结果，latency 为后台预取该快照时的请求耗时，elapsed 为读取快照的耗时
+    """
+    start = time.time()
+    platforms = []
+    pending = []
+    for platform_info in PLATFORMS:
+        snapshot = get_platform_news_snapshot(platform_info['name'], count, scheduler.fresh_window)
+        if snapshot is None:
+            pending.append(platform_info['name'])
+            continue
+        platforms.append({
+            'platform': platform_info['name'],
+            'source': snapshot['source'],
+            'latency': snapshot['latency'],
+            'count': len(snapshot['topics']),
+            'topics': snapshot['topics'],
+            'fetched_at': snapshot['fetched_at'],
+            'stale': snapshot['stale']
+        })
+    
+    return {'platforms': platforms, 'pending': pending, 'elapsed': round(time.time() - start, 3)}
+
+
+def _get_task_status(vx_app, task_id: str):
+    """
+    查询任务状态
+    
+    Args:
+        vx_app: VXToolApp实例
+        task_id: 任务ID
+        
+    Returns:
+        dict: API响应
+    """
+    try:
+        task = vx_app.task_status.get(task_id)
+        if task is None:
+            return {
+                'success': False,
+                'error': '任务不存在或已过期'
+            }, 404
+        
+        return {
+            'success': True,
+            'data': dict(task, task_id=task_id)
+        }
+        
+    except Exception as e:
+        vx_app.logger.error(f"查询任务状态失败: {e}")
+        return {
+            'success': False,
+            'error': f'查询任务状态失败: {str(e)}'
+        }
+
+
 def _system_status(vx_app) -> Dict[str, Any]:
     """
     系统状态检查
@@ -94,6 +335,9 @@ def _system_status(vx_app) -> Dict[str, Any]:
             'wechat_verified': vx_app.wechat_publisher.is_verified()
         }
         
+        # 任务队列状态
+        queue_stats = vx_app.task_queue.get_stats()
+        
         # 判断整体状态
         if ai_status and status['wechat_api']:
             overall = 'healthy'
@@ -110,7 +354,12 @@ def _system_status(vx_app) -> Dict[str, Any]:
             'data': {
                 'status': status,
                 'overall': overall,
-                'message': message
+                'message': message,
+                'task_queue': queue_stats,
+                'response_cache': get_response_cache().get_stats(),
+                'html_cache': vx_app.html_converter.render_cache.get_stats(),
+                'batch_convert': vx_app.batch_converter.get_stats(),
+                'hotnews_scheduler': vx_app.hotnews_scheduler.get_stats() if vx_app.hotnews_scheduler else None
             }
         }
         
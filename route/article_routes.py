@@ -6,11 +6,12 @@
 
 from flask import request, send_file, abort
 from typing import Dict, Any
-import os
-import glob
-from datetime import datetime
+import threading
+import uuid
 import re
 
+from core.task_queue import TaskQueueFullError
+
 
 def register_article_routes(app, vx_app):
     """
@@ -31,6 +32,11 @@ def register_article_routes(app, vx_app):
         """获取文章列表"""
         return _get_articles_list(vx_app)
 
+    @app.route('/api/articles/search', methods=['GET'])
+    def articles_search():
+        """全文检索文章"""
+        return _search_articles(vx_app)
+
     @app.route('/api/articles/<filename>', methods=['GET'])
     def article_detail(filename):
         """获取文章内容"""
@@ -46,6 +52,11 @@ def register_article_routes(app, vx_app):
         """批量删除文章"""
         return _batch_delete_articles(vx_app)
 
+    @app.route('/api/convert-html/batch', methods=['POST'])
+    def batch_convert_html():
+        """批量将Markdown转换为HTML"""
+        return _batch_convert_to_html(vx_app)
+
     @app.route('/api/convert-html/<filename>', methods=['POST'])
     def convert_html(filename):
         """将Markdown转换为HTML"""
@@ -83,20 +94,49 @@ def _generate_article(vx_app) -> Dict[str, Any]:
         title = data['title']
         use_catchy_title = data.get('use_catchy_title', True)
         ai_model = data.get('ai_model', 'qwen')  # 默认使用qwen
+        bypass_cache = data.get('bypass_cache', False)  # 跳过AI响应缓存，强制重新生成
+
+        if ai_model not in vx_app.task_queue.models:
+            return {
+                'success': False,
+                'error': f"不支持的AI模型: {ai_model}，可选: {', '.join(vx_app.task_queue.models)}"
+            }, 400
+
+        # 检查是否已有标题相近的文章
+        duplicates = vx_app.article_index.find_similar_titles(title)
+        if duplicates:
+            vx_app.logger.warning(f"已有标题相近的文章: {title} -> {duplicates[0]['name']}")
+            if vx_app.config.get_duplicate_policy() == 'block' and not data.get('force', False):
+                return {
+                    'success': False,
+                    'error': f"已有标题相近的文章《{duplicates[0]['title']}》，如需继续生成请传入 force",
+                    'data': {'duplicates': duplicates}
+                }, 409
 
         vx_app.logger.info(f"开始异步生成文章: {title}, 使用AI模型: {ai_model}")
 
         # 启动异步任务
-        task_id = vx_app.start_article_generation(title, use_catchy_title, ai_model)
+        task_id = vx_app.start_article_generation(title, use_catchy_title, ai_model, bypass_cache)
+        task = vx_app.task_status.get(task_id) or {}
 
         return {
             'success': True,
             'data': {
                 'task_id': task_id,
+                'queue_position': task.get('queue_position', 0),
+                'queue_depth': task.get('queue_depth', 0),
+                'duplicates': duplicates,
                 'message': '文章生成任务已启动，请通过WebSocket监听进度'
             }
         }
 
+    except TaskQueueFullError as e:
+        vx_app.logger.warning(f"文章生成任务被拒绝: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }, 429
+
     except Exception as e:
         vx_app.logger.error(f"启动文章生成任务失败: {e}")
         return {
@@ -108,6 +148,7 @@ def _generate_article(vx_app) -> Dict[str, Any]:
 def _get_articles_list(vx_app) -> Dict[str, Any]:
     """
     获取文章列表
+    从文章索引分页查询，支持参数 offset、limit、q（标题关键词）、model、sort、order
     
     Args:
         vx_app: VXToolApp实例
@@ -116,32 +157,27 @@ def _get_articles_list(vx_app) -> Dict[str, Any]:
         dict: API响应
     """
     try:
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        if not os.path.exists(articles_dir):
-            os.makedirs(articles_dir)
-
-        md_files = glob.glob(os.path.join(articles_dir, '*.md'))
-        files = []
-
-        for file_path in md_files:
-            filename = os.path.basename(file_path)
-            stat = os.stat(file_path)
-            modified = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-
-            files.append({
-                'name': filename,
-                'modified': modified,
-                'size': stat.st_size
-            })
-
-        # 按修改时间倒序排列
-        files.sort(key=lambda x: x['modified'], reverse=True)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = request.args.get('limit', type=int)
+        if limit is not None:
+            limit = min(max(limit, 1), 1000)
+
+        files, total = vx_app.article_index.query(
+            offset=offset,
+            limit=limit,
+            q=request.args.get('q', '').strip() or None,
+            model=request.args.get('model') or None,
+            sort=request.args.get('sort', 'modified'),
+            order=request.args.get('order', 'desc')
+        )
 
         return {
             'success': True,
             'data': {
                 'files': files,
-                'total': len(files)
+                'total': total,
+                'offset': offset,
+                'limit': limit
             }
         }
 
@@ -153,6 +189,48 @@ def _get_articles_list(vx_app) -> Dict[str, Any]:
         }
 
 
+def _search_articles(vx_app) -> Dict[str, Any]:
+    """
+    全文检索文章标题和正文，按相关度排序并返回命中位置附近的摘要
+    支持参数 q（关键词，空格分隔的多个关键词需同时命中）、offset、limit
+    
+    Args:
+        vx_app: VXToolApp实例
+        
+    Returns:
+        dict: API响应
+    """
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return {
+                'success': False,
+                'error': '缺少必要参数: q'
+            }
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+        files, total = vx_app.article_index.search(q, offset, limit)
+
+        return {
+            'success': True,
+            'data': {
+                'query': q,
+                'files': files,
+                'total': total,
+                'offset': offset,
+                'limit': limit
+            }
+        }
+
+    except Exception as e:
+        vx_app.logger.error(f"检索文章失败: {str(e)}")
+        return {
+            'success': False,
+            'error': f'检索文章失败: {str(e)}'
+        }
+
+
 def _get_article_content(vx_app, filename: str) -> Dict[str, Any]:
     """
     获取文章内容
@@ -165,10 +243,9 @@ def _get_article_content(vx_app, filename: str) -> Dict[str, Any]:
         dict: API响应
     """
     try:
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        file_path = os.path.join(articles_dir, filename)
+        file_path = vx_app.article_storage.resolve_markdown(filename)
 
-        if not os.path.exists(file_path):
+        if not file_path:
             return {
                 'success': False,
                 'error': '文件不存在'
@@ -208,17 +285,14 @@ def _update_article_content(vx_app, filename: str) -> Dict[str, Any]:
         data = request.get_json()
         content = data.get('content', '')
 
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        file_path = os.path.join(articles_dir, filename)
-
-        if not os.path.exists(file_path):
+        if not vx_app.article_storage.resolve_markdown(filename):
             return {
                 'success': False,
                 'error': '文件不存在'
             }
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        vx_app.article_storage.write_markdown(filename, content)
+        vx_app.article_index.upsert(filename)
 
         vx_app.logger.info(f"文章已更新: {filename}")
 
@@ -238,6 +312,19 @@ def _update_article_content(vx_app, filename: str) -> Dict[str, Any]:
         }
 
 
+def _title_from_filename(filename: str) -> str:
+    """
+    从文章文件名提取标题
+    """
+    title = filename.replace('.md', '').replace('_', ' ')
+    if title.startswith('2'):
+        # 如果以日期开头，去掉日期部分
+        parts = title.split('_', 2)
+        if len(parts) >= 3:
+            title = parts[2]
+    return title
+
+
 def _convert_to_html(vx_app, filename: str) -> Dict[str, Any]:
     """
     将Markdown转换为HTML
@@ -254,10 +341,9 @@ def _convert_to_html(vx_app, filename: str) -> Dict[str, Any]:
         data = request.get_json() if request.is_json else {}
         template_name = data.get('template_name') if data else request.args.get('template_name')
         
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        md_file_path = os.path.join(articles_dir, filename)
+        md_file_path = vx_app.article_storage.resolve_markdown(filename)
 
-        if not os.path.exists(md_file_path):
+        if not md_file_path:
             return {
                 'success': False,
                 'error': '文件不存在'
@@ -268,12 +354,7 @@ def _convert_to_html(vx_app, filename: str) -> Dict[str, Any]:
             md_content = f.read()
 
         # 从文件名提取标题
-        title = filename.replace('.md', '').replace('_', ' ')
-        if title.startswith('2'):
-            # 如果以日期开头，去掉日期部分
-            parts = title.split('_', 2)
-            if len(parts) >= 3:
-                title = parts[2]
+        title = _title_from_filename(filename)
 
         # 转换为HTML，支持指定模板
         html_content = vx_app.html_converter.markdown_to_styled_html(md_content, title, template_name)
@@ -290,15 +371,9 @@ def _convert_to_html(vx_app, filename: str) -> Dict[str, Any]:
             used_template = "随机选择"
 
         # 保存HTML文件
-        html_dir = os.path.join(articles_dir, 'html')
-        if not os.path.exists(html_dir):
-            os.makedirs(html_dir)
-
         html_filename = filename.replace('.md', '.html')
-        html_file_path = os.path.join(html_dir, html_filename)
-
-        with open(html_file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        html_file_path = vx_app.article_storage.write_html(filename, html_content)
+        vx_app.article_index.set_html(filename, template_name if template_name in template_names else None)
 
         vx_app.logger.info(f"HTML文件已生成: {html_file_path}，使用模板: {used_template}")
 
@@ -349,6 +424,123 @@ def _get_templates(vx_app) -> Dict[str, Any]:
         }
 
 
+def _batch_convert_to_html(vx_app) -> Dict[str, Any]:
+    """
+    批量将Markdown转换为HTML
+    转换在进程池中并行执行，每个文件完成后通过WebSocket推送 convert_update 事件，
+    全部完成后推送 status 为 finished 的汇总事件
+    
+    Args:
+        vx_app: VXToolApp实例
+        
+    Returns:
+        dict: API响应
+    """
+    try:
+        data = request.get_json()
+        if not data or 'filenames' not in data:
+            return {
+                'success': False,
+                'error': '缺少必要参数: filenames'
+            }
+
+        filenames = data['filenames']
+        if not isinstance(filenames, list) or len(filenames) == 0:
+            return {
+                'success': False,
+                'error': '文件名列表不能为空'
+            }
+        template_name = data.get('template_name')
+        template_names = [t['name'] for t in vx_app.html_converter.get_available_templates()]
+        used_template = template_name if template_name in template_names else None
+
+        jobs = []
+        skipped = []
+        for filename in dict.fromkeys(f if isinstance(f, str) else str(f) for f in filenames):
+            try:
+                md_file_path = vx_app.article_storage.resolve_markdown(filename)
+            except ValueError:
+                md_file_path = None
+            if not md_file_path or not filename.endswith('.md'):
+                skipped.append(filename)
+                continue
+
+            html_filename = filename.replace('.md', '.html')
+            jobs.append({
+                'filename': filename,
+                'md_path': md_file_path,
+                'html_path': vx_app.article_storage.html_path(filename),
+                'html_filename': html_filename,
+                'title': _title_from_filename(filename)
+            })
+
+        if not jobs:
+            return {
+                'success': False,
+                'error': '没有可转换的文件'
+            }
+
+        batch_id = str(uuid.uuid4())
+        total = len(jobs)
+        progress = {'done': 0, 'failed': 0}
+
+        def on_result(result: dict):
+            progress['done'] += 1
+            if result['success']:
+                vx_app.article_index.set_html(result['filename'], used_template)
+            else:
+                progress['failed'] += 1
+            vx_app.socketio.emit('convert_update', {
+                'batch_id': batch_id,
+                'status': 'completed' if result['success'] else 'failed',
+                'filename': result['filename'],
+                'html_filename': result['html_filename'],
+                'error': result['error'],
+                'elapsed': result['elapsed'],
+                'done': progress['done'],
+                'total': total
+            })
+
+        def run_batch():
+            try:
+                vx_app.batch_converter.convert(jobs, template_name, on_result)
+            except Exception as e:
+                vx_app.logger.error(f"批量转换HTML失败: {str(e)}")
+            vx_app.logger.info(f"批量转换HTML完成: {batch_id}，成功 {progress['done'] - progress['failed']} 个，"
+                               f"失败 {progress['failed']} 个")
+            vx_app.socketio.emit('convert_update', {
+                'batch_id': batch_id,
+                'status': 'finished',
+                'done': progress['done'],
+                'failed': progress['failed'],
+                'total': total
+            })
+
+        threading.Thread(target=run_batch, daemon=True).start()
+        vx_app.logger.info(f"开始批量转换HTML: {batch_id}，共 {total} 个文件")
+
+        message = f'批量转换任务已启动，共 {total} 个文件'
+        if skipped:
+            message += f'，跳过 {len(skipped)} 个不存在或无效的文件'
+
+        return {
+            'success': True,
+            'data': {
+                'batch_id': batch_id,
+                'total': total,
+                'skipped': skipped,
+                'message': message + '，请通过WebSocket监听进度'
+            }
+        }
+
+    except Exception as e:
+        vx_app.logger.error(f"批量转换HTML失败: {str(e)}")
+        return {
+            'success': False,
+            'error': f'批量转换HTML失败: {str(e)}'
+        }
+
+
 def _batch_delete_articles(vx_app) -> Dict[str, Any]:
     """
     批量删除文章
@@ -374,32 +566,27 @@ def _batch_delete_articles(vx_app) -> Dict[str, Any]:
                 'error': '文件名列表不能为空'
             }
 
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        html_dir = os.path.join(articles_dir, 'html')
-        
         deleted_count = 0
+        deleted_files = []
         failed_files = []
         
         for filename in filenames:
             try:
-                # 删除markdown文件
-                md_file_path = os.path.join(articles_dir, filename)
-                if os.path.exists(md_file_path):
-                    os.remove(md_file_path)
+                # 删除markdown文件及对应的HTML文件（如果存在）
+                md_deleted, html_deleted = vx_app.article_storage.delete(filename)
+                if md_deleted:
                     vx_app.logger.info(f"已删除markdown文件: {filename}")
                     deleted_count += 1
-                
-                # 删除对应的HTML文件（如果存在）
-                html_filename = filename.replace('.md', '.html')
-                html_file_path = os.path.join(html_dir, html_filename)
-                if os.path.exists(html_file_path):
-                    os.remove(html_file_path)
-                    vx_app.logger.info(f"已删除HTML文件: {html_filename}")
+                    deleted_files.append(filename)
+                if html_deleted:
+                    vx_app.logger.info(f"已删除HTML文件: {filename.replace('.md', '.html')}")
                     
             except Exception as e:
                 vx_app.logger.error(f"删除文件 {filename} 失败: {str(e)}")
                 failed_files.append(filename)
 
+        vx_app.article_index.remove(deleted_files)
+
         result_message = f"成功删除 {deleted_count} 个文件"
         if failed_files:
             result_message += f"，{len(failed_files)} 个文件删除失败"
@@ -433,12 +620,10 @@ def _preview_html(vx_app, filename: str):
         Flask response
     """
     try:
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        html_dir = os.path.join(articles_dir, 'html')
-        html_file_path = os.path.join(html_dir, filename)
+        html_file_path = vx_app.article_storage.resolve_html(filename)
 
-        if not os.path.exists(html_file_path):
-            vx_app.logger.warning(f"HTML文件不存在: {html_file_path}")
+        if not html_file_path:
+            vx_app.logger.warning(f"HTML文件不存在: {filename}")
             return abort(404)  # 返回HTTP 404状态码
 
         return send_file(html_file_path, mimetype='text/html')
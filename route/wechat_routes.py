@@ -6,7 +6,6 @@
 
 from flask import request
 from typing import Dict, Any
-import os
 
 
 def register_wechat_routes(app, vx_app):
@@ -77,12 +76,9 @@ def _publish_to_wechat(vx_app, filename: str) -> Dict[str, Any]:
     """
     try:
         # 检查HTML文件是否存在
-        articles_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'articles')
-        html_dir = os.path.join(articles_dir, 'html')
-        html_filename = filename.replace('.md', '.html')
-        html_file_path = os.path.join(html_dir, html_filename)
+        html_file_path = vx_app.article_storage.resolve_html(filename)
         
-        if not os.path.exists(html_file_path):
+        if not html_file_path:
             return {
                 'success': False,
                 'error': 'HTML文件不存在，请先转换Markdown为HTML'
@@ -100,6 +96,18 @@ def _publish_to_wechat(vx_app, filename: str) -> Dict[str, Any]:
             if len(parts) >= 3:
                 title = parts[2]
         
+        # 检查是否与已发布的文章近似重复
+        data = request.get_json(silent=True) or {}
+        duplicates = vx_app.article_index.find_duplicates(filename=filename, published_only=True)
+        if duplicates:
+            vx_app.logger.warning(f"文章与已发布文章近似重复: {filename} -> {duplicates[0]['name']}")
+            if vx_app.config.get_duplicate_policy() == 'block' and not data.get('force', False):
+                return {
+                    'success': False,
+                    'error': f"文章与已发布的《{duplicates[0]['title']}》近似重复，如需继续发布请传入 force",
+                    'data': {'duplicates': duplicates}
+                }, 409
+        
         # 生成摘要
         digest = vx_app.html_converter.extract_digest(html_content)
         
@@ -111,6 +119,7 @@ def _publish_to_wechat(vx_app, filename: str) -> Dict[str, Any]:
                 'error': error
             }
         
+        vx_app.article_index.mark_published(filename, media_id)
         vx_app.logger.info(f"文章已发布到微信: {title}, Media ID: {media_id}")
         
         return {
@@ -119,6 +128,7 @@ def _publish_to_wechat(vx_app, filename: str) -> Dict[str, Any]:
                 'title': title,
                 'media_id': media_id,
                 'digest': digest,
+                'duplicates': duplicates,
                 'message': '文章已成功发布到微信公众号！'
             }
         }
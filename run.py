@@ -96,6 +96,29 @@ def create_directories():
             print(f"✅ 创建目录: {directory}")
 
 
+def migrate_storage(dry_run: bool = False):
+    """
+    将平铺的文章迁移到日期分片目录，并同步文章索引
+    """
+    from core.article_storage import get_article_storage
+    from core.article_index import get_article_index
+    
+    storage = get_article_storage()
+    if storage.layout != 'sharded':
+        print("⚠️ 当前存储布局为flat，无需迁移")
+        return
+    
+    print(f"📦 {'统计' if dry_run else '迁移'}平铺的文章文件...")
+    stats = storage.migrate(dry_run=dry_run)
+    print(f"{'🔍 需要迁移' if dry_run else '✅ 已迁移'}: Markdown {stats['markdown']} 个，HTML {stats['html']} 个")
+    if stats['skipped']:
+        print(f"⚠️ 分片目录中已存在同名文件，跳过 {stats['skipped']} 个")
+    
+    if not dry_run:
+        get_article_index().reconcile(force=True)
+        print("✅ 文章索引已同步")
+
+
 def main():
     """
     主函数
@@ -105,6 +128,9 @@ def main():
     parser.add_argument('--port', type=int, default=5000, help='服务器端口 (默认: 5000)')
     parser.add_argument('--debug', action='store_true',default=False, help='启用调试模式')
     parser.add_argument('--check-only', action='store_true', help='仅检查环境，不启动服务')
+    parser.add_argument('--migrate-storage', action='store_true',
+                        help='将平铺在articles目录下的文章迁移到按日期分片的目录后退出')
+    parser.add_argument('--dry-run', action='store_true', help='与 --migrate-storage 一起使用，仅统计不移动文件')
     
     args = parser.parse_args()
     
@@ -138,6 +164,10 @@ def main():
         print("\n✅ 环境检查完成，所有组件正常！")
         return
     
+    if args.migrate_storage:
+        migrate_storage(args.dry_run)
+        return
+    
     # 5. 启动应用
     try:
         print(f"\n🌟 启动VX Tool服务...")
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+相同文章生成请求合并（single-flight）测试
+使用桩AI客户端统计上游调用次数，不访问真实的AI接口
+"""
+
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from app import VXToolApp
+from core.article_index import ArticleIndex
+from core.article_storage import ArticleStorage
+from core.logger import get_logger
+from core.task_queue import TaskQueue
+from core.task_store import MemoryTaskStore
+
+
+class StubAIClient:
+    """
+    桩AI客户端：记录调用次数，阻塞到测试放行后返回固定文章
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def generate_article_from_title(self, title, use_catchy_title=True, on_chunk=None, bypass_cache=False):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        return f"# {title}\n\n正文内容", f"{title}（新）"
+
+
+class StubConfig:
+    def get_stream_output(self):
+        return False
+
+
+class StubSocketIO:
+    def emit(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    client = StubAIClient()
+    monkeypatch.setattr(app_module, 'get_qwen_client', lambda model_type='qwen': client)
+    yield client
+    client.release.set()
+
+
+@pytest.fixture
+def vx_app(tmp_path):
+    # 只初始化任务调度相关的组件，不启动Flask、热点预取和真实AI客户端
+    instance = VXToolApp.__new__(VXToolApp)
+    instance.logger = get_logger()
+    instance.config = StubConfig()
+    instance.socketio = StubSocketIO()
+    instance.task_status = MemoryTaskStore()
+    instance.task_queue = TaskQueue({'qwen': 4}, max_queue_size=20)
+    instance.article_storage = ArticleStorage(str(tmp_path / 'articles'), fsync='none')
+    instance.article_index = ArticleIndex(str(tmp_path / 'articles.db'), storage=instance.article_storage)
+    instance._inflight_tasks = {}
+    instance._inflight_lock = threading.Lock()
+    return instance
+
+
+def _start_concurrently(vx_app, count, **kwargs):
+    barrier = threading.Barrier(count)
+    task_ids = [None] * count
+
+    def submit(index):
+        barrier.wait()
+        task_ids[index] = vx_app.start_article_generation('人工智能的未来', ai_model='qwen', **kwargs)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return task_ids
+
+
+def _wait_finished(vx_app, task_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = vx_app.task_status.get(task_id) or {}
+        if status.get('status') in ('completed', 'failed'):
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"任务 {task_id} 未在 {timeout} 秒内结束")
+
+
+def test_identical_requests_share_one_upstream_call(vx_app, stub_client):
+    task_ids = _start_concurrently(vx_app, 8)
+
+    assert len(set(task_ids)) == 1
+    stub_client.release.set()
+    status = _wait_finished(vx_app, task_ids[0])
+
+    assert status['status'] == 'completed'
+    assert stub_client.calls == 1
+    assert not vx_app._inflight_tasks
+
+
+def test_request_after_completion_starts_new_task(vx_app, stub_client):
+    stub_client.release.set()
+    first = vx_app.start_article_generation('人工智能的未来')
+    _wait_finished(vx_app, first)
+    second = vx_app.start_article_generation('人工智能的未来')
+    _wait_finished(vx_app, second)
+
+    assert first != second
+    assert stub_client.calls == 2
+
+
+def test_bypass_cache_request_is_not_merged_with_cached_request(vx_app, stub_client):
+    cached = vx_app.start_article_generation('人工智能的未来')
+    bypassed = _start_concurrently(vx_app, 4, bypass_cache=True)
+
+    assert len(set(bypassed)) == 1
+    assert bypassed[0] != cached
+    stub_client.release.set()
+    _wait_finished(vx_app, cached)
+    _wait_finished(vx_app, bypassed[0])
+
+    assert stub_client.calls == 2
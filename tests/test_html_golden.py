@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+HTML转换黄金文件测试
+每个内置模板以固定的Markdown样例渲染，所有解析后端的输出都必须与黄金文件逐字节一致；
+渲染逻辑有意变化时，设置环境变量 UPDATE_GOLDEN=1 重新生成黄金文件（以html.parser输出为准）
+"""
+
+import os
+
+import pytest
+
+from core.html_converter import HTMLConverter, PARSER_BACKENDS
+from core.template_manager import TemplateManager
+
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden', 'html')
+SAMPLE_TITLE = '人工智能的下一个十年'
+
+# 只使用内置模板，外部主题目录不影响测试结果
+TEMPLATE_NAMES = list(TemplateManager(themes_dir='', reload_interval=0).get_templates())
+
+
+def _read_sample() -> str:
+    with open(os.path.join(GOLDEN_DIR, 'sample.md'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _render(parser: str, template_name: str) -> str:
+    converter = HTMLConverter(parser=parser)
+    converter.template_manager = TemplateManager(themes_dir='', reload_interval=0)
+    converter.render_cache.enabled = False
+    html = converter.markdown_to_styled_html(_read_sample(), SAMPLE_TITLE, template_name)
+    assert html is not None, f"{parser} 渲染 {template_name} 失败"
+    return html
+
+
+@pytest.mark.parametrize('template_name', TEMPLATE_NAMES)
+@pytest.mark.parametrize('parser', PARSER_BACKENDS)
+def test_backend_output_matches_golden(parser, template_name):
+    golden_path = os.path.join(GOLDEN_DIR, f'{template_name}.html')
+    if os.environ.get('UPDATE_GOLDEN'):
+        with open(golden_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(_render('html.parser', template_name))
+
+    with open(golden_path, 'r', encoding='utf-8', newline='') as f:
+        expected = f.read()
+    assert _render(parser, template_name) == expected
+
+
+def test_every_template_has_golden_file():
+    golden_files = {name[:-len('.html')] for name in os.listdir(GOLDEN_DIR) if name.endswith('.html')}
+    assert golden_files == set(TEMPLATE_NAMES)
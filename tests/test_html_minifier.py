@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+HTML压缩测试
+pre/code/textarea 内容原样保留；不含这些标签时，输出与原先基于正则的多遍实现逐字节一致
+"""
+
+import random
+import re
+
+from tools.utils import decompress_html
+
+
+def legacy_decompress_html(html_content, use_compress=True):
+    """
+    原先的多遍正则实现（仅作为对照）
+    """
+    if not html_content or not use_compress:
+        return html_content
+    html_content = re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL)
+    compressed = re.sub(r'>\s+<', '><', html_content)
+    compressed = re.sub(r'^\s+|\s+$', '', compressed, flags=re.MULTILINE)
+    compressed = re.sub(r'\s+', ' ', compressed)
+    compressed = re.sub(r'\s*<\s*', '<', compressed)
+    compressed = re.sub(r'\s*>\s*', '>', compressed)
+    return compressed.strip()
+
+
+def test_pre_and_code_content_is_preserved():
+    code = 'def main():\n    if True:\n\n        print("a  b")\n'
+    html = (
+        '<section>\n  <p>  前言   文字  </p>\n'
+        f'  <pre class="highlight"><code class="language-python">{code}</code></pre>\n'
+        '  <p>行内 <code>  x  =  1 </code> 代码</p>\n'
+        '</section>\n'
+    )
+    result = decompress_html(html)
+
+    assert f'<pre class="highlight"><code class="language-python">{code}</code></pre>' in result
+    assert '<code>  x  =  1 </code>' in result
+    assert result.startswith('<section><p>前言 文字</p><pre')
+    assert result.endswith('</p></section>')
+
+
+def test_nested_and_uppercase_preserved_tags():
+    html = '<div>\n<PRE>  a\n  <code>  b\n</code>\n  c  </PRE>\n<textarea>\n  d\n</textarea>\n</div>'
+    assert decompress_html(html) == '<div><PRE>  a\n  <code>  b\n</code>\n  c  </PRE><textarea>\n  d\n</textarea></div>'
+
+
+def test_comments_are_removed_outside_preserved_tags():
+    assert decompress_html('<p>a <!-- 注释\n --> b</p>\n<!-- x -->') == '<p>a b</p>'
+
+
+def test_use_compress_false_returns_input():
+    html = '<p>\n  a\n</p>'
+    assert decompress_html(html, use_compress=False) is html
+
+
+FRAGMENTS = [
+    '<p>', '</p>', '<div class="a  b"\n  id="x">', '</div>', '<br/>', '<img src="a.png" />', '< span >',
+    '</ span >', '<!-- 注释 -->', '<!--\n多行\n注释-->', '文字', 'text  with   spaces', '中文，标点。',
+    ' ', '  ', '\n', '\n\n', '\t', ' \n \n ', '\n  \n', '>', '<', 'a > b', 'x < y', '&lt;&gt;',
+]
+
+
+def test_matches_legacy_output_without_preserved_tags():
+    rng = random.Random(2024)
+    for _ in range(2000):
+        html = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60)))
+        assert decompress_html(html) == legacy_decompress_html(html), repr(html)
+
+
+def test_matches_legacy_output_on_rendered_article():
+    html = (
+        '<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n    <meta charset="UTF-8">\n'
+        '    <title>标题</title>\n</head>\n<body>\n    <section style="max-width: 100%;">\n'
+        '        <h1 style="font-size: 28px;">人工智能的下一个十年</h1>\n\n'
+        '        <p style="color: #333;">第一段  文字，\n包含换行。</p>\n'
+        '        <ul>\n            <li>一</li>\n            <li>二</li>\n        </ul>\n'
+        '    </section>\n</body>\n</html>\n'
+    )
+    assert decompress_html(html) == legacy_decompress_html(html)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+文章生成任务阶段测试
+流式输出时，文章片段推送期间任务状态应处于 generating_article，AI调用返回后只推送 saving 和 completed
+"""
+
+import threading
+
+import pytest
+
+import app as app_module
+from app import VXToolApp
+from core.article_index import ArticleIndex
+from core.article_storage import ArticleStorage
+from core.logger import get_logger
+from core.task_store import MemoryTaskStore
+
+
+class StreamingStubClient:
+    """
+    桩AI客户端：按片段回调文章内容，并记录每个片段推送时的任务状态
+    """
+
+    def __init__(self, vx_app, task_id):
+        self.vx_app = vx_app
+        self.task_id = task_id
+        self.statuses_during_stream = []
+
+    def generate_article_from_title(self, title, use_catchy_title=True, on_chunk=None, bypass_cache=False):
+        for delta in (f"# {title}\n\n", "第一段。\n\n", "第二段。"):
+            if on_chunk:
+                on_chunk(delta)
+            self.statuses_during_stream.append(self.vx_app.task_status[self.task_id]['status'])
+        return f"# {title}\n\n第一段。\n\n第二段。", f"{title}（新）"
+
+
+class StubConfig:
+    def __init__(self, stream_output):
+        self.stream_output = stream_output
+
+    def get_stream_output(self):
+        return self.stream_output
+
+
+class RecordingSocketIO:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, data):
+        self.events.append(data)
+
+
+def _make_app(tmp_path, stream_output):
+    instance = VXToolApp.__new__(VXToolApp)
+    instance.logger = get_logger()
+    instance.config = StubConfig(stream_output)
+    instance.socketio = RecordingSocketIO()
+    instance.task_status = MemoryTaskStore()
+    instance.article_storage = ArticleStorage(str(tmp_path / 'articles'), fsync='none')
+    instance.article_index = ArticleIndex(str(tmp_path / 'articles.db'), storage=instance.article_storage)
+    instance._inflight_tasks = {}
+    instance._inflight_lock = threading.Lock()
+    return instance
+
+
+@pytest.mark.parametrize('use_catchy_title', [True, False])
+def test_streaming_reports_article_phase_before_chunks(tmp_path, monkeypatch, use_catchy_title):
+    vx_app = _make_app(tmp_path, stream_output=True)
+    vx_app.task_status['t1'] = {'status': 'running'}
+    client = StreamingStubClient(vx_app, 't1')
+    monkeypatch.setattr(app_module, 'get_qwen_client', lambda model_type='qwen': client)
+
+    vx_app.generate_article_async('人工智能的未来', 't1', use_catchy_title, 'qwen')
+
+    statuses = [event['status'] for event in vx_app.socketio.events]
+    expected_start = ['generating_title', 'generating_article'] if use_catchy_title else ['generating_article']
+    assert statuses == expected_start + ['article_chunk'] * 3 + ['saving', 'completed']
+    assert client.statuses_during_stream == ['generating_article'] * 3
+    assert vx_app.task_status['t1']['status'] == 'completed'
+
+
+def test_non_streaming_reports_article_phase_before_call(tmp_path, monkeypatch):
+    vx_app = _make_app(tmp_path, stream_output=False)
+    vx_app.task_status['t1'] = {'status': 'running'}
+    client = StreamingStubClient(vx_app, 't1')
+    monkeypatch.setattr(app_module, 'get_qwen_client', lambda model_type='qwen': client)
+
+    vx_app.generate_article_async('人工智能的未来', 't1', True, 'qwen')
+
+    statuses = [event['status'] for event in vx_app.socketio.events]
+    assert statuses == ['generating_article', 'saving', 'completed']
+    assert client.statuses_during_stream == ['generating_article'] * 3
@@ -14,12 +14,17 @@
 # 详情请参阅 LICENSE.md 文件。
 
 
-import requests
 import random
-from typing import Optional, List, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, List, Dict, Tuple
 from bs4 import BeautifulSoup
 
+from core.config import get_config
 from core.logger import get_logger
+from core.http_client import get_http_client
+from tools.hotnews_history import get_hotnews_history
 
 # 平台名称映射
 PLATFORMS = [
@@ -49,6 +54,28 @@ TOPHUB_PLATFORMS = [p["tophub_id"] for p in PLATFORMS if p["tophub_id"]]
 
 logger = get_logger()
 
+# tophub.today 页面快照：平台名称 -> 热点列表，整页只下载和解析一次
+_tophub_snapshot = {"index": {}, "fetched_at": 0.0, "retry_at": 0.0}
+_tophub_lock = threading.Lock()
+
+# 平台热点结果缓存：平台名称 -> {"topics", "source", "fetched_at"}
+_news_cache = {}
+_news_cache_lock = threading.Lock()
+_news_refreshing = set()
+
+# 缓存时每个平台获取的最少条目数，不同数量的请求共用同一份缓存
+NEWS_CACHE_COUNT = 50
+
+
+def _get_hotnews_config() -> Dict:
+    """
+    获取热点配置，配置文件不存在时使用默认值
+    """
+    try:
+        return get_config().get_hotnews_config()
+    except FileNotFoundError:
+        return {"tophub_ttl": 60, "fresh_window": 300, "max_stale": 3600}
+
 def get_zhiwei_hotnews(platform: str) -> Optional[List[Dict]]:
     """
     获取知微数据的热点数据
@@ -63,7 +90,7 @@ def get_zhiwei_hotnews(platform: str) -> Optional[List[Dict]]:
             # noqa 501
             "Referer": "https://trends.zhiweidata.com/",
         }
-        response = requests.get(api_url, headers=headers, timeout=10)
+        response = get_http_client().get(api_url, headers=headers)
         response.raise_for_status()
 
         data = response.json()
@@ -82,74 +109,292 @@ def get_zhiwei_hotnews(platform: str) -> Optional[List[Dict]]:
         return None
 
 
+def _parse_tophub_page(html: str) -> Dict[str, List[Dict]]:
+    """
+    解析 tophub.today 首页，按平台名称索引所有 cc-cd 热点块
+    参数 html: 页面HTML
+    返回: {平台名称: 热点条目列表}，条目包含 name, rank, lastCount, url
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    index = {}
+
+    for div in soup.find_all("div", class_="cc-cd"):
+        label = div.find("div", class_="cc-cd-lb")
+        platform_span = label.find("span") if label else None
+        if not platform_span:
+            continue
+        platform = platform_span.text.strip()
+        if platform in index:
+            # 与逐个查找时的行为一致：同名平台取页面中第一个
+            continue
+
+        hotnews = []
+        for item in div.find_all("div", class_="cc-cd-cb-ll"):
+            rank = item.find("span", class_="s")
+            title = item.find("span", class_="t")
+            if not rank or not title:
+                continue
+            try:
+                rank_value = int(rank.text.strip())
+            except ValueError:
+                continue
+            engagement = item.find("span", class_="e")
+            link = item.find("a")
+            hotnews.append(
+                    {
+                        "name": title.text.strip(),
+                        "rank": rank_value,
+                        "lastCount": engagement.text.strip() if engagement else "0",
+                        "url": link["href"] if link and link.has_attr("href") else "",
+                    }
+            )
+        index[platform] = hotnews
+
+    return index
+
+
+def get_tophub_snapshot() -> Dict[str, List[Dict]]:
+    """
+    获取 tophub.today 的页面快照索引，在有效期内复用，过期后重新下载并解析
+    并发调用时只有一个线程下载，其余线程等待并复用结果；下载失败时返回旧快照
+    返回: {平台名称: 热点条目列表}
+    """
+    ttl = _get_hotnews_config()["tophub_ttl"]
+
+    def is_fresh() -> bool:
+        now = time.time()
+        return now - _tophub_snapshot["fetched_at"] < ttl or now < _tophub_snapshot["retry_at"]
+
+    if is_fresh():
+        return _tophub_snapshot["index"]
+
+    with _tophub_lock:
+        # 等待锁期间其他线程可能已完成刷新
+        if is_fresh():
+            return _tophub_snapshot["index"]
+
+        api_url = "https://tophub.today/"
+        try:
+            logger.info(f"---热点获取url:{api_url}")
+
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                # noqa 501
+            }
+            response = get_http_client().get(api_url, headers=headers)
+            response.raise_for_status()
+
+            index = _parse_tophub_page(response.text)
+            _tophub_snapshot["index"] = index
+            _tophub_snapshot["fetched_at"] = time.time()
+        except Exception as e:
+            # 失败后短时间内不再重试，避免并发请求依次等待超时
+            _tophub_snapshot["retry_at"] = time.time() + min(ttl, 10)
+            logger.warning(f"tophub页面获取失败: {e}")
+
+        return _tophub_snapshot["index"]
+
+
 def get_tophub_hotnews(platform: str, cnt: int = 10) -> Optional[List[Dict]]:
     """
-    获取 tophub.today 的热点数据
+    获取 tophub.today 的热点数据（从页面快照索引中读取）
     参数 platform: 平台名称（中文，如“微博”）
-    参数 tophub_id: tophub.today 的平台标识（如 s.weibo.com, zhihu.com）
     参数 cnt: 返回的新闻数量
     返回格式: 列表数据，每个元素为热点条目字典，包含 name, rank, lastCount
     """
-    api_url = "https://tophub.today/"
     try:
-        logger.info(f"---热点获取url:{api_url}")
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            # noqa 501
-        }
-        response = requests.get(api_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        platform_divs = soup.find_all("div", class_="cc-cd")
-
-        for div in platform_divs:
-            platform_span = div.find("div", class_="cc-cd-lb").find("span")
-            if platform_span and platform_span.text.strip() == platform:
-                news_items = div.find_all("div", class_="cc-cd-cb-ll")[:cnt]
-                hotnews = []
-                for item in news_items:
-                    rank = item.find("span", class_="s").text.strip()
-                    title = item.find("span", class_="t").text.strip()
-                    engagement = item.find("span", class_="e")
-                    last_count = engagement.text.strip() if engagement else "0"
-                    hotnews.append(
-                            {
-                                "name": title,
-                                "rank": int(rank),
-                                "lastCount": last_count,
-                                "url": item.find("a")["href"] if item.find("a") else "",
-                            }
-                    )
-                return hotnews
-        return None
+        hotnews = get_tophub_snapshot().get(platform)
+        return hotnews[:cnt] if hotnews else None
     except Exception as e:  # noqa 841
         return None
 
 
-def get_platform_news(platform: str, cnt: int = 30) -> List[Dict]:
+def fetch_platform_news(platform: str, cnt: int = 30) -> Tuple[List[Dict], Optional[str]]:
     """
-    获取指定平台的新闻数据，优先从知微数据获取，失败则从 tophub.today 获取
+    获取指定平台的新闻数据及其来源，优先从知微数据获取，失败则从 tophub.today 获取
     参数 platform: 平台名称（中文，如"微博"）
     参数 cnt: 返回的新闻数量
-    返回: 新闻数据列表，包含 name, rank, lastCount, url 字段
+    返回: (新闻数据列表, 数据来源 zhiwei/tophub)，获取失败时为 ([], None)
     """
     # 查找平台对应的知微数据标识和 tophub 标识
     platform_info = next((p for p in PLATFORMS if p["name"] == platform), None)
     if not platform_info:
-        return []
+        return [], None
 
     # 1. 优先尝试知微数据
     if platform_info["zhiwei_id"] in ZHIWEI_PLATFORMS:
         hotnews = get_zhiwei_hotnews(platform_info["zhiwei_id"])
         if hotnews:
-            return hotnews[:cnt]
+            return hotnews[:cnt], "zhiwei"
 
     # 2. 回退到 tophub.today
     if platform_info["tophub_id"] in TOPHUB_PLATFORMS:
         hotnews = get_tophub_hotnews(platform, cnt)
         if hotnews:
-            return hotnews[:cnt]
+            return hotnews[:cnt], "tophub"
+
+    return [], None
+
+
+def get_platform_news(platform: str, cnt: int = 30) -> List[Dict]:
+    """
+    获取指定平台的新闻数据，优先从知微数据获取，失败则从 tophub.today 获取
+    参数 platform: 平台名称（中文，如"微博"）
+    参数 cnt: 返回的新闻数量
+    返回: 新闻数据列表，包含 name, rank, lastCount, url 字段
+    """
+    return fetch_platform_news(platform, cnt)[0]
+
+
+def refresh_platform_news(platform: str, cnt: int) -> Optional[Dict]:
+    """
+    重新获取平台热点并写入缓存，获取失败时保留原缓存
+    参数 platform: 平台名称
+    参数 cnt: 获取的新闻数量
+    返回: 新的缓存条目，失败返回 None
+    """
+    fetch_start = time.time()
+    try:
+        topics, source = fetch_platform_news(platform, cnt)
+    except Exception as e:
+        logger.warning(f"刷新{platform}热点失败: {e}")
+        topics, source = [], None
+
+    if not topics:
+        return None
+
+    fetched_at = time.time()
+    entry = {"topics": topics, "source": source, "fetched_at": fetched_at,
+             "latency": round(fetched_at - fetch_start, 3), "count": cnt}
+    with _news_cache_lock:
+        _news_cache[platform] = entry
+
+    # 追加到热点历史，用于排名走势分析
+    try:
+        history = get_hotnews_history()
+        if history:
+            history.record_snapshot(platform, topics, entry["fetched_at"])
+    except Exception as e:
+        logger.warning(f"记录{platform}热点历史失败: {e}")
+
+    return entry
+
+
+def _refresh_platform_news_async(platform: str, cnt: int):
+    """
+    在后台线程中刷新平台热点，同一平台同时只有一个刷新线程
+    """
+    with _news_cache_lock:
+        if platform in _news_refreshing:
+            return
+        _news_refreshing.add(platform)
+
+    def run():
+        try:
+            refresh_platform_news(platform, cnt)
+        finally:
+            with _news_cache_lock:
+                _news_refreshing.discard(platform)
+
+    thread = threading.Thread(target=run, name=f"hotnews-refresh-{platform}")
+    thread.daemon = True
+    thread.start()
+
+
+def get_platform_news_cached(platform: str, cnt: int = 30) -> Dict:
+    """
+    获取平台热点（带缓存，stale-while-revalidate）
+    新鲜期内直接返回缓存；超过新鲜期但未超过最长可用期时立即返回旧数据并在后台刷新；
+    无缓存或超过最长可用期时同步获取
+    参数 platform: 平台名称（中文，如"微博"）
+    参数 cnt: 返回的新闻数量
+    返回: {"topics": 新闻列表, "source": 数据来源, "fetched_at": 获取时间戳, "stale": 是否为旧数据}
+    """
+    config = _get_hotnews_config()
+    fetch_count = max(cnt, NEWS_CACHE_COUNT)
+
+    with _news_cache_lock:
+        entry = _news_cache.get(platform)
+
+    age = time.time() - entry["fetched_at"] if entry else None
+    if entry is None or age >= config["max_stale"] or entry["count"] < cnt:
+        entry = refresh_platform_news(platform, fetch_count)
+        if entry is None:
+            return {"topics": [], "source": None, "fetched_at": None, "stale": False}
+        stale = False
+    elif age >= config["fresh_window"]:
+        _refresh_platform_news_async(platform, fetch_count)
+        stale = True
+    else:
+        stale = False
+
+    return {
+        "topics": entry["topics"][:cnt],
+        "source": entry["source"],
+        "fetched_at": entry["fetched_at"],
+        "stale": stale,
+    }
+
+
+def get_platform_news_snapshot(platform: str, cnt: int = 30, fresh_window: Optional[float] = None) -> Optional[Dict]:
+    """
+    仅从缓存读取平台热点，不发起任何网络请求（配合后台预取使用）
+    参数 platform: 平台名称（中文，如"微博"）
+    参数 cnt: 返回的新闻数量
+    参数 fresh_window: 新鲜期秒数，超过后标记为旧数据；为 None 时使用配置的 fresh_window
+    返回: 与 get_platform_news_cached 相同格式的数据，另含 latency（获取该快照时的请求耗时），无缓存时返回 None
+    """
+    with _news_cache_lock:
+        entry = _news_cache.get(platform)
+    if entry is None:
+        return None
+    if fresh_window is None:
+        fresh_window = _get_hotnews_config()["fresh_window"]
+
+    return {
+        "topics": entry["topics"][:cnt],
+        "source": entry["source"],
+        "fetched_at": entry["fetched_at"],
+        "latency": entry["latency"],
+        "stale": time.time() - entry["fetched_at"] >= fresh_window,
+    }
+
+
+def get_all_platform_news(cnt: int = 30, deadline: float = 15.0, max_workers: int = 8) -> Dict:
+    """
+    并发获取所有平台的新闻数据，在总时限内返回已完成的部分结果
+    参数 cnt: 每个平台返回的新闻数量
+    参数 deadline: 总时限（秒），超时未完成的平台列入 pending
+    参数 max_workers: 并发线程数
+    返回: {"platforms": [{platform, source, latency, count, topics, fetched_at, stale}], "pending": [平台名称], "elapsed": 秒}
+    """
+    start = time.time()
+
+    def fetch(platform: str) -> Dict:
+        fetch_start = time.time()
+        try:
+            result = get_platform_news_cached(platform, cnt)
+        except Exception as e:  # noqa 841
+            result = {"topics": [], "source": None, "fetched_at": None, "stale": False}
+        return {
+            "platform": platform,
+            "source": result["source"],
+            "latency": round(time.time() - fetch_start, 3),
+            "count": len(result["topics"]),
+            "topics": result["topics"],
+            "fetched_at": result["fetched_at"],
+            "stale": result["stale"],
+        }
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hotnews")
+    futures = {executor.submit(fetch, p["name"]): p["name"] for p in PLATFORMS}
+    done, not_done = wait(futures, timeout=deadline)
+    # 不等待超时的请求，线程在各自的HTTP超时后自行结束
+    executor.shutdown(wait=False, cancel_futures=True)
 
-    return []
\ No newline at end of file
+    results = sorted((f.result() for f in done), key=lambda r: r["latency"])
+    return {
+        "platforms": results,
+        "pending": [futures[f] for f in not_done],
+        "elapsed": round(time.time() - start, 3),
+    }
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+热点历史模块
+将每次获取的热点快照追加写入SQLite，并按规范化话题名称索引，用于查询排名走势
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from core.logger import get_logger
+
+
+def normalize_topic_name(name: str) -> str:
+    """
+    规范化话题名称：转小写并去除空白和标点，使同一话题在不同快照中对应同一键
+    参数 name: 话题名称
+    返回: 规范化后的名称
+    """
+    return re.sub(r'[\W_]+', '', (name or '').lower())
+
+
+class HotNewsHistory:
+    """
+    热点历史存储
+    只追加写入，按 (规范化名称, 时间) 建立覆盖索引，查询单个话题走势无需扫描全表
+    """
+
+    def __init__(self, db_path: str):
+        """
+        初始化历史存储
+
+        Args:
+            db_path: 数据库文件路径
+        """
+        self.db_path = db_path
+        self.logger = get_logger()
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS hot_topic_history ('
+            'id INTEGER PRIMARY KEY, '
+            'platform TEXT NOT NULL, '
+            'name TEXT NOT NULL, '
+            'norm_name TEXT NOT NULL, '
+            'rank INTEGER NOT NULL, '
+            'last_count TEXT, '
+            'ts REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_history_topic '
+            'ON hot_topic_history (norm_name, ts, platform, rank, last_count)'
+        )
+        self._conn.commit()
+
+    def record_snapshot(self, platform: str, topics: List[Dict], ts: Optional[float] = None) -> int:
+        """
+        追加一次平台热点快照
+
+        Args:
+            platform: 平台名称
+            topics: 热点列表，元素包含 name, rank, lastCount
+            ts: 快照时间戳，默认为当前时间
+
+        Returns:
+            int: 写入的条目数
+        """
+        ts = ts or time.time()
+        rows = []
+        for topic in topics:
+            norm_name = normalize_topic_name(topic.get('name', ''))
+            if not norm_name:
+                continue
+            try:
+                rank = int(topic.get('rank', 0))
+            except (TypeError, ValueError):
+                continue
+            rows.append((platform, topic['name'], norm_name, rank, str(topic.get('lastCount', '')), ts))
+
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO hot_topic_history (platform, name, norm_name, rank, last_count, ts) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def get_trajectory(self, name: str, hours: float = 24, platform: Optional[str] = None) -> Dict:
+        """
+        查询话题在时间窗口内的排名走势和变化速度
+
+        Args:
+            name: 话题名称
+            hours: 时间窗口（小时）
+            platform: 平台名称，为None时返回所有平台
+
+        Returns:
+            dict: {"name", "norm_name", "platforms": [{platform, points, first_rank, last_rank, best_rank, velocity}]}
+                  velocity 为每小时排名上升的名次（正数表示上升）
+        """
+        norm_name = normalize_topic_name(name)
+        since = time.time() - hours * 3600
+        sql = ('SELECT platform, rank, last_count, ts FROM hot_topic_history '
+               'WHERE norm_name = ? AND ts >= ?')
+        params = [norm_name, since]
+        if platform:
+            sql += ' AND platform = ?'
+            params.append(platform)
+        sql += ' ORDER BY ts'
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        series = {}
+        for row_platform, rank, last_count, ts in rows:
+            series.setdefault(row_platform, []).append({'rank': rank, 'lastCount': last_count, 'ts': ts})
+
+        platforms = []
+        for row_platform, points in series.items():
+            first, last = points[0], points[-1]
+            elapsed_hours = (last['ts'] - first['ts']) / 3600
+            velocity = (first['rank'] - last['rank']) / elapsed_hours if elapsed_hours > 0 else 0.0
+            platforms.append({
+                'platform': row_platform,
+                'points': points,
+                'first_rank': first['rank'],
+                'last_rank': last['rank'],
+                'best_rank': min(p['rank'] for p in points),
+                'velocity': round(velocity, 3)
+            })
+        platforms.sort(key=lambda p: p['velocity'], reverse=True)
+
+        return {'name': name, 'norm_name': norm_name, 'hours': hours, 'platforms': platforms}
+
+
+# 全局历史存储实例
+_global_history = None
+_global_history_lock = threading.Lock()
+
+
+def get_hotnews_history() -> Optional[HotNewsHistory]:
+    """
+    获取全局热点历史存储实例，未启用或配置文件不存在时返回None
+
+    Returns:
+        HotNewsHistory: 热点历史存储实例
+    """
+    global _global_history
+    if _global_history is None:
+        with _global_history_lock:
+            if _global_history is None:
+                try:
+                    from core.config import get_config
+                    history_config = get_config().get_hotnews_history_config()
+                except FileNotFoundError:
+                    return None
+                if not history_config['enabled']:
+                    return None
+                db_path = history_config['db_path']
+                if not os.path.isabs(db_path):
+                    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), db_path)
+                _global_history = HotNewsHistory(db_path)
+    return _global_history
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+热点预取调度模块
+在后台按固定间隔（带随机抖动）刷新所有平台的热点数据，请求处理时直接读取内存快照
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from core.logger import get_logger
+from tools.hotnews import PLATFORMS, NEWS_CACHE_COUNT, refresh_platform_news
+
+
+class HotNewsScheduler:
+    """
+    热点预取调度器
+    每轮依次刷新 PLATFORMS 中的所有平台，同一数据源的请求之间保持最小间隔
+    """
+
+    def __init__(self, interval: float = 300, jitter: float = 30,
+                 source_intervals: Optional[Dict[str, float]] = None, count: int = NEWS_CACHE_COUNT):
+        """
+        初始化调度器
+
+        Args:
+            interval: 刷新间隔秒数
+            jitter: 间隔的随机抖动范围（±秒）
+            source_intervals: 各数据源（zhiwei/tophub）两次请求之间的最小间隔秒数
+            count: 每个平台获取的新闻数量
+        """
+        self.interval = interval
+        self.jitter = jitter
+        self.source_intervals = dict(source_intervals or {'zhiwei': 1.0, 'tophub': 1.0})
+        self.count = count
+        self.logger = get_logger()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_request = {}  # 数据源 -> 上次请求时间
+        self._platform_stats = {}  # 平台名称 -> 最近一次刷新结果
+        self._round_stats = {'rounds': 0, 'last_started': None, 'last_duration': None, 'max_duration': 0.0,
+                             'next_run': None}
+
+    @property
+    def fresh_window(self) -> float:
+        """
+        预取快照的新鲜期：同一平台两次刷新之间的最长间隔，即最大刷新间隔加上最长一轮刷新的耗时，
+        调度正常运行时快照不会被判定为旧数据
+        """
+        with self._lock:
+            max_duration = self._round_stats['max_duration']
+        return self.interval + self.jitter + max_duration
+
+    def start(self):
+        """
+        启动后台刷新线程，启动后立即执行第一轮刷新
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='hotnews-scheduler')
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.info(f"热点预取调度已启动，间隔 {self.interval}s ± {self.jitter}s")
+
+    def stop(self, timeout: float = 5):
+        """
+        停止后台刷新线程，等待当前平台的请求结束
+
+        Args:
+            timeout: 等待线程退出的最长秒数
+        """
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        self.logger.info("热点预取调度已停止")
+
+    def _run(self):
+        """
+        调度主循环
+        """
+        while not self._stop_event.is_set():
+            try:
+                self.refresh_all()
+            except Exception as e:
+                self.logger.error(f"热点预取失败: {e}")
+
+            delay = max(self.interval + random.uniform(-self.jitter, self.jitter), 1)
+            with self._lock:
+                self._round_stats['next_run'] = time.time() + delay
+            self._stop_event.wait(delay)
+
+    def _wait_for_source(self, source: str):
+        """
+        按数据源限速，距上次请求不足最小间隔时等待
+        """
+        min_interval = self.source_intervals.get(source, 0)
+        wait = self._last_request.get(source, 0) + min_interval - time.time()
+        if wait > 0:
+            self._stop_event.wait(wait)
+        self._last_request[source] = time.time()
+
+    def refresh_all(self):
+        """
+        刷新所有平台的热点数据
+        """
+        started = time.time()
+        with self._lock:
+            self._round_stats['last_started'] = started
+
+        for platform in PLATFORMS:
+            if self._stop_event.is_set():
+                break
+
+            # 有知微数据标识的平台优先请求知微，否则只请求tophub
+            self._wait_for_source('zhiwei' if platform['zhiwei_id'] else 'tophub')
+
+            fetch_start = time.time()
+            entry = refresh_platform_news(platform['name'], self.count)
+            with self._lock:
+                self._platform_stats[platform['name']] = {
+                    'success': entry is not None,
+                    'source': entry['source'] if entry else None,
+                    'latency': entry['latency'] if entry else round(time.time() - fetch_start, 3),
+                    'refreshed_at': time.time()
+                }
+
+        duration = time.time() - started
+        with self._lock:
+            self._round_stats['rounds'] += 1
+            self._round_stats['last_duration'] = round(duration, 3)
+            self._round_stats['max_duration'] = max(self._round_stats['max_duration'], round(duration, 3))
+        self.logger.info(f"热点预取完成，耗时 {duration:.2f}s")
+
+    def last_refresh_failed(self, platform: str) -> bool:
+        """
+        平台最近一次刷新是否失败，尚未刷新过时返回False
+
+        Args:
+            platform: 平台名称
+        """
+        with self._lock:
+            stats = self._platform_stats.get(platform)
+        return stats is not None and not stats['success']
+
+    def get_stats(self) -> dict:
+        """
+        获取调度器运行状态
+
+        Returns:
+            dict: 轮次统计及各平台最近一次刷新的耗时、来源和结果
+        """
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'jitter': self.jitter,
+                'fresh_window': self.interval + self.jitter + self._round_stats['max_duration'],
+                **self._round_stats,
+                'platforms': {name: dict(stats) for name, stats in self._platform_stats.items()}
+            }
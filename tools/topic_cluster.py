@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+热点话题聚类模块
+使用字符n-gram MinHash + LSH分桶，将不同平台上标题相近的同一事件合并为一个聚类
+"""
+
+import hashlib
+import re
+import struct
+from itertools import combinations
+from typing import Dict, List
+
+
+def _shingles(text: str, n: int = 2) -> set:
+    """
+    生成字符n-gram集合（去除空白和标点后计算）
+    """
+    text = re.sub(r'[\W_]+', '', (text or '').lower())
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TopicClusterer:
+    """
+    话题聚类器
+    每个标题计算MinHash签名，按band分桶得到候选对，再以Jaccard相似度确认后用并查集合并，
+    整体复杂度接近线性
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 32, threshold: float = 0.5, ngram: int = 2):
+        """
+        初始化聚类器
+        默认32带×2行：Jaccard为0.5的一对标题成为候选的概率约为1-(1-0.5²)³²≈99.99%，
+        候选对再以精确Jaccard确认，多出的候选只增加少量比较
+
+        Args:
+            num_perm: MinHash排列数
+            bands: LSH分带数，num_perm需能被其整除
+            threshold: 合并所需的最小Jaccard相似度
+            ngram: 字符n-gram长度
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm必须能被bands整除")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.ngram = ngram
+
+        self._digest_size = num_perm * 4
+        self._unpack = struct.Struct(f'<{num_perm}I').unpack
+
+    def signature(self, shingles: set) -> tuple:
+        """
+        计算n-gram集合的MinHash签名
+        每个n-gram用SHAKE-128一次生成num_perm个独立的32位哈希值，逐位取最小值
+        """
+        return tuple(map(min, *(self._unpack(hashlib.shake_128(s.encode('utf-8')).digest(self._digest_size))
+                                for s in shingles)))
+
+    def cluster(self, topics: List[Dict]) -> List[List[int]]:
+        """
+        对话题列表聚类
+
+        Args:
+            topics: 话题列表，元素需包含 name
+
+        Returns:
+            List[List[int]]: 聚类结果，每个聚类为话题下标列表
+        """
+        shingle_sets = [_shingles(t.get('name', ''), self.ngram) for t in topics]
+        parent = list(range(len(topics)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets = {}
+        for i, shingles in enumerate(shingle_sets):
+            if not shingles:
+                continue
+            sig = self.signature(shingles)
+            for band in range(self.bands):
+                key = (band, sig[band * self.rows:(band + 1) * self.rows])
+                buckets.setdefault(key, []).append(i)
+
+        # 同一桶内的所有成员两两都是候选对，多个桶共有的候选对只比较一次
+        checked = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for pair in combinations(members, 2):
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                a, b = shingle_sets[pair[0]], shingle_sets[pair[1]]
+                if len(a & b) / len(a | b) >= self.threshold:
+                    root_a, root_b = find(pair[0]), find(pair[1])
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+
+        groups = {}
+        for i in range(len(topics)):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+
+
+def _topic_heat(rank: int, total: int) -> float:
+    """
+    根据平台内排名（从1开始）计算热度分（榜首100分，按排名线性递减），超出范围的排名按边界计算
+    """
+    if total <= 0:
+        return 0.0
+    rank = min(max(rank, 1), total)
+    return (total - rank + 1) * 100.0 / total
+
+
+def cluster_platform_topics(platform_topics: Dict[str, List[Dict]], threshold: float = 0.5) -> List[Dict]:
+    """
+    跨平台合并相同话题并计算综合热度
+    参数 platform_topics: {平台名称: 热点列表}，热点元素包含 name, rank, url
+    参数 threshold: 合并所需的最小Jaccard相似度
+    返回: 按综合热度降序的聚类列表，每个聚类包含 title, heat, platforms, size, topics
+          综合热度为聚类中各平台最高热度分之和
+    """
+    flat = []
+    for platform, topics in platform_topics.items():
+        total = len(topics)
+        for position, topic in enumerate(topics, 1):
+            # 缺少排名（知微数据默认为0）或排名无效时，使用在榜单中的位置
+            try:
+                rank = int(topic.get('rank', 0))
+            except (TypeError, ValueError):
+                rank = 0
+            if rank < 1:
+                rank = position
+            flat.append({
+                'platform': platform,
+                'name': topic.get('name', ''),
+                'rank': rank,
+                'url': topic.get('url', ''),
+                'heat': round(_topic_heat(rank, total), 2)
+            })
+
+    clusters = []
+    for members in TopicClusterer(threshold=threshold).cluster(flat):
+        items = sorted((flat[i] for i in members), key=lambda t: t['heat'], reverse=True)
+        platform_heat = {}
+        for item in items:
+            platform_heat[item['platform']] = max(platform_heat.get(item['platform'], 0.0), item['heat'])
+        clusters.append({
+            'title': items[0]['name'],
+            'heat': round(sum(platform_heat.values()), 2),
+            'platforms': list(platform_heat.keys()),
+            'size': len(items),
+            'topics': items
+        })
+
+    clusters.sort(key=lambda c: c['heat'], reverse=True)
+    return clusters
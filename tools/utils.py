@@ -4,9 +4,13 @@
 提供各种通用的工具函数
 """
 
+import os
 import re
+import tempfile
 from typing import Optional
 
+from core.logger import get_logger
+
 
 def clean_markdown_content(content: str) -> str:
     """
@@ -45,6 +49,114 @@ def clean_markdown_content(content: str) -> str:
     return cleaned_content
 
 
+class MarkdownStreamCleaner:
+    """
+    流式markdown内容清理器
+    
+    与 clean_markdown_content 的清理规则一致，但可以逐段处理流式输出：
+    1. 开头的 ```markdown 标记在确定之前暂存，确定后丢弃
+    2. 结尾可能属于 ``` 标记或空白的字符暂存，后续有内容时再输出
+    3. finish() 时按结束规则处理暂存内容
+    """
+    
+    # 可能属于结尾代码块标记的尾部：空白 + 最多3个反引号 + 空白
+    _TRAILING_RE = re.compile(r'\s*`{0,3}\s*\Z')
+    
+    def __init__(self):
+        """
+        初始化流式清理器
+        """
+        self._buffer = ''
+        self._head_done = False
+        self._leading = True
+    
+    def feed(self, delta: str) -> str:
+        """
+        输入一段增量内容
+        
+        Args:
+            delta (str): 增量内容
+            
+        Returns:
+            str: 可以安全输出的清理后内容，可能为空字符串
+        """
+        if not delta:
+            return ''
+        self._buffer += delta
+        if not self._head_done and not self._resolve_head(final=False):
+            return ''
+        return self._drain(final=False)
+    
+    def finish(self) -> str:
+        """
+        结束流式输入，输出剩余的暂存内容
+        
+        Returns:
+            str: 剩余的清理后内容
+        """
+        if not self._head_done:
+            self._resolve_head(final=True)
+        return self._drain(final=True)
+    
+    def _resolve_head(self, final: bool) -> bool:
+        """
+        处理开头的代码块标记
+        
+        Args:
+            final (bool): 是否已没有后续输入
+            
+        Returns:
+            bool: 开头是否已确定
+        """
+        text = self._buffer.lstrip()
+        lower = text.lower()
+        if not final and len(lower) < 11 and '```markdown'.startswith(lower):
+            # 仍可能是 ```markdown 标记的前缀
+            return False
+        
+        if lower.startswith('```markdown'):
+            text = text[11:]
+        elif text.startswith('```'):
+            # 换行后需出现非空白内容才能确定标记行（与先strip再查找换行的规则一致）
+            first_newline = text.find('\n')
+            if first_newline == -1 or not text[first_newline:].strip():
+                if not final:
+                    return False
+            else:
+                text = text[first_newline + 1:]
+        
+        self._buffer = text
+        self._head_done = True
+        return True
+    
+    def _drain(self, final: bool) -> str:
+        """
+        输出暂存区中可确定的内容
+        
+        Args:
+            final (bool): 是否已没有后续输入
+            
+        Returns:
+            str: 输出的内容
+        """
+        if self._leading:
+            self._buffer = self._buffer.lstrip()
+            if not self._buffer:
+                return ''
+            self._leading = False
+        
+        if final:
+            output = self._buffer.rstrip()
+            if output.endswith('```'):
+                output = output[:-3].rstrip()
+            self._buffer = ''
+            return output
+        
+        split = self._TRAILING_RE.search(self._buffer).start()
+        output, self._buffer = self._buffer[:split], self._buffer[split:]
+        return output
+
+
 def validate_markdown_content(content: str) -> bool:
     """
     验证markdown内容是否有效
@@ -66,10 +178,48 @@ def validate_markdown_content(content: str) -> bool:
     return True
 
 
+# HTML压缩的词法单元：注释 | 标签（捕获结束斜杠和标签名） | 文本 | 孤立的 <
+_HTML_TOKEN_RE = re.compile(r'(<!--.*?-->)|<(/?)([A-Za-z][^\s/<>]*)?[^<>]*>|([^<]+)|<', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 内容原样保留、不压缩空白的标签
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'code', 'textarea'])
+
+
+def _collapse_whitespace(ws: str) -> str:
+    """
+    文本中的一段连续空白压缩后的结果
+    与原先逐行去除首尾空白的行为保持一致：最后一个换行紧跟在另一个换行之后（空行）时整段移除，否则替换为一个空格
+    """
+    last_newline = ws.rfind('\n')
+    if last_newline > 0 and ws[last_newline - 1] == '\n':
+        return ''
+    return ' '
+
+
+def _collapse_text(text: str) -> str:
+    if '\n\n' in text:
+        return _WHITESPACE_RE.sub(lambda m: _collapse_whitespace(m.group()), text)
+    return _WHITESPACE_RE.sub(' ', text)
+
+
+def _collapse_tag(tag: str) -> str:
+    """
+    压缩标签内的空白：连续空白合并为一个空格，并去掉 < 和 > 两侧的空格
+    """
+    tag = _collapse_text(tag)
+    if ' ' in tag:
+        tag = tag.replace(' <', '<').replace('< ', '<').replace(' >', '>').replace('> ', '>')
+    return tag
+
+
 def decompress_html(html_content, use_compress=True):
     """
     压缩 HTML 内容，移除多余的空白字符和换行符，解决微信公众号发布时的格式问题。
 
+    单次扫描完成压缩：去除注释，连续空白合并为一个空格，去掉标签前后的空白；
+    pre/code/textarea 内的内容原样保留，避免破坏代码块的换行和缩进。
+
     参数：
         html_content (str): 输入的 HTML 字符串
         use_compress (bool): 是否压缩 HTML（True）或直接返回（False）
@@ -81,27 +231,110 @@ def decompress_html(html_content, use_compress=True):
         return html_content
     
     try:
-        # 移除HTML注释
-        html_content = re.sub(r'<!--.*?-->', '', html_content, flags=re.DOTALL)
+        out = []
+        # 处于保留空白的标签内的嵌套层数
+        preserve_depth = 0
+        # 尚未输出的空白（可能跨越被移除的注释）
+        pending_ws = ''
+        # 已输出内容以 < 或 > 结尾（或尚无输出），其后的空白应丢弃
+        after_bracket = True
         
-        # 压缩HTML：移除标签间的换行和多余空格
-        # 但保留标签内的文本内容的空格
-        compressed = re.sub(r'>\s+<', '><', html_content)
+        for match in _HTML_TOKEN_RE.finditer(html_content):
+            comment, closing, tag_name, text = match.groups()
+            if comment is not None:
+                continue
+            
+            if text is not None:
+                if preserve_depth:
+                    out.append(text)
+                    continue
+                
+                # str.strip 与正则 \s 对空白字符的判定一致
+                body = text.strip()
+                if not body:
+                    pending_ws += text
+                    continue
+                pending_ws += text[:len(text) - len(text.lstrip())]
+                if pending_ws and not after_bracket and body[0] != '>':
+                    out.append(_collapse_whitespace(pending_ws))
+                pending_ws = text[len(text.rstrip()):]
+                
+                body = _collapse_text(body)
+                if '>' in body:
+                    body = body.replace(' >', '>').replace('> ', '>')
+                out.append(body)
+                after_bracket = body[-1] == '>'
+                continue
+            
+            # 标签或孤立的 <，两侧空白均丢弃
+            token = match.group()
+            is_preserved = tag_name is not None and tag_name.lower() in PRESERVE_WHITESPACE_TAGS
+            if is_preserved and closing and preserve_depth:
+                preserve_depth -= 1
+            
+            out.append(token if preserve_depth else _collapse_tag(token))
+            pending_ws = ''
+            after_bracket = True
+            
+            if is_preserved and not closing and not token.endswith('/>'):
+                preserve_depth += 1
         
-        # 移除行首行尾的空白字符
-        compressed = re.sub(r'^\s+|\s+$', '', compressed, flags=re.MULTILINE)
-        
-        # 将多个连续的空白字符（包括换行符）压缩为单个空格
-        # 但要小心处理，不要影响pre标签内的内容
-        compressed = re.sub(r'\s+', ' ', compressed)
-        
-        # 移除标签前后的空格（但保留标签内文本的空格）
-        compressed = re.sub(r'\s*<\s*', '<', compressed)
-        compressed = re.sub(r'\s*>\s*', '>', compressed)
-        
-        return compressed.strip()
+        return ''.join(out)
         
     except Exception as e:
         # 错误处理：压缩失败时返回原始内容
-        print(f"HTML压缩失败: {e}")
-        return html_content.strip()
\ No newline at end of file
+        get_logger().error(f"HTML压缩失败: {e}")
+        return html_content.strip()
+
+
+def atomic_write_text(path: str, content: str, encoding: str = 'utf-8', fsync: bool = False,
+                      fsync_dir: bool = False):
+    """
+    原子写入文本文件：先写入同目录下的临时文件，再替换目标文件，
+    读取方不会看到写了一半的内容，写入失败时原文件保持不变
+
+    Args:
+        path: 目标文件路径
+        content: 文件内容
+        encoding: 文件编码
+        fsync: 替换前将临时文件内容刷入磁盘，断电后不会得到空文件或截断的文件
+        fsync_dir: 替换后同步所在目录，断电后替换操作本身也不会丢失
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync_dir:
+        fsync_directory(directory)
+
+
+def fsync_directory(directory: str):
+    """
+    同步目录项到磁盘，使其中的新建、重命名和删除操作持久化（不支持目录fsync的平台上忽略）
+
+    Args:
+        directory: 目录路径
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)